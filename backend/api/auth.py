@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from database.database import get_db
+from database.database import get_db, open_user_read_session, use_user_shard
 from services.auth_service import auth_service
 from models.schemas import UserCreate, UserLogin, Token, UserResponse
 
@@ -20,6 +20,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
             email=user.email,
             full_name=user.full_name,
             is_active=user.is_active,
+            team_id=user.team_id,
             created_at=user.created_at
         )
     except HTTPException as e:
@@ -72,6 +73,7 @@ async def get_current_user(
         email=user.email,
         full_name=user.full_name,
         is_active=user.is_active,
+        team_id=user.team_id,
         created_at=user.created_at
     )
 
@@ -96,4 +98,20 @@ def get_current_user_id(
     
     return user.id
 
+def get_user_db(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Session:
+    """Dependency for the request's session, routed to the current user's shard"""
+    # UserShardLocked while the user is being moved becomes a 503 (see app.main)
+    return use_user_shard(db, user_id)
+
+def get_user_read_db(request: Request, user_id: int = Depends(get_current_user_id)):
+    """Dependency for read-only endpoints over the current user's rows"""
+    db = open_user_read_session(request, user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
 auth_router = router
\ No newline at end of file
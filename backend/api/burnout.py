@@ -1,36 +1,59 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
 
-from database.database import get_db
 from services.burnout_analyzer import burnout_analyzer
+from services.calculation_coordinator import burnout_calculations
 from services.websocket_manager import websocket_manager
-from models.schemas import BurnoutMetrics, BurnoutScoreResponse
-from api.auth import get_current_user_id
+from services.resource_versions import resource_versions
+from models.schemas import BurnoutMetrics, BurnoutScoreResponse, BurnoutTrendPoint, BurnoutTrendResponse
+from api.auth import get_current_user_id, get_user_db, get_user_read_db
 
 router = APIRouter()
 
+MAX_WINDOW_DAYS = 365
+
+def parse_windows(windows: Optional[str]) -> List[int]:
+    """Parse a comma-separated window list such as "7d,30d" into days"""
+    days = []
+    for window in (windows or "").split(","):
+        window = window.strip()
+        if not window:
+            continue
+        if not (window.endswith("d") and window[:-1].isdigit() and 1 <= int(window[:-1]) <= MAX_WINDOW_DAYS):
+            raise HTTPException(status_code=400, detail=f"Invalid window '{window}'; expected 1d to {MAX_WINDOW_DAYS}d")
+        days.append(int(window[:-1]))
+    return days
+
 @router.get("/metrics", response_model=BurnoutMetrics)
 async def get_burnout_metrics(
     timeframe: str = Query("7d", description="Timeframe for metrics (7d, 30d)"),
+    windows: Optional[str] = Query(None, description="Comma-separated windows to break down as well, e.g. 7d,30d"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Get burnout metrics for the current user"""
     
     # Parse timeframe
     days = 7 if timeframe == "7d" else 30
     
-    # Calculate current burnout score
-    burnout_data = burnout_analyzer.calculate_burnout_score(db, user_id, days)
+    # Calculate current burnout score; concurrent requests for the same user share one calculation
+    burnout_data, computed = await burnout_calculations.calculate(
+        user_id, days, db.info.get("client_key"), parse_windows(windows)
+    )
     
     # Get trend data
     trend = burnout_analyzer.get_burnout_trend(db, user_id, days)
     
-    # Send real-time update via WebSocket
-    await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+    # Send real-time update via WebSocket, once per calculation
+    if computed:
+        await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+        await websocket_manager.send_anomaly_alerts(str(user_id), burnout_data["anomalies"])
     
+    return burnout_metrics(burnout_data, trend)
+
+def burnout_metrics(burnout_data: dict, trend: List[float]) -> BurnoutMetrics:
     return BurnoutMetrics(
         current_score=burnout_data["overall_score"],
         burnout_level=burnout_data["burnout_level"],
@@ -38,17 +61,28 @@ async def get_burnout_metrics(
         work_hours_avg=burnout_data["work_hours_score"] * 16,  # Convert back to hours
         meeting_load=int(burnout_data["meeting_load_score"] * 35),  # Convert back to meeting count
         email_stress=burnout_data["email_stress_score"],
-        journal_sentiment=burnout_data["sentiment_score"]
+        journal_sentiment=burnout_data["sentiment_score"],
+        fragmentation=burnout_data.get("fragmentation_score"),
+        windows=burnout_data.get("windows")
     )
 
 @router.get("/history", response_model=List[BurnoutScoreResponse])
 async def get_burnout_history(
+    request: Request,
+    response: Response,
     limit: int = Query(30, description="Number of records to return"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get burnout score history for the current user"""
     
+    not_modified = resource_versions.conditional(db, request, response, user_id, "burnout_scores")
+    if not_modified:
+        return not_modified
+    
+    return burnout_history(db, user_id, limit)
+
+def burnout_history(db: Session, user_id: int, limit: int) -> List[BurnoutScoreResponse]:
     from database.models import BurnoutScore
     
     scores = db.query(BurnoutScore).filter(
@@ -62,21 +96,55 @@ async def get_burnout_history(
         sentiment_score=score.sentiment_score,
         meeting_load_score=score.meeting_load_score,
         email_stress_score=score.email_stress_score,
+        fragmentation_score=score.fragmentation_score,
         burnout_level=score.burnout_level,
+        score_version=score.score_version,
         calculated_at=score.calculated_at
     ) for score in scores]
 
+@router.get("/trend", response_model=BurnoutTrendResponse)
+async def get_burnout_trend(
+    timeframe: str = Query("30d", description="Timeframe for trend (7d, 30d)"),
+    resolution: Literal["daily", "raw"] = Query("daily", description="daily buckets or raw points downsampled with LTTB"),
+    max_points: int = Query(100, ge=3, le=1000, description="Maximum points returned for raw resolution"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_read_db)
+):
+    """Get a bounded-size burnout trend for charting"""
+    
+    # Parse timeframe
+    days = 7 if timeframe == "7d" else 30
+    
+    if resolution == "raw":
+        points = burnout_analyzer.get_downsampled_burnout_trend(db, user_id, days, max_points)
+    else:
+        points = burnout_analyzer.get_daily_burnout_trend(db, user_id, days)
+    
+    return BurnoutTrendResponse(
+        resolution=resolution,
+        points=[BurnoutTrendPoint(**point) for point in points]
+    )
+
 @router.post("/calculate")
 async def calculate_burnout(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Manually trigger burnout calculation"""
     
-    burnout_data = burnout_analyzer.calculate_burnout_score(db, user_id, 7)
+    burnout_data, computed, throttled = await burnout_calculations.calculate_throttled(db, user_id, db.info.get("client_key"))
+    if throttled:
+        retry_after = str(burnout_calculations.limiter.retry_after(user_id))
+        if burnout_data is None:
+            raise HTTPException(status_code=429, detail="Too many burnout calculations", headers={"Retry-After": retry_after})
+        response.headers["Retry-After"] = retry_after
+        return {"message": "Rate limit reached; returning the latest burnout score", "data": burnout_data}
     
-    # Send real-time update via WebSocket
-    await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+    # Send real-time update via WebSocket; a request that joined a running calculation leaves that to the one that ran it
+    if computed:
+        await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+        await websocket_manager.send_anomaly_alerts(str(user_id), burnout_data["anomalies"])
     
     return {"message": "Burnout calculation completed", "data": burnout_data}
 
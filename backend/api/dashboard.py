@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import Callable, Dict, Optional
+import asyncio
+import os
+import threading
+from dotenv import load_dotenv
+
+from database.database import client_key, open_user_read_session, user_shard
+from services.burnout_analyzer import burnout_analyzer
+from services.calculation_coordinator import burnout_calculations
+from services.websocket_manager import websocket_manager
+from models.schemas import DashboardResponse
+from api.auth import get_current_user_id
+from api.burnout import burnout_history, burnout_metrics, parse_windows
+from api.journal import recent_journal_entries
+from api.work_sessions import work_patterns
+from api.integrations import recent_meetings, recent_emails
+
+load_dotenv()
+
+router = APIRouter()
+
+DASHBOARD_FIELDS = ("metrics", "history", "patterns", "journal", "meetings", "emails")
+# Panel queries running at once across all dashboard requests in the process; each holds a database connection
+DASHBOARD_MAX_CONCURRENCY = int(os.getenv("DASHBOARD_MAX_CONCURRENCY", "4"))
+_panel_slots = threading.BoundedSemaphore(DASHBOARD_MAX_CONCURRENCY)
+
+def _read(request: Request, shard: Optional[int], query: Callable, user_id: int, *args):
+    """Run one panel query on its own session, so panels can run in parallel threads"""
+    with _panel_slots:
+        db = open_user_read_session(request, user_id, shard)
+        try:
+            return query(db, user_id, *args)
+        finally:
+            db.close()
+
+@router.get("/", response_model=DashboardResponse, response_model_exclude_none=True)
+async def get_dashboard(
+    request: Request,
+    fields: str = Query(",".join(DASHBOARD_FIELDS), description="Comma-separated panels to return"),
+    timeframe: str = Query("7d", description="Timeframe for metrics and patterns (7d, 30d)"),
+    windows: Optional[str] = Query(None, description="Comma-separated windows to break down in the metrics panel, e.g. 7d,30d"),
+    limit: int = Query(10, ge=1, le=100, description="Entries in the journal, meetings and emails panels"),
+    history_limit: int = Query(30, ge=1, le=365, description="Scores in the history panel"),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Every dashboard panel in one request: authenticates once and loads the panels concurrently"""
+    
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in DASHBOARD_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dashboard fields: {', '.join(unknown)}")
+    
+    # Parse timeframe
+    days = 7 if timeframe == "7d" else 30
+    extra_windows = parse_windows(windows)
+    # Looked up once here rather than by every panel's session
+    shard = await run_in_threadpool(user_shard, user_id)
+    
+    async def metrics():
+        burnout_data, computed = await burnout_calculations.calculate(user_id, days, client_key(request), extra_windows)
+        trend = await run_in_threadpool(_read, request, shard, burnout_analyzer.get_burnout_trend, user_id, days)
+        if computed:
+            await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+            await websocket_manager.send_anomaly_alerts(str(user_id), burnout_data["anomalies"])
+        return burnout_metrics(burnout_data, trend)
+    
+    panels: Dict[str, Callable] = {
+        "metrics": metrics,
+        "history": lambda: run_in_threadpool(_read, request, shard, burnout_history, user_id, history_limit),
+        "patterns": lambda: run_in_threadpool(_read, request, shard, work_patterns, user_id, days),
+        "journal": lambda: run_in_threadpool(_read, request, shard, recent_journal_entries, user_id, limit),
+        "meetings": lambda: run_in_threadpool(_read, request, shard, recent_meetings, user_id, limit),
+        "emails": lambda: run_in_threadpool(_read, request, shard, recent_emails, user_id, limit),
+    }
+    selected = list(dict.fromkeys(selected))
+    results = await asyncio.gather(*(panels[field]() for field in selected))
+    
+    return DashboardResponse(**dict(zip(selected, results)))
+
+dashboard_router = router
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+
+from database.database import open_user_read_session
+from services.export_service import export_service, ExportError
+from api.auth import get_current_user_id
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    request: Request,
+    format: str = Query("ndjson", description="Export format (ndjson, parquet, arrow)"),
+    start_date: Optional[datetime] = Query(None, description="Only rows at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only rows before this time"),
+    columns: Optional[str] = Query(None, description="Comma-separated column projection"),
+    include_body: bool = Query(False, description="Include email bodies"),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Stream an export of the current user's data"""
+    
+    column_list = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    
+    # The stream outlives the request dependencies, so it owns its session
+    db = open_user_read_session(request, user_id)
+    try:
+        body = export_service.export(
+            db, table, format,
+            user_ids=[user_id],
+            start_date=start_date,
+            end_date=end_date,
+            columns=column_list,
+            include_body=include_body
+        )
+    except ExportError as e:
+        db.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def stream():
+        try:
+            yield from body
+        finally:
+            db.close()
+    
+    extension = "ndjson" if format == "ndjson" else format
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'}
+    )
+
+export_router = router
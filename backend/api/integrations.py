@@ -1,131 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import datetime, timedelta
 import json
 
-from database.database import get_db
 from database.models import Meeting, Email
-from services.vertex_ai_service import vertex_ai_service
-from api.auth import get_current_user_id
+from services.integration_sync import integration_sync
+from services.meeting_analytics import meeting_analytics
+from models.schemas import MeetingAnalyticsDay, MeetingAnalyticsResponse
+from services.resource_versions import resource_versions
+from api.auth import get_current_user_id, get_user_db, get_user_read_db
 
 router = APIRouter()
 
 @router.post("/sync/calendar")
 async def sync_calendar(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Sync calendar data from Google Calendar API"""
     
-    # Mock calendar sync - in production, this would connect to Google Calendar API
-    mock_meetings = [
-        {
-            "title": "Team Standup",
-            "start_time": "2024-01-15T09:00:00Z",
-            "end_time": "2024-01-15T09:30:00Z",
-            "attendees_count": 5,
-            "is_after_hours": False
-        },
-        {
-            "title": "Project Review",
-            "start_time": "2024-01-15T14:00:00Z",
-            "end_time": "2024-01-15T15:00:00Z",
-            "attendees_count": 3,
-            "is_after_hours": False
-        },
-        {
-            "title": "Client Call",
-            "start_time": "2024-01-15T19:00:00Z",
-            "end_time": "2024-01-15T20:00:00Z",
-            "attendees_count": 2,
-            "is_after_hours": True
-        }
-    ]
-    
-    # Save meetings to database
-    for meeting_data in mock_meetings:
-        from datetime import datetime
-        
-        start_time = datetime.fromisoformat(meeting_data["start_time"].replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(meeting_data["end_time"].replace('Z', '+00:00'))
-        duration = int((end_time - start_time).total_seconds() / 60)
-        
-        meeting = Meeting(
-            user_id=user_id,
-            title=meeting_data["title"],
-            start_time=start_time,
-            end_time=end_time,
-            duration_minutes=duration,
-            attendees_count=meeting_data["attendees_count"],
-            is_after_hours=meeting_data["is_after_hours"]
-        )
-        
-        db.add(meeting)
+    synced = integration_sync.sync_calendar(db, user_id)
     
-    db.commit()
-    
-    return {"message": f"Successfully synced {len(mock_meetings)} meetings"}
+    return {"message": f"Successfully synced {synced} meetings"}
 
 @router.post("/sync/emails")
 async def sync_emails(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Sync email data from Gmail API"""
     
-    # Mock email sync - in production, this would connect to Gmail API
-    mock_emails = [
-        {
-            "subject": "Urgent: Project deadline moved up",
-            "body": "Hi team, we need to move the project deadline up by 2 days. Please prioritize this work.",
-            "sent_at": "2024-01-15T08:30:00Z",
-            "is_sent": False,
-            "is_after_hours": False
-        },
-        {
-            "subject": "Re: Client feedback",
-            "body": "Thanks for the feedback. I'll work on the changes tonight and send an updated version.",
-            "sent_at": "2024-01-15T21:15:00Z",
-            "is_sent": True,
-            "is_after_hours": True
-        }
-    ]
-    
-    # Save emails to database with sentiment analysis
-    for email_data in mock_emails:
-        from datetime import datetime
-        
-        sent_at = datetime.fromisoformat(email_data["sent_at"].replace('Z', '+00:00'))
-        
-        # Analyze sentiment and stress indicators
-        sentiment_analysis = vertex_ai_service.analyze_sentiment(email_data["body"])
-        stress_analysis = vertex_ai_service.analyze_stress_indicators(email_data["body"])
-        
-        email = Email(
-            user_id=user_id,
-            subject=email_data["subject"],
-            body=email_data["body"],
-            sent_at=sent_at,
-            is_sent=email_data["is_sent"],
-            is_after_hours=email_data["is_after_hours"],
-            sentiment_score=sentiment_analysis["sentiment_score"],
-            stress_indicators=stress_analysis
-        )
-        
-        db.add(email)
-    
-    db.commit()
+    synced = integration_sync.sync_emails(db, user_id)
     
-    return {"message": f"Successfully synced {len(mock_emails)} emails"}
+    return {"message": f"Successfully synced {synced} emails"}
 
 @router.get("/meetings/recent")
 async def get_recent_meetings(
+    request: Request,
+    response: Response,
     limit: int = 10,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get recent meetings for the current user"""
     
+    not_modified = resource_versions.conditional(db, request, response, user_id, "meetings")
+    if not_modified:
+        return not_modified
+    
+    return recent_meetings(db, user_id, limit)
+
+def recent_meetings(db: Session, user_id: int, limit: int) -> List[dict]:
     meetings = db.query(Meeting).filter(
         Meeting.user_id == user_id
     ).order_by(Meeting.start_time.desc()).limit(limit).all()
@@ -143,14 +69,43 @@ async def get_recent_meetings(
         for meeting in meetings
     ]
 
+@router.get("/meetings/analytics", response_model=MeetingAnalyticsResponse)
+async def get_meeting_analytics(
+    timeframe: str = Query("7d", description="Timeframe for analysis (7d, 30d)"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_read_db)
+):
+    """Get daily meeting overlap, context switches and longest focus block for the current user"""
+    
+    days = 7 if timeframe == "7d" else 30
+    end_date = datetime.utcnow()
+    daily = meeting_analytics.analyze(db, user_id, end_date - timedelta(days=days), end_date)
+    
+    focus = [day["longest_focus_minutes"] for day in daily if day["longest_focus_minutes"] is not None]
+    return MeetingAnalyticsResponse(
+        days=[MeetingAnalyticsDay(**{key: value for key, value in day.items() if key != "anchor"}) for day in daily],
+        overlap_minutes=sum(day["overlap_minutes"] for day in daily),
+        context_switches=sum(day["context_switches"] for day in daily),
+        average_longest_focus_minutes=sum(focus) / len(focus) if focus else None
+    )
+
 @router.get("/emails/recent")
 async def get_recent_emails(
+    request: Request,
+    response: Response,
     limit: int = 10,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get recent emails for the current user"""
     
+    not_modified = resource_versions.conditional(db, request, response, user_id, "emails")
+    if not_modified:
+        return not_modified
+    
+    return recent_emails(db, user_id, limit)
+
+def recent_emails(db: Session, user_id: int, limit: int) -> List[dict]:
     emails = db.query(Email).filter(
         Email.user_id == user_id
     ).order_by(Email.sent_at.desc()).limit(limit).all()
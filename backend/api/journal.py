@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import datetime
 
-from database.database import get_db
 from database.models import JournalEntry
-from services.vertex_ai_service import vertex_ai_service
+from services.sentiment_backend import sentiment_backend
+from services.resource_versions import resource_versions
+from services.event_cache import event_cache
 from models.schemas import JournalEntryCreate, JournalEntryResponse
-from api.auth import get_current_user_id
+from api.auth import get_current_user_id, get_user_db, get_user_read_db
 
 router = APIRouter()
 
@@ -14,22 +16,25 @@ router = APIRouter()
 async def create_journal_entry(
     entry_data: JournalEntryCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Create a new journal entry with sentiment analysis"""
     
-    # Analyze sentiment using Vertex AI
-    sentiment_analysis = vertex_ai_service.analyze_sentiment(entry_data.content)
+    # Analyze sentiment with the configured backend (Vertex AI or the local lexicon engine)
+    sentiment_analysis = sentiment_backend.analyze_sentiment(entry_data.content)
     
     # Create journal entry
     journal_entry = JournalEntry(
         user_id=user_id,
         content=entry_data.content,
         sentiment_score=sentiment_analysis["sentiment_score"],
-        emotion_analysis=sentiment_analysis
+        emotion_analysis=sentiment_analysis,
+        created_at=datetime.utcnow()
     )
     
     db.add(journal_entry)
+    resource_versions.bump(db, user_id, "journal_entries")
+    event_cache.record(db, user_id, "journal_entries", [journal_entry])
     db.commit()
     db.refresh(journal_entry)
     
@@ -43,12 +48,21 @@ async def create_journal_entry(
 
 @router.get("/recent", response_model=List[JournalEntryResponse])
 async def get_recent_journal_entries(
+    request: Request,
+    response: Response,
     limit: int = Query(10, description="Number of entries to return"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get recent journal entries for the current user"""
     
+    not_modified = resource_versions.conditional(db, request, response, user_id, "journal_entries")
+    if not_modified:
+        return not_modified
+    
+    return recent_journal_entries(db, user_id, limit)
+
+def recent_journal_entries(db: Session, user_id: int, limit: int) -> List[JournalEntryResponse]:
     entries = db.query(JournalEntry).filter(
         JournalEntry.user_id == user_id
     ).order_by(JournalEntry.created_at.desc()).limit(limit).all()
@@ -65,7 +79,7 @@ async def get_recent_journal_entries(
 async def get_journal_entry(
     entry_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get a specific journal entry"""
     
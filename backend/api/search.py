@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from services.search_index import search_index, SEARCH_TYPES
+from models.schemas import SearchResponse, SearchResult
+from api.auth import get_current_user_id, get_user_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=256, description="Words to search for"),
+    types: List[str] = Query(list(SEARCH_TYPES), description="Result types to include (journal, email)"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    offset: int = Query(0, ge=0, le=10000, description="Number of results to skip"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_read_db)
+):
+    """Full-text search over the current user's journal entries and email subjects"""
+    
+    unknown = [result_type for result_type in types if result_type not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown result types: {', '.join(unknown)}")
+    
+    # One extra row tells whether another page exists without counting every match
+    hits = search_index.search(db, user_id, q, types, limit + 1, offset)
+    
+    return SearchResponse(
+        query=q,
+        results=[SearchResult(**hit) for hit in hits[:limit]],
+        limit=limit,
+        offset=offset,
+        next_offset=offset + limit if len(hits) > limit else None
+    )
+
+search_router = router
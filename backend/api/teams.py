@@ -0,0 +1,139 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import secrets
+
+from database.database import get_db, get_read_db
+from database.models import Team, User
+from services.team_aggregator import team_aggregator
+from models.schemas import (
+    TeamCreate, TeamJoin, TeamResponse, BurnoutDistribution,
+    TeamBurnoutDistribution, OrganizationBurnoutDistribution
+)
+from api.auth import get_current_user_id
+
+router = APIRouter()
+
+def _team_response(team: Team, member: bool = False) -> TeamResponse:
+    return TeamResponse(
+        id=team.id,
+        name=team.name,
+        organization=team.organization,
+        created_at=team.created_at,
+        join_code=team.join_code if member else None
+    )
+
+def _current_team(db: Session, user_id: int) -> Optional[Team]:
+    return db.query(Team).join(User, User.team_id == Team.id).filter(User.id == user_id).first()
+
+@router.post("/", response_model=TeamResponse)
+async def create_team(
+    team_data: TeamCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Create a new team and move the current user into it"""
+    
+    team = Team(name=team_data.name, organization=team_data.organization, join_code=secrets.token_urlsafe(16))
+    db.add(team)
+    db.flush()
+    db.query(User).filter(User.id == user_id).update({User.team_id: team.id})
+    db.commit()
+    db.refresh(team)
+    
+    return _team_response(team, member=True)
+
+@router.get("/", response_model=List[TeamResponse])
+async def list_teams(
+    organization: Optional[str] = Query(None, description="Only teams in this organization"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db)
+):
+    """List teams"""
+    
+    query = db.query(Team)
+    if organization:
+        query = query.filter(Team.organization == organization)
+    
+    team_id = db.query(User.team_id).filter(User.id == user_id).scalar()
+    return [_team_response(team, member=team.id == team_id) for team in query.order_by(Team.name).all()]
+
+@router.post("/{team_id}/join", response_model=TeamResponse)
+async def join_team(
+    team_id: int,
+    join_data: TeamJoin,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Move the current user into a team, given the join code a member shared"""
+    
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    if not team.join_code or not secrets.compare_digest(team.join_code, join_data.join_code):
+        raise HTTPException(status_code=403, detail="Invalid join code")
+    
+    db.query(User).filter(User.id == user_id).update({User.team_id: team_id})
+    db.commit()
+    
+    return _team_response(team, member=True)
+
+@router.get("/{team_id}/burnout-distribution", response_model=TeamBurnoutDistribution)
+async def get_team_burnout_distribution(
+    team_id: int,
+    timeframe: str = Query("7d", description="Timeframe for distribution (7d, 30d)"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db)
+):
+    """Get the burnout distribution of the current user's team"""
+    
+    team = _current_team(db, user_id)
+    if team is None or team.id != team_id:
+        raise HTTPException(status_code=403, detail="Only members can view a team's burnout distribution")
+    
+    # Parse timeframe
+    days = 7 if timeframe == "7d" else 30
+    
+    return TeamBurnoutDistribution(
+        team_id=team.id,
+        team_name=team.name,
+        distribution=BurnoutDistribution(**team_aggregator.get_distribution(db, [team.id], days))
+    )
+
+@router.get("/organizations/{organization}/burnout-distribution", response_model=OrganizationBurnoutDistribution)
+async def get_organization_burnout_distribution(
+    organization: str,
+    timeframe: str = Query("7d", description="Timeframe for distribution (7d, 30d)"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db)
+):
+    """Get the burnout distribution of the current user's organization, with a per-team breakdown"""
+    
+    team = _current_team(db, user_id)
+    if team is None or team.organization != organization:
+        raise HTTPException(status_code=403, detail="Only members can view an organization's burnout distribution")
+    
+    teams = db.query(Team).filter(Team.organization == organization).order_by(Team.name).all()
+    if not teams:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    # Parse timeframe
+    days = 7 if timeframe == "7d" else 30
+    
+    team_ids = [team.id for team in teams]
+    per_team = team_aggregator.get_team_distributions(db, team_ids, days)
+    
+    return OrganizationBurnoutDistribution(
+        organization=organization,
+        distribution=BurnoutDistribution(**team_aggregator.get_distribution(db, team_ids, days)),
+        teams=[
+            TeamBurnoutDistribution(
+                team_id=team.id,
+                team_name=team.name,
+                distribution=BurnoutDistribution(**per_team[team.id])
+            )
+            for team in teams
+        ]
+    )
+
+teams_router = router
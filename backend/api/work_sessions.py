@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, List
 from datetime import datetime, timedelta
+import json
 
-from database.database import get_db
 from database.models import WorkSession
-from models.schemas import WorkSessionCreate, WorkSessionResponse
-from api.auth import get_current_user_id
+from models.schemas import WorkSessionCreate, WorkSessionResponse, WorkSessionBatchResponse
+from services.work_session_ingest import work_session_ingest, WORK_SESSION_BATCH_MAX_ITEMS, WORK_SESSION_BATCH_MAX_BYTES
+from services.resource_versions import resource_versions
+from services.event_cache import event_cache
+from api.auth import get_current_user_id, get_user_db, get_user_read_db
 
 router = APIRouter()
 
@@ -14,7 +18,7 @@ router = APIRouter()
 async def create_work_session(
     session_data: WorkSessionCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_db)
 ):
     """Create a new work session"""
     
@@ -31,6 +35,8 @@ async def create_work_session(
     )
     
     db.add(work_session)
+    resource_versions.bump(db, user_id, "work_sessions")
+    event_cache.record(db, user_id, "work_sessions", [work_session])
     db.commit()
     db.refresh(work_session)
     
@@ -44,17 +50,78 @@ async def create_work_session(
         created_at=work_session.created_at
     )
 
+def _window_start(days: int) -> datetime:
+    """Window start rounded down to the hour, so results (and their ETag) only change hourly or on writes"""
+    return (datetime.utcnow() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0)
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+async def _read_batch(request: Request) -> List[Any]:
+    """Read a JSON array or an NDJSON stream of work sessions, refusing bodies over the byte or item limit"""
+    too_many_bytes = HTTPException(status_code=413, detail=f"At most {WORK_SESSION_BATCH_MAX_BYTES} bytes per batch")
+    too_many_items = HTTPException(status_code=413, detail=f"At most {WORK_SESSION_BATCH_MAX_ITEMS} sessions per batch")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > WORK_SESSION_BATCH_MAX_BYTES:
+        raise too_many_bytes
+
+    ndjson = request.headers.get("content-type", "").split(";")[0].strip() in NDJSON_CONTENT_TYPES
+    items, buffer, received = [], b"", 0
+    try:
+        async for chunk in request.stream():
+            # Content-Length can be absent (chunked uploads), so the limit is enforced on what actually arrives
+            received += len(chunk)
+            if received > WORK_SESSION_BATCH_MAX_BYTES:
+                raise too_many_bytes
+            buffer += chunk
+            if ndjson:
+                *lines, buffer = buffer.split(b"\n")
+                items.extend(json.loads(line) for line in lines if line.strip())
+                if len(items) > WORK_SESSION_BATCH_MAX_ITEMS:
+                    raise too_many_items
+        if ndjson:
+            if buffer.strip():
+                items.append(json.loads(buffer))
+        else:
+            items = json.loads(buffer)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if len(items) > WORK_SESSION_BATCH_MAX_ITEMS:
+        raise too_many_items
+    return items
+
+@router.post("/batch", response_model=WorkSessionBatchResponse)
+async def create_work_sessions_batch(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_db)
+):
+    """Create many work sessions at once, skipping client ids that were already uploaded"""
+    
+    items = await _read_batch(request)
+    
+    # Validation and the inserts are CPU and DB bound; keep them off the event loop
+    return await run_in_threadpool(work_session_ingest.ingest, db, user_id, items)
+
 @router.get("/", response_model=List[WorkSessionResponse])
 async def get_work_sessions(
+    request: Request,
+    response: Response,
     timeframe: str = Query("7d", description="Timeframe for sessions (7d, 30d)"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get work sessions for the current user"""
     
     # Parse timeframe
     days = 7 if timeframe == "7d" else 30
-    start_date = datetime.utcnow() - timedelta(days=days)
+    start_date = _window_start(days)
+    
+    not_modified = resource_versions.conditional(db, request, response, user_id, "work_sessions", start_date)
+    if not_modified:
+        return not_modified
     
     sessions = db.query(WorkSession).filter(
         WorkSession.user_id == user_id,
@@ -73,35 +140,44 @@ async def get_work_sessions(
 
 @router.get("/patterns")
 async def get_work_patterns(
+    request: Request,
+    response: Response,
     timeframe: str = Query("7d", description="Timeframe for analysis (7d, 30d)"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get work pattern analysis for the current user"""
     
     # Parse timeframe
     days = 7 if timeframe == "7d" else 30
-    start_date = datetime.utcnow() - timedelta(days=days)
+    start_date = _window_start(days)
     
-    sessions = db.query(WorkSession).filter(
-        WorkSession.user_id == user_id,
-        WorkSession.start_time >= start_date
-    ).all()
+    not_modified = resource_versions.conditional(db, request, response, user_id, "work_sessions", start_date)
+    if not_modified:
+        return not_modified
+    
+    return work_patterns(db, user_id, days)
+
+def work_patterns(db: Session, user_id: int, days: int) -> dict:
+    """Work pattern analysis over the last days, shared with the dashboard"""
+    
+    # Start times and durations from the in-memory event cache when the user is warm
+    sessions = event_cache.rows(db, user_id, ("work_sessions",), _window_start(days))["work_sessions"]
     
     if not sessions:
         return {"message": "No work sessions found", "patterns": {}}
     
     # Calculate patterns
-    total_hours = sum(session.duration_minutes for session in sessions) / 60
+    total_hours = sum(duration_minutes for _, _, duration_minutes, _ in sessions) / 60
     avg_daily_hours = total_hours / days
     
     # Group by hour of day
     hourly_distribution = {}
-    for session in sessions:
-        hour = session.start_time.hour
+    for start_time, _, duration_minutes, _ in sessions:
+        hour = start_time.hour
         if hour not in hourly_distribution:
             hourly_distribution[hour] = 0
-        hourly_distribution[hour] += session.duration_minutes
+        hourly_distribution[hour] += duration_minutes
     
     # Most productive hours
     most_productive_hours = sorted(hourly_distribution.items(), key=lambda x: x[1], reverse=True)[:3]
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from services.working_hours import working_hours
+from models.schemas import WorkingHoursProfileUpdate, WorkingHoursProfileResponse
+from api.auth import get_current_user_id, get_user_db, get_user_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=WorkingHoursProfileResponse)
+async def get_working_hours(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_read_db)
+):
+    """Get the current user's working hours; users without a profile see the default"""
+    
+    return WorkingHoursProfileResponse(**working_hours.get_profile(db, user_id))
+
+@router.put("/", response_model=WorkingHoursProfileResponse)
+async def update_working_hours(
+    profile_data: WorkingHoursProfileUpdate,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_user_db)
+):
+    """Replace the current user's working hours and reclassify their meetings and emails"""
+    
+    try:
+        reclassified = working_hours.save_profile(
+            db, user_id, profile_data.timezone, profile_data.schedule, profile_data.holidays
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    
+    return WorkingHoursProfileResponse(**working_hours.get_profile(db, user_id), reclassified=reclassified)
+
+working_hours_router = router
@@ -1,30 +1,51 @@
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from typing import List, Optional
 import json
 import os
 from dotenv import load_dotenv
 
-from database.database import engine, get_db
-from database.models import Base
+from database.database import engine, replica_engine, shard_engines, get_db, UserShardLocked, SHARD_LOCK_RETRY_SECONDS
 from api.auth import auth_router
 from api.burnout import burnout_router
 from api.journal import journal_router
 from api.work_sessions import work_sessions_router
 from api.integrations import integrations_router
-from services.websocket_manager import WebSocketManager
+from api.export import export_router
+from api.teams import teams_router
+from api.search import search_router
+from api.dashboard import dashboard_router
+from api.working_hours import working_hours_router
+from services.websocket_manager import websocket_manager
+from services.performance_monitor import performance_monitor, PerformanceMiddleware
+from services.vertex_ai_service import vertex_ai_service
+from services.scheduler import burnout_scheduler, SCHEDULER_ENABLED
 
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic migrations (`alembic upgrade head`), not at import time
+VERTEX_AI_EAGER_INIT = os.getenv("VERTEX_AI_EAGER_INIT", "false").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if VERTEX_AI_EAGER_INIT:
+        # Pay the Vertex client start-up cost before serving instead of on the first request
+        await run_in_threadpool(vertex_ai_service.warm_up)
+    if SCHEDULER_ENABLED:
+        burnout_scheduler.start()
+    yield
+    await burnout_scheduler.stop()
 
 app = FastAPI(
     title="Burnout Detection Agent",
     description="AI-powered burnout detection and analysis system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -34,10 +55,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "ETag", "Last-Modified"],
 )
 
-# WebSocket manager
-websocket_manager = WebSocketManager()
+# Per-route latency, query counts and DB time
+performance_monitor.instrument_engine(engine)
+if replica_engine is not None:
+    performance_monitor.instrument_engine(replica_engine)
+for shard_engine in shard_engines:
+    performance_monitor.instrument_engine(shard_engine)
+app.add_middleware(PerformanceMiddleware, monitor=performance_monitor)
 
 # Include routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
@@ -45,11 +72,30 @@ app.include_router(burnout_router, prefix="/api/burnout", tags=["Burnout Analysi
 app.include_router(journal_router, prefix="/api/journal", tags=["Journal"])
 app.include_router(work_sessions_router, prefix="/api/work-sessions", tags=["Work Sessions"])
 app.include_router(integrations_router, prefix="/api/integrations", tags=["Integrations"])
+app.include_router(export_router, prefix="/api/export", tags=["Export"])
+app.include_router(teams_router, prefix="/api/teams", tags=["Teams"])
+app.include_router(search_router, prefix="/api/search", tags=["Search"])
+app.include_router(dashboard_router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(working_hours_router, prefix="/api/working-hours", tags=["Working Hours"])
+
+@app.exception_handler(UserShardLocked)
+async def user_shard_locked(request, exc: UserShardLocked):
+    """Writes for a user whose rows are being moved between shards are refused until the move completes"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Your data is being moved; try again shortly"},
+        headers={"Retry-After": str(SHARD_LOCK_RETRY_SECONDS)}
+    )
 
 @app.get("/")
 async def root():
     return {"message": "Burnout Detection Agent API", "version": "1.0.0"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(performance_monitor.render(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
     await websocket_manager.connect(websocket, user_id)
@@ -0,0 +1,245 @@
+"""Seeded synthetic data generator.
+
+Populates users, work sessions, meetings, emails, journal entries and
+burnout scores at a configurable scale. The same seed always produces the
+same dataset, so benchmark runs are comparable.
+
+Usage:
+    python -m benchmarks.data_generator --database-url sqlite:///benchmark.db --users 50 --days 60
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+# Persona: (daily work hours mean, meetings per day, emails per day, after-hours probability, journal mood)
+PERSONAS = {
+    "balanced": (7.5, 2, 12, 0.05, 0.3),
+    "overworked": (10.5, 4, 25, 0.3, -0.4),
+    "meeting_heavy": (8.5, 7, 18, 0.15, -0.1),
+    "quiet": (6.0, 1, 5, 0.02, 0.5),
+}
+
+MEETING_TITLES = [
+    "Team Standup", "Project Review", "Client Call", "1:1", "Sprint Planning",
+    "Retrospective", "Design Review", "All Hands", "Incident Review", "Roadmap Sync"
+]
+
+EMAIL_SUBJECTS = [
+    "Urgent: Project deadline moved up", "Re: Client feedback", "Weekly status",
+    "Quick question", "Re: Launch checklist", "FYI: updated docs", "Action needed ASAP",
+    "Lunch on Friday?", "Re: Incident follow-up", "Planning for next quarter"
+]
+
+EMAIL_SENTENCES = [
+    "Please prioritize this work.", "Thanks for the feedback.", "I'll send an updated version tonight.",
+    "We need this immediately.", "The deadline is tomorrow.", "Great job on the launch!",
+    "Can we rush the review?", "I'm feeling a bit overwhelmed with the backlog.",
+    "Let's sync next week.", "The client is frustrated with the delay."
+]
+
+JOURNAL_SENTENCES = [
+    "Today went well and I finished the feature.", "I felt exhausted after back-to-back meetings.",
+    "Worked late again to hit the deadline.", "Had a relaxing lunch with the team.",
+    "I'm stressed about the launch.", "Made good progress and feel energized.",
+    "Too many interruptions to focus.", "Took a long walk and cleared my head."
+]
+
+STRESS_KEYWORDS = ["urgent", "asap", "immediately", "deadline", "rush", "overwhelmed", "frustrated", "exhausted"]
+
+def generate_user_events(rng: random.Random, user_id: int, persona: str, days: int, now: datetime) -> Dict[str, List[Dict]]:
+    """Generate every event row for one user as plain dicts"""
+    work_hours, meetings_per_day, emails_per_day, after_hours_p, mood = PERSONAS[persona]
+    events = {"work_sessions": [], "meetings": [], "emails": [], "journal_entries": [], "burnout_scores": []}
+
+    for day_offset in range(days, 0, -1):
+        day = (now - timedelta(days=day_offset)).replace(hour=0, minute=0, second=0, microsecond=0)
+        weekend = day.weekday() >= 5
+        scale = 0.15 if weekend else 1.0
+
+        # Work sessions: a few blocks adding up to roughly the persona's hours
+        remaining = max(0.0, rng.gauss(work_hours * scale, 1.0)) * 60
+        cursor = day + timedelta(hours=rng.uniform(7.5, 9.5))
+        while remaining >= 15:
+            duration = int(min(remaining, rng.uniform(45, 180)))
+            events["work_sessions"].append({
+                "user_id": user_id,
+                "start_time": cursor,
+                "end_time": cursor + timedelta(minutes=duration),
+                "duration_minutes": duration,
+                "activity_type": rng.choice(["coding", "review", "writing", "planning", "support"]),
+                "productivity_score": round(rng.uniform(0.3, 1.0), 2),
+                "created_at": cursor + timedelta(minutes=duration)
+            })
+            remaining -= duration
+            cursor += timedelta(minutes=duration + rng.randint(5, 45))
+
+        # Meetings
+        for _ in range(rng.randint(0, int(meetings_per_day * 2 * scale))):
+            after_hours = rng.random() < after_hours_p
+            hour = rng.choice([7, 19, 20, 21]) if after_hours else rng.randint(9, 16)
+            start = day + timedelta(hours=hour, minutes=rng.choice([0, 15, 30, 45]))
+            duration = rng.choice([15, 30, 30, 45, 60, 90])
+            events["meetings"].append({
+                "user_id": user_id,
+                "title": rng.choice(MEETING_TITLES),
+                "start_time": start,
+                "end_time": start + timedelta(minutes=duration),
+                "duration_minutes": duration,
+                "attendees_count": rng.randint(2, 12),
+                "is_after_hours": after_hours,
+                "created_at": start
+            })
+
+        # Emails
+        for _ in range(rng.randint(0, int(emails_per_day * 2 * scale))):
+            after_hours = rng.random() < after_hours_p
+            hour = rng.choice([6, 20, 21, 22, 23]) if after_hours else rng.randint(8, 17)
+            sent_at = day + timedelta(hours=hour, minutes=rng.randint(0, 59))
+            body = " ".join(rng.choice(EMAIL_SENTENCES) for _ in range(rng.randint(2, 12)))
+            found = [keyword for keyword in STRESS_KEYWORDS if keyword in body.lower()]
+            events["emails"].append({
+                "user_id": user_id,
+                "subject": rng.choice(EMAIL_SUBJECTS),
+                "body": body,
+                "sent_at": sent_at,
+                "is_sent": rng.random() < 0.4,
+                "is_after_hours": after_hours,
+                "sentiment_score": round(max(-1.0, min(1.0, rng.gauss(mood * 0.5, 0.4))), 3),
+                "stress_indicators": {
+                    "stress_level": min(len(found) / 5, 1.0),
+                    "indicators": {"found_keywords": found, "keyword_count": len(found), "text_length": len(body)}
+                },
+                "created_at": sent_at
+            })
+
+        # Journal entry on most days
+        if rng.random() < 0.7:
+            written_at = day + timedelta(hours=rng.uniform(18, 23))
+            sentiment = round(max(-1.0, min(1.0, rng.gauss(mood, 0.35))), 3)
+            events["journal_entries"].append({
+                "user_id": user_id,
+                "content": " ".join(rng.choice(JOURNAL_SENTENCES) for _ in range(rng.randint(1, 5))),
+                "sentiment_score": sentiment,
+                "emotion_analysis": {"sentiment_score": sentiment, "confidence": 0.8, "emotions": {}},
+                "created_at": written_at
+            })
+
+        # A few recalculated scores per day, like repeated dashboard loads
+        for _ in range(rng.randint(1, 6)):
+            components = [round(rng.uniform(0, 1), 3) for _ in range(4)]
+            overall = sum(components) / 4
+            events["burnout_scores"].append({
+                "user_id": user_id,
+                "overall_score": overall,
+                "work_hours_score": components[0],
+                "sentiment_score": components[1],
+                "meeting_load_score": components[2],
+                "email_stress_score": components[3],
+                "burnout_level": "low" if overall <= 0.3 else "moderate" if overall <= 0.6 else "high",
+                "timeframe_days": 7,
+                "calculated_at": day + timedelta(hours=rng.uniform(8, 22))
+            })
+
+    return events
+
+def generate(db, users: int = 10, days: int = 30, seed: int = 42, chunk_size: int = 5000) -> Dict[str, int]:
+    """Generate a full dataset into the session's database and return row counts"""
+    from sqlalchemy import insert
+    from database.database import place_new_user
+    from database.models import User, WorkSession, Meeting, Email, JournalEntry, BurnoutScore
+    from services.auth_service import auth_service
+    from services.resource_versions import resource_versions
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    models = {
+        "work_sessions": WorkSession,
+        "meetings": Meeting,
+        "emails": Email,
+        "journal_entries": JournalEntry,
+        "burnout_scores": BurnoutScore,
+    }
+    counts = {"users": 0, **{table: 0 for table in models}}
+
+    # Hashing is deliberately slow, so every generated user shares one hash
+    hashed_password = auth_service.get_password_hash(BENCHMARK_PASSWORD)
+    personas = sorted(PERSONAS)
+
+    for index in range(users):
+        user = User(
+            email=f"bench-user-{seed}-{index}@example.com",
+            hashed_password=hashed_password,
+            full_name=f"Benchmark User {index}",
+            created_at=now - timedelta(days=days)
+        )
+        db.add(user)
+        place_new_user(db, user)
+        counts["users"] += 1
+
+        events = generate_user_events(rng, user.id, personas[index % len(personas)], days, now)
+        for table, rows in events.items():
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                if table == "emails":
+                    _insert_emails(db, chunk)
+                else:
+                    db.execute(insert(models[table]), chunk)
+            counts[table] += len(rows)
+
+        resource_versions.bump(db, user.id, *models)
+        db.commit()
+
+    return counts
+
+def _insert_emails(db, rows: List[Dict]):
+    """Insert emails, then their compressed bodies into the side table"""
+    from sqlalchemy import insert
+    from database.models import Email, EmailBody
+
+    bodies = [row["body"] for row in rows]
+    email_rows = [{key: value for key, value in row.items() if key != "body"} for row in rows]
+    ids = db.execute(insert(Email).returning(Email.id, sort_by_parameter_order=True), email_rows).scalars().all()
+    db.execute(insert(EmailBody), [
+        {"email_id": email_id, "compressed_body": EmailBody.compress(body), "created_at": row["created_at"]}
+        for email_id, body, row in zip(ids, bodies, rows)
+    ])
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic burnout data")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///benchmark.db"))
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args(argv)
+
+    # database.database reads DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from database.database import engine, shard_engines, SessionLocal
+    from database.models import Base
+    from services.search_index import search_index
+
+    # With SHARD_DATABASE_URLS set, every shard gets the schema as well
+    for bind in dict.fromkeys([engine, *shard_engines]):
+        if args.reset:
+            Base.metadata.drop_all(bind=bind)
+        Base.metadata.create_all(bind=bind)
+        search_index.ensure(bind)
+
+    db = SessionLocal()
+    try:
+        counts = generate(db, args.users, args.days, args.seed)
+    finally:
+        db.close()
+
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
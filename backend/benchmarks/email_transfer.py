@@ -0,0 +1,80 @@
+"""Bytes transferred by the email stress component of a burnout calculation.
+
+Compares the payload of the previous full-row email scan (every column,
+body inline) with the projected query the analyzer issues now.
+
+Usage:
+    python -m benchmarks.email_transfer --users 5 --days 30 --body-repeat 20
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+def payload_size(rows) -> int:
+    """Approximate bytes the driver hands back for a list of rows"""
+    total = 0
+    for row in rows:
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, str):
+                total += len(value.encode("utf-8"))
+            elif isinstance(value, bytes):
+                total += len(value)
+            elif isinstance(value, (dict, list)):
+                total += len(json.dumps(value))
+            else:
+                total += 8
+    return total
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure email bytes read per burnout calculation")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--body-repeat", type=int, default=20,
+                        help="Repeat generated bodies to approximate real email sizes")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'email_transfer.db')}"
+    from database.database import engine, SessionLocal
+    from database.models import Base, Email, EmailBody
+    from benchmarks import data_generator
+
+    Base.metadata.create_all(bind=engine)
+    original = data_generator.EMAIL_SENTENCES
+    data_generator.EMAIL_SENTENCES = [" ".join([sentence] * args.body_repeat) for sentence in original]
+    db = SessionLocal()
+    try:
+        data_generator.generate(db, args.users, args.days, args.seed)
+        user_id = db.query(Email.user_id).first()[0]
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=7)
+        window = (Email.user_id == user_id, Email.sent_at >= start_date, Email.sent_at <= end_date)
+
+        # Previous behaviour: every email column with the body stored inline
+        full_rows = [
+            tuple(row[:-1]) + (EmailBody.decompress(row[-1]) if row[-1] else None,)
+            for row in db.query(*Email.__table__.columns, EmailBody.compressed_body)
+            .outerjoin(EmailBody, EmailBody.email_id == Email.id).filter(*window).all()
+        ]
+        # Current behaviour: only the columns the email stress score reads
+        projected_rows = db.query(Email.is_after_hours, Email.sentiment_score).filter(*window).all()
+    finally:
+        db.close()
+
+    before = payload_size(full_rows)
+    after = payload_size(projected_rows)
+    print(json.dumps({
+        "emails_scanned": len(projected_rows),
+        "bytes_full_rows": before,
+        "bytes_projected": after,
+        "reduction": 1 - after / before if before else 0.0,
+    }, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""Concurrent load test of one API worker over HTTP and WebSockets.
+
+Seeds a local database with the synthetic data generator, starts the app
+under uvicorn in a subprocess and runs simulated clients against it from
+one asyncio loop. Each client signs in as its own user, holds the
+/ws/{user_id} socket, loads the dashboard, then picks weighted actions
+(dashboard loads, journal entries, syncs, recalculations, searches) with
+exponential think times in between. Reports throughput, p50/p95/p99
+latency and error rate per route, WebSocket echo round trips and the lag
+between a burnout score being calculated and its push arriving.
+
+Usage:
+    python -m benchmarks.load_test --clients 50 --duration 60 --scenario mixed
+    python -m benchmarks.load_test --clients 20 --mix dashboard=3,journal=1 --output load.json
+    python -m benchmarks.load_test --url http://localhost:8000 --skip-seed --seed 42 --clients 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import websockets
+from sqlalchemy.engine import make_url
+from websockets.exceptions import WebSocketException
+
+# Relative weights of the actions a client picks between think times
+SCENARIOS = {
+    "browse": {"dashboard": 6, "history": 2, "patterns": 2, "journal": 1, "search": 1},
+    "mixed": {"dashboard": 4, "journal": 2, "sync_calendar": 1, "sync_emails": 1, "calculate": 1, "search": 1},
+    "write-heavy": {"journal": 4, "sync_calendar": 2, "sync_emails": 2, "calculate": 2, "dashboard": 1},
+}
+
+# Action name -> (method, path); paths are also the route names in the report
+ACTIONS = {
+    "dashboard": ("GET", "/api/dashboard/?timeframe=7d&limit=10&history_limit=30"),
+    "history": ("GET", "/api/burnout/history?limit=30"),
+    "patterns": ("GET", "/api/work-sessions/patterns?timeframe=7d"),
+    "journal": ("POST", "/api/journal/"),
+    "sync_calendar": ("POST", "/api/integrations/sync/calendar"),
+    "sync_emails": ("POST", "/api/integrations/sync/emails"),
+    "calculate": ("POST", "/api/burnout/calculate"),
+    "search": ("GET", "/api/search/?q=deadline&limit=20"),
+}
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """Percentiles in milliseconds of samples given in seconds"""
+    if not samples:
+        return {"count": 0}
+    samples = sorted(sample * 1000 for sample in samples)
+
+    def percentile(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": samples[-1],
+    }
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'dashboard=3,journal=1' -> {'dashboard': 3.0, 'journal': 1.0}"""
+    mix = {}
+    for part in value.split(","):
+        action, _, weight = part.partition("=")
+        action = action.strip()
+        if action not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"Unknown action '{action}'. Expected: {', '.join(ACTIONS)}")
+        try:
+            mix[action] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Weight for '{action}' must be a number")
+    return mix
+
+class LoadStats:
+    """Samples and error counts collected by every client"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+        self.echo_round_trips: List[float] = []
+        self.push_lags: List[float] = []
+        self.ws_messages: Dict[str, int] = {}
+        self.ws_connected = 0
+        self.ws_failed = 0
+        self.ws_dropped = 0
+
+    def record(self, route: str, elapsed: float, status: Optional[int]):
+        """status is None when the request raised instead of returning"""
+        self.latencies.setdefault(route, []).append(elapsed)
+        statuses = self.statuses.setdefault(route, {})
+        statuses[status or 0] = statuses.get(status or 0, 0) + 1
+        if status is None or status >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, elapsed: float) -> Dict:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            errors = self.errors.get(route, 0)
+            routes[route] = {
+                **latency_stats(samples),
+                "requests_per_sec": len(samples) / elapsed,
+                "errors": errors,
+                "error_rate": errors / len(samples),
+                "statuses": {str(status): count for status, count in sorted(self.statuses[route].items())},
+            }
+        requests = sum(len(samples) for samples in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "elapsed_seconds": elapsed,
+            "requests": requests,
+            "requests_per_sec": requests / elapsed,
+            "errors": errors,
+            "error_rate": errors / requests if requests else 0.0,
+            "routes": routes,
+            "websocket": {
+                "connected": self.ws_connected,
+                "failed": self.ws_failed,
+                "dropped": self.ws_dropped,
+                "messages": dict(sorted(self.ws_messages.items())),
+                "echo_round_trip": latency_stats(self.echo_round_trips),
+                "push_lag": latency_stats(self.push_lags),
+            },
+        }
+
+class SimulatedClient:
+    """One user's session: sign in, hold the socket, then act until the deadline"""
+
+    def __init__(self, index: int, email: str, password: str, base_url: str, mix: Dict[str, float],
+                 think_time: float, ping_interval: float, stats: LoadStats, rng: random.Random):
+        self.index = index
+        self.email = email
+        self.password = password
+        self.base_url = base_url
+        self.actions = list(mix)
+        self.weights = [mix[action] for action in self.actions]
+        self.think_time = think_time
+        self.ping_interval = ping_interval
+        self.stats = stats
+        self.rng = rng
+        # Validators per path, sent back as If-None-Match like the frontend API client does
+        self.etags: Dict[str, str] = {}
+
+    async def run(self, deadline: float):
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=60) as http:
+            token = await self._sign_in(http)
+            if token is None:
+                return
+            http.headers["Authorization"] = f"Bearer {token}"
+            response = await self._request(http, "GET", "/api/auth/me")
+            if response is None or response.status_code >= 400:
+                return
+
+            socket_task = asyncio.ensure_future(self._hold_socket(response.json()["id"], deadline))
+            try:
+                await self._act(http, "dashboard")
+                while time.perf_counter() < deadline:
+                    await asyncio.sleep(min(self.rng.expovariate(1 / self.think_time), max(0.0, deadline - time.perf_counter())))
+                    if time.perf_counter() >= deadline:
+                        break
+                    await self._act(http, self.rng.choices(self.actions, self.weights)[0])
+            finally:
+                await socket_task
+
+    async def _sign_in(self, http: httpx.AsyncClient) -> Optional[str]:
+        response = await self._request(http, "POST", "/api/auth/signin", json={"email": self.email, "password": self.password})
+        if response is None or response.status_code >= 400:
+            return None
+        return response.json()["access_token"]
+
+    async def _act(self, http: httpx.AsyncClient, action: str):
+        method, path = ACTIONS[action]
+        if action == "journal":
+            from benchmarks.data_generator import JOURNAL_SENTENCES
+            content = " ".join(self.rng.choice(JOURNAL_SENTENCES) for _ in range(self.rng.randint(1, 5)))
+            await self._request(http, method, path, json={"content": content})
+        else:
+            await self._request(http, method, path)
+
+    async def _request(self, http: httpx.AsyncClient, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        headers = {}
+        if method == "GET" and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        start = time.perf_counter()
+        try:
+            response = await http.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(f"{method} {path}", time.perf_counter() - start, None)
+            return None
+        self.stats.record(f"{method} {path}", time.perf_counter() - start, response.status_code)
+        if method == "GET" and "etag" in response.headers:
+            self.etags[path] = response.headers["etag"]
+        return response
+
+    async def _hold_socket(self, user_id: int, deadline: float):
+        url = self.base_url.replace("http", "ws", 1) + f"/ws/{user_id}"
+        connected = False
+        try:
+            async with websockets.connect(url) as ws:
+                connected = True
+                self.stats.ws_connected += 1
+                receiver = asyncio.ensure_future(self._receive(ws))
+                try:
+                    while time.perf_counter() < deadline:
+                        # The endpoint echoes what it receives back to the same user
+                        await ws.send(json.dumps({"type": "load_test_ping", "sent": time.perf_counter()}))
+                        await asyncio.sleep(min(self.ping_interval, max(0.0, deadline - time.perf_counter())))
+                finally:
+                    receiver.cancel()
+        except (OSError, WebSocketException):
+            if connected:
+                self.stats.ws_dropped += 1
+            else:
+                self.stats.ws_failed += 1
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            received = time.perf_counter()
+            message = json.loads(raw)
+            kind = message.get("type", "unknown")
+            self.stats.ws_messages[kind] = self.stats.ws_messages.get(kind, 0) + 1
+            if kind == "load_test_ping":
+                self.stats.echo_round_trips.append(received - message["sent"])
+            elif kind == "burnout_update":
+                # Same machine, so the server's naive UTC calculated_at is comparable to the local clock
+                calculated_at = datetime.fromisoformat(message["data"]["calculated_at"])
+                self.stats.push_lags.append(max(0.0, (datetime.utcnow() - calculated_at).total_seconds()))
+
+def seed_database(database_url: str, users: int, days: int, seed: int) -> Dict[str, int]:
+    # database.database reads DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = database_url
+    from database.database import engine, SessionLocal
+    from database.models import Base
+    from services.search_index import search_index
+    from benchmarks.data_generator import generate
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    search_index.ensure(engine)
+    db = SessionLocal()
+    try:
+        return generate(db, users, days, seed)
+    finally:
+        db.close()
+        engine.dispose()
+
+def start_server(database_url: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    """Run the app under uvicorn on a free local port and wait until it answers"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = {**os.environ, "DATABASE_URL": database_url, "SCHEDULER_ENABLED": "false"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.monotonic()
+    while time.monotonic() - started < 60:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(base_url + "/", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("uvicorn did not start within 60 seconds")
+
+async def run_clients(args, base_url: str, mix: Dict[str, float]) -> Dict:
+    from benchmarks.data_generator import BENCHMARK_PASSWORD
+
+    stats = LoadStats()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    deadline = started + args.duration
+
+    async def start_client(index: int):
+        # Clients start evenly over the ramp-up
+        await asyncio.sleep(args.ramp_up * index / args.clients)
+        client = SimulatedClient(
+            index, f"bench-user-{args.seed}-{index}@example.com", BENCHMARK_PASSWORD, base_url, mix,
+            args.think_time, args.ping_interval, stats, random.Random(rng.random())
+        )
+        await client.run(deadline)
+
+    await asyncio.gather(*(start_client(index) for index in range(args.clients)))
+    return stats.report(time.perf_counter() - started)
+
+def print_summary(report: Dict):
+    print(f"{report['requests']} requests in {report['elapsed_seconds']:.1f}s: "
+          f"{report['requests_per_sec']:.1f} req/s, {report['error_rate']:.2%} errors", file=sys.stderr)
+    for route, stats in report["routes"].items():
+        print(f"{route:<62} n={stats['count']:<6} p50={stats['p50_ms']:8.1f}ms  p95={stats['p95_ms']:8.1f}ms  "
+              f"p99={stats['p99_ms']:8.1f}ms  errors={stats['error_rate']:.1%}", file=sys.stderr)
+    ws = report["websocket"]
+    print(f"websocket connected={ws['connected']} failed={ws['failed']} dropped={ws['dropped']}", file=sys.stderr)
+    for name in ("echo_round_trip", "push_lag"):
+        if ws[name]["count"]:
+            print(f"websocket {name:<16} n={ws[name]['count']:<6} p50={ws[name]['p50_ms']:8.1f}ms  "
+                  f"p95={ws[name]['p95_ms']:8.1f}ms  p99={ws[name]['p99_ms']:8.1f}ms", file=sys.stderr)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API with simulated HTTP and WebSocket clients")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run, including the ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which clients start")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between a client's actions")
+    parser.add_argument("--ping-interval", type=float, default=2.0, help="Seconds between WebSocket echo pings")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--mix", type=parse_mix, help="Action weights overriding the scenario, e.g. dashboard=3,journal=1")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=None, help="Users to seed (default: one per client)")
+    parser.add_argument("--days", type=int, default=30, help="Days of history to seed per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse users seeded earlier with the same --seed")
+    parser.add_argument("--url", help="Test an already running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Exit non-zero above this share of failed requests")
+    args = parser.parse_args(argv)
+
+    users = args.users if args.users is not None else args.clients
+    # The server keeps one socket per user, so clients sharing a user would replace each other's socket
+    if users < args.clients:
+        parser.error("--users must be at least --clients")
+    if args.url and not args.skip_seed:
+        parser.error("--url tests an existing server; seed its database with benchmarks.data_generator and pass --skip-seed")
+    mix = args.mix or SCENARIOS[args.scenario]
+
+    if args.database_url is None:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test.db')}"
+    counts = {} if args.skip_seed else seed_database(args.database_url, users, args.days, args.seed)
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = start_server(args.database_url, args.workers)
+    try:
+        report = asyncio.run(run_clients(args, base_url.rstrip("/"), mix))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "clients": args.clients,
+            "duration": args.duration,
+            "ramp_up": args.ramp_up,
+            "think_time": args.think_time,
+            "mix": mix,
+            "workers": None if args.url else args.workers,
+            "database": None if args.url else make_url(args.database_url).get_backend_name(),
+            "rows": counts,
+        },
+        **report,
+    }
+    print_summary(report)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return 1 if report["error_rate"] > args.max_error_rate else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
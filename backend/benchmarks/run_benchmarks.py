@@ -0,0 +1,245 @@
+"""Benchmark suite for the burnout analyzer and API.
+
+Seeds a database with the synthetic data generator, times the analyzer
+and the HTTP endpoints, and writes machine-readable JSON results. A saved
+baseline can be compared against to flag regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks --users 20 --days 30 --output results.json
+    python -m benchmarks.run_benchmarks --save-baseline baseline.json
+    python -m benchmarks.run_benchmarks --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+def time_call(fn: Callable, iterations: int, warmup: int) -> Dict[str, float]:
+    """Time a callable and return latency statistics in milliseconds"""
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "min_ms": samples[0],
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """Return benchmarks whose p50 regressed by more than threshold (a fraction)"""
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["p50_ms"]
+        after = stats["p50_ms"]
+        if before > 0 and (after - before) / before > threshold:
+            regressions.append({"benchmark": name, "baseline_p50_ms": before, "p50_ms": after,
+                                "change": (after - before) / before})
+    return regressions
+
+def run(args) -> Dict:
+    from fastapi.testclient import TestClient
+    from database.database import engine, SessionLocal
+    from database.models import Base, User
+    from services.burnout_analyzer import burnout_analyzer
+    from services.event_cache import event_cache
+    from services.search_index import search_index
+    from benchmarks.data_generator import generate, BENCHMARK_PASSWORD
+
+    if not args.skip_seed:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        search_index.ensure(engine)
+        db = SessionLocal()
+        try:
+            counts = generate(db, args.users, args.days, args.seed)
+        finally:
+            db.close()
+    else:
+        counts = {}
+
+    from app.main import app
+
+    db = SessionLocal()
+    user = db.query(User).order_by(User.id).first()
+    if user is None:
+        raise SystemExit("No users found; run without --skip-seed to generate data")
+    user_id, user_email = user.id, user.email
+
+    results: Dict[str, Dict] = {}
+
+    def bench(name: str, fn: Callable):
+        results[name] = time_call(fn, args.iterations, args.warmup)
+        print(f"{name:<40} p50={results[name]['p50_ms']:8.2f}ms  p95={results[name]['p95_ms']:8.2f}ms", file=sys.stderr)
+
+    # Analyzer
+    for days in (7, 30):
+        bench(f"analyzer.calculate_burnout_score[{days}d]",
+              lambda days=days: burnout_analyzer.calculate_burnout_score(db, user_id, days))
+        bench(f"analyzer.get_burnout_trend[{days}d]",
+              lambda days=days: burnout_analyzer.get_burnout_trend(db, user_id, days))
+    # Both windows from one scan, against one scan per window
+    bench("analyzer.calculate_window_scores[7d,30d]",
+          lambda: burnout_analyzer.calculate_window_scores(db, user_id, [7, 30]))
+    bench("analyzer.calculate_window_scores[7d]+[30d]",
+          lambda: [burnout_analyzer.calculate_window_scores(db, user_id, [days]) for days in (7, 30)])
+    # The same calculation read from the database instead of the event cache
+    event_cache.enabled = False
+    bench("analyzer.calculate_window_scores[7d,30d,uncached]",
+          lambda: burnout_analyzer.calculate_window_scores(db, user_id, [7, 30]))
+    event_cache.enabled = True
+    db.close()
+
+    # HTTP endpoints
+    client = TestClient(app)
+    token = client.post("/api/auth/signin", json={"email": user_email, "password": BENCHMARK_PASSWORD}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def endpoint(method: str, path: str):
+        def call():
+            response = client.request(method, path, headers=headers)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}")
+        return call
+
+    for method, path in [
+        ("GET", "/api/work-sessions/patterns?timeframe=7d"),
+        ("GET", "/api/work-sessions/patterns?timeframe=30d"),
+        ("GET", "/api/work-sessions/?timeframe=30d"),
+        ("GET", "/api/burnout/metrics?timeframe=7d"),
+        ("GET", "/api/burnout/history?limit=30"),
+        ("GET", "/api/burnout/trend?timeframe=30d"),
+        ("GET", "/api/journal/recent?limit=10"),
+        ("GET", "/api/integrations/meetings/recent?limit=10"),
+        ("GET", "/api/integrations/emails/recent?limit=10"),
+        ("GET", "/api/search/?q=launch&limit=20"),
+        ("GET", "/api/search/?q=deadline+meetings&limit=20&offset=20"),
+        ("POST", "/api/integrations/sync/calendar"),
+        ("POST", "/api/integrations/sync/emails"),
+    ]:
+        bench(f"http.{method} {path}", endpoint(method, path))
+
+    # Dashboard first render: the panel requests the page issued in parallel, against one /api/dashboard call
+    import asyncio
+    import httpx
+
+    panel_paths = [
+        "/api/burnout/metrics?timeframe=7d",
+        "/api/burnout/history?limit=30",
+        "/api/work-sessions/patterns?timeframe=7d",
+        "/api/journal/recent?limit=10",
+        "/api/integrations/meetings/recent?limit=10",
+        "/api/integrations/emails/recent?limit=10",
+    ]
+
+    def concurrent_gets(paths: List[str]):
+        async def fetch():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as async_client:
+                return await asyncio.gather(*(async_client.get(path, headers=headers) for path in paths))
+
+        def call():
+            for response in asyncio.run(fetch()):
+                if response.status_code >= 400:
+                    raise RuntimeError(f"GET {response.url} returned {response.status_code}")
+        return call
+
+    bench(f"dashboard.separate[{len(panel_paths)} requests]", concurrent_gets(panel_paths))
+    bench("dashboard.combined", concurrent_gets(["/api/dashboard/?timeframe=7d&limit=10&history_limit=30"]))
+
+    # Bulk ingest: fresh client ids every call so each batch is inserted, not deduplicated
+    batch_calls = iter(range(1_000_000))
+
+    def ingest_batch():
+        call = next(batch_calls)
+        start = datetime(2000, 1, 1) + timedelta(days=call)
+        items = [{
+            "client_id": f"bench-{call}-{i}",
+            "start_time": (start + timedelta(minutes=i)).isoformat(),
+            "end_time": (start + timedelta(minutes=i + 30)).isoformat(),
+            "activity_type": "coding"
+        } for i in range(args.batch_size)]
+        response = client.post("/api/work-sessions/batch", headers=headers, json=items)
+        if response.status_code >= 400 or response.json()["created"] != args.batch_size:
+            raise RuntimeError(f"POST /api/work-sessions/batch returned {response.status_code}")
+
+    bench(f"http.POST /api/work-sessions/batch[{args.batch_size}]", ingest_batch)
+
+    return {
+        "metadata": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.url.get_backend_name(),
+            "users": args.users,
+            "days": args.days,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "rows": counts,
+        },
+        "results": results,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the burnout analyzer and API")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=10000, help="Work sessions per bulk ingest request")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse existing data in --database-url")
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a saved results file")
+    parser.add_argument("--save-baseline", help="Also write results to this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown before failing (fraction)")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+    # database.database reads DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.database_url
+
+    report = run(args)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['benchmark']}: {regression['baseline_p50_ms']:.2f}ms -> "
+                  f"{regression['p50_ms']:.2f}ms ({regression['change']:+.0%})", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(payload)
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Sentiment throughput of the local lexicon engine and the Vertex AI path.
+
+Scores the same seeded corpus of generated journal and email texts with
+each backend, one text per call and in batches, and reports texts/sec.
+The Vertex AI path is only measured when credentials are configured.
+
+Usage:
+    python -m benchmarks.sentiment_throughput --texts 20000 --batch-size 500
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+def build_corpus(count: int, seed: int) -> List[str]:
+    from benchmarks.data_generator import EMAIL_SENTENCES, JOURNAL_SENTENCES
+
+    rng = random.Random(seed)
+    sentences = EMAIL_SENTENCES + JOURNAL_SENTENCES
+    return [" ".join(rng.choice(sentences) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+def measure(fn: Callable[[List[str]], object], texts: List[str], batch_size: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    for offset in range(0, len(texts), batch_size):
+        fn(texts[offset:offset + batch_size])
+    elapsed = time.perf_counter() - start
+    return {"texts": len(texts), "batch_size": batch_size, "seconds": elapsed, "texts_per_sec": len(texts) / elapsed}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare sentiment backend throughput")
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--remote-texts", type=int, default=200, help="Texts sent to Vertex AI (remote calls are slow)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from services.sentiment_backend import LocalSentimentBackend, VertexSentimentBackend
+    from services.vertex_ai_service import vertex_ai_service
+
+    corpus = build_corpus(args.texts, args.seed)
+    results = {}
+
+    local = LocalSentimentBackend()
+    results["local.single"] = measure(lambda batch: [local.analyze_sentiment(text) for text in batch], corpus, 1)
+    results["local.batch"] = measure(local.analyze_sentiment_batch, corpus, args.batch_size)
+
+    if vertex_ai_service.client:
+        vertex = VertexSentimentBackend()
+        remote = corpus[:args.remote_texts]
+        results["vertex.single"] = measure(lambda batch: [vertex.analyze_sentiment(text) for text in batch], remote, 1)
+        results["vertex.batch"] = measure(vertex.analyze_sentiment_batch, remote, args.batch_size)
+    else:
+        results["vertex"] = {"skipped": "Vertex AI client unavailable (no credentials or library)"}
+
+    for name, stats in results.items():
+        if "texts_per_sec" in stats:
+            print(f"{name:<16} {stats['texts_per_sec']:12,.0f} texts/sec", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
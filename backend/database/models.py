@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, ForeignKey, Boolean, JSON, LargeBinary, UniqueConstraint, Index, false
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import zlib
 
 Base = declarative_base()
 
@@ -13,17 +14,74 @@ class User(Base):
     hashed_password = Column(String)
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Index into SHARD_DATABASE_URLS of the database holding the user's per-user rows
+    shard = Column(Integer, default=0, nullable=False, server_default="0")
+    # Set while scripts.rebalance_shard moves the user's rows; writes are refused until it clears
+    shard_locked = Column(Boolean, default=False, nullable=False, server_default=false())
     
     # Relationships
+    team = relationship("Team", back_populates="members")
     journal_entries = relationship("JournalEntry", back_populates="user")
     work_sessions = relationship("WorkSession", back_populates="user")
     burnout_scores = relationship("BurnoutScore", back_populates="user")
     meetings = relationship("Meeting", back_populates="user")
     emails = relationship("Email", back_populates="user")
 
+class Team(Base):
+    __tablename__ = "teams"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    organization = Column(String, index=True)
+    join_code = Column(String)  # given to members so they can invite others
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    members = relationship("User", back_populates="team")
+    burnout_sketches = relationship("TeamBurnoutSketch", back_populates="team")
+    member_scores = relationship("TeamMemberScore", back_populates="team")
+
+class TeamBurnoutSketch(Base):
+    __tablename__ = "team_burnout_sketches"
+    __table_args__ = (UniqueConstraint("team_id", "day", name="uq_team_burnout_sketches_team_day"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), index=True)
+    day = Column(Date)
+    score_count = Column(Integer, default=0)
+    level_counts = Column(JSON)  # {"low": n, "moderate": n, "high": n}
+    metric_sums = Column(JSON)  # metric -> sum of values, for means
+    metric_counts = Column(JSON)  # metric -> number of members with a value
+    sketches = Column(JSON)  # metric -> serialized KLL sketch
+    stale_count = Column(Integer, default=0)  # replaced values still in the sketches, until the next rebuild
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    team = relationship("Team", back_populates="burnout_sketches")
+
+class TeamMemberScore(Base):
+    __tablename__ = "team_member_scores"
+    __table_args__ = (UniqueConstraint("team_id", "user_id", "day", name="uq_team_member_scores_team_user_day"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    day = Column(Date)
+    burnout_level = Column(String)
+    # The member's latest 7-day components for the day
+    overall_score = Column(Float)
+    work_hours_score = Column(Float)
+    sentiment_score = Column(Float)
+    meeting_load_score = Column(Float)
+    email_stress_score = Column(Float)
+    fragmentation_score = Column(Float)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    team = relationship("Team", back_populates="member_scores")
+
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (Index("ix_journal_entries_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -36,9 +94,12 @@ class JournalEntry(Base):
 
 class WorkSession(Base):
     __tablename__ = "work_sessions"
+    # start_time is included because unique constraints on a partitioned table must contain the partition key
+    __table_args__ = (UniqueConstraint("user_id", "client_id", "start_time", name="uq_work_sessions_user_client_start"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    client_id = Column(String, nullable=True)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
     duration_minutes = Column(Integer)
@@ -48,6 +109,10 @@ class WorkSession(Base):
     
     user = relationship("User", back_populates="work_sessions")
 
+# Weighting behind BurnoutScore.overall_score and burnout_level: 1 = four components at 25% each,
+# 2 = five at 20% each, with fragmentation. Only scores of the same version are comparable.
+SCORE_VERSION = 2
+
 class BurnoutScore(Base):
     __tablename__ = "burnout_scores"
     
@@ -58,11 +123,63 @@ class BurnoutScore(Base):
     sentiment_score = Column(Float)
     meeting_load_score = Column(Float)
     email_stress_score = Column(Float)
+    fragmentation_score = Column(Float)  # NULL on scores calculated before it existed
     burnout_level = Column(String)  # low, moderate, high
+    timeframe_days = Column(Integer, nullable=True)  # window the score covers; NULL on scores calculated before it was recorded
     calculated_at = Column(DateTime, default=datetime.utcnow)
+    # Written by the historical backfill as of the end of a past day; replaced when the backfill reruns
+    is_backfill = Column(Boolean, default=False, nullable=False, server_default=false())
+    score_version = Column(Integer, default=SCORE_VERSION, nullable=False, server_default="1")
     
     user = relationship("User", back_populates="burnout_scores")
 
+class WorkingHoursProfile(Base):
+    __tablename__ = "working_hours_profiles"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    timezone = Column(String, default="UTC")  # IANA name, e.g. Europe/Berlin
+    schedule = Column(JSON)  # weekday (mon..sun) -> [["09:00", "17:00"], ...] in local time
+    holidays = Column(JSON)  # ISO dates with no working hours
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class BurnoutBaseline(Base):
+    __tablename__ = "burnout_baselines"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    state = Column(JSON)  # metric -> {"mean", "var", "count"} EWMA state through the last completed day
+    pending = Column(JSON)  # {"day", "values", "alerted"}: the latest day's last 7-day score, folded in once a later day is scored
+    last_score_id = Column(Integer)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    resource = Column(String, primary_key=True)
+    version = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class DailyActivityAggregate(Base):
+    __tablename__ = "daily_activity_aggregates"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_activity_aggregates_user_day"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    day = Column(Date)
+    work_session_count = Column(Integer, default=0)
+    work_minutes = Column(Integer, default=0)
+    meeting_count = Column(Integer, default=0)
+    meeting_minutes = Column(Integer, default=0)
+    after_hours_meeting_count = Column(Integer, default=0)
+    email_count = Column(Integer, default=0)
+    after_hours_email_count = Column(Integer, default=0)
+    email_sentiment_sum = Column(Float, default=0.0)
+    email_sentiment_count = Column(Integer, default=0)
+    burnout_score_count = Column(Integer, default=0)
+    burnout_score_mean = Column(Float)
+    burnout_score_min = Column(Float)
+    burnout_score_max = Column(Float)
+
 class Meeting(Base):
     __tablename__ = "meetings"
     
@@ -84,7 +201,6 @@ class Email(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     subject = Column(String)
-    body = Column(Text)
     sent_at = Column(DateTime)
     is_sent = Column(Boolean, default=True)
     is_after_hours = Column(Boolean, default=False)
@@ -92,4 +208,38 @@ class Email(Base):
     stress_indicators = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="emails")
\ No newline at end of file
+    user = relationship("User", back_populates="emails")
+    # Bodies live in their own table so scans of emails never pull them through the driver
+    body_record = relationship("EmailBody", uselist=False, back_populates="email", cascade="all, delete-orphan")
+    
+    @property
+    def body(self):
+        return self.body_record.text if self.body_record else None
+    
+    @body.setter
+    def body(self, text):
+        if text is None:
+            self.body_record = None
+        else:
+            self.body_record = EmailBody(compressed_body=EmailBody.compress(text))
+
+class EmailBody(Base):
+    __tablename__ = "email_bodies"
+    
+    email_id = Column(Integer, ForeignKey("emails.id", ondelete="CASCADE"), primary_key=True)
+    compressed_body = Column(LargeBinary)  # zlib-compressed UTF-8
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    email = relationship("Email", back_populates="body_record")
+    
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return zlib.compress(text.encode("utf-8"))
+    
+    @staticmethod
+    def decompress(data: bytes) -> str:
+        return zlib.decompress(data).decode("utf-8")
+    
+    @property
+    def text(self) -> str:
+        return self.decompress(self.compressed_body)
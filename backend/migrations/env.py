@@ -0,0 +1,83 @@
+from logging.config import fileConfig
+import os
+import sys
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.models import Base
+
+load_dotenv()
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
+
+target_metadata = Base.metadata
+
+# Full-text search structures (migration 0008) live outside the ORM models
+SEARCH_INDEX_PREFIXES = ("journal_entries_fts", "emails_fts")
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(SEARCH_INDEX_PREFIXES):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name.endswith("_search_vector"):
+        return False
+    return True
+
+def run_migrations_offline():
+    """Emit SQL to stdout without a database connection"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def _online_urls():
+    """The main database first, then every shard listed in SHARD_DATABASE_URLS that is not the main one"""
+    url = config.get_main_option("sqlalchemy.url")
+    # Autogenerate compares against one schema, and -x shards=false migrates only the main database
+    if getattr(config.cmd_opts, "autogenerate", False) or context.get_x_argument(as_dictionary=True).get("shards") == "false":
+        return [url]
+    shard_urls = [shard_url.strip() for shard_url in os.getenv("SHARD_DATABASE_URLS", "").split(",") if shard_url.strip()]
+    return list(dict.fromkeys([url, *shard_urls]))
+
+def run_migrations_online():
+    """Run migrations against the configured database and each shard, each with its own alembic_version"""
+    for url in _online_urls():
+        connectable = engine_from_config(
+            config.get_section(config.config_ini_section, {}),
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+            url=url,
+        )
+
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                render_as_batch=connection.dialect.name == "sqlite",
+                include_object=include_object,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
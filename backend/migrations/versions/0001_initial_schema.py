@@ -0,0 +1,101 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String()),
+        sa.Column("hashed_password", sa.String()),
+        sa.Column("full_name", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "journal_entries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("content", sa.Text()),
+        sa.Column("sentiment_score", sa.Float()),
+        sa.Column("emotion_analysis", sa.JSON()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_journal_entries_id", "journal_entries", ["id"])
+
+    op.create_table(
+        "work_sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("start_time", sa.DateTime()),
+        sa.Column("end_time", sa.DateTime()),
+        sa.Column("duration_minutes", sa.Integer()),
+        sa.Column("activity_type", sa.String()),
+        sa.Column("productivity_score", sa.Float()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_work_sessions_id", "work_sessions", ["id"])
+
+    op.create_table(
+        "burnout_scores",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("overall_score", sa.Float()),
+        sa.Column("work_hours_score", sa.Float()),
+        sa.Column("sentiment_score", sa.Float()),
+        sa.Column("meeting_load_score", sa.Float()),
+        sa.Column("email_stress_score", sa.Float()),
+        sa.Column("burnout_level", sa.String()),
+        sa.Column("calculated_at", sa.DateTime()),
+    )
+    op.create_index("ix_burnout_scores_id", "burnout_scores", ["id"])
+
+    op.create_table(
+        "meetings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("title", sa.String()),
+        sa.Column("start_time", sa.DateTime()),
+        sa.Column("end_time", sa.DateTime()),
+        sa.Column("duration_minutes", sa.Integer()),
+        sa.Column("attendees_count", sa.Integer()),
+        sa.Column("is_after_hours", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_meetings_id", "meetings", ["id"])
+
+    op.create_table(
+        "emails",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("subject", sa.String()),
+        sa.Column("body", sa.Text()),
+        sa.Column("sent_at", sa.DateTime()),
+        sa.Column("is_sent", sa.Boolean()),
+        sa.Column("is_after_hours", sa.Boolean()),
+        sa.Column("sentiment_score", sa.Float()),
+        sa.Column("stress_indicators", sa.JSON()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_emails_id", "emails", ["id"])
+
+def downgrade():
+    op.drop_table("emails")
+    op.drop_table("meetings")
+    op.drop_table("burnout_scores")
+    op.drop_table("work_sessions")
+    op.drop_table("journal_entries")
+    op.drop_table("users")
@@ -0,0 +1,52 @@
+"""Teams and per-team burnout quantile sketches
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "teams",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("organization", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_teams_id", "teams", ["id"])
+    op.create_index("ix_teams_organization", "teams", ["organization"])
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("team_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_users_team_id_teams", "teams", ["team_id"], ["id"])
+        batch_op.create_index("ix_users_team_id", ["team_id"])
+
+    op.create_table(
+        "team_burnout_sketches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("teams.id")),
+        sa.Column("day", sa.Date()),
+        sa.Column("score_count", sa.Integer()),
+        sa.Column("level_counts", sa.JSON()),
+        sa.Column("metric_sums", sa.JSON()),
+        sa.Column("sketches", sa.JSON()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.UniqueConstraint("team_id", "day", name="uq_team_burnout_sketches_team_day"),
+    )
+    op.create_index("ix_team_burnout_sketches_id", "team_burnout_sketches", ["id"])
+    op.create_index("ix_team_burnout_sketches_team_id", "team_burnout_sketches", ["team_id"])
+
+def downgrade():
+    op.drop_table("team_burnout_sketches")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_index("ix_users_team_id")
+        batch_op.drop_constraint("fk_users_team_id_teams", type_="foreignkey")
+        batch_op.drop_column("team_id")
+    op.drop_table("teams")
@@ -0,0 +1,25 @@
+"""Per-user EWMA baselines for burnout anomaly detection
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "burnout_baselines",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("state", sa.JSON()),
+        sa.Column("last_score_id", sa.Integer()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+def downgrade():
+    op.drop_table("burnout_baselines")
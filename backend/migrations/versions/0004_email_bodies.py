@@ -0,0 +1,62 @@
+"""Move email bodies into a separate compressed table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+import zlib
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+def upgrade():
+    op.create_table(
+        "email_bodies",
+        sa.Column("email_id", sa.Integer(), sa.ForeignKey("emails.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("compressed_body", sa.LargeBinary()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_email_bodies_created_at", "email_bodies", ["created_at"])
+
+    # Copy existing bodies across in batches, compressing as we go
+    connection = op.get_bind()
+    emails = sa.table("emails", sa.column("id", sa.Integer), sa.column("body", sa.Text), sa.column("created_at", sa.DateTime))
+    bodies = sa.table("email_bodies", sa.column("email_id", sa.Integer), sa.column("compressed_body", sa.LargeBinary), sa.column("created_at", sa.DateTime))
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(emails.c.id, emails.c.body, emails.c.created_at)
+            .where(emails.c.id > last_id, emails.c.body.isnot(None))
+            .order_by(emails.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(bodies.insert(), [
+            {"email_id": row.id, "compressed_body": zlib.compress(row.body.encode("utf-8")), "created_at": row.created_at}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("emails") as batch_op:
+        batch_op.drop_column("body")
+
+def downgrade():
+    with op.batch_alter_table("emails") as batch_op:
+        batch_op.add_column(sa.Column("body", sa.Text()))
+
+    connection = op.get_bind()
+    emails = sa.table("emails", sa.column("id", sa.Integer), sa.column("body", sa.Text))
+    bodies = sa.table("email_bodies", sa.column("email_id", sa.Integer), sa.column("compressed_body", sa.LargeBinary))
+    for row in connection.execute(sa.select(bodies.c.email_id, bodies.c.compressed_body)).all():
+        connection.execute(
+            emails.update().where(emails.c.id == row.email_id)
+            .values(body=zlib.decompress(row.compressed_body).decode("utf-8"))
+        )
+
+    op.drop_table("email_bodies")
@@ -0,0 +1,125 @@
+"""Daily activity aggregates and monthly partitioning of event tables
+
+On PostgreSQL, emails, meetings, work_sessions and burnout_scores become
+RANGE-partitioned by month on their event timestamp. Partitioned tables
+need the partition key in the primary key, so the key becomes
+(id, <timestamp>) and the email_bodies -> emails foreign key is dropped
+(the application deletes bodies explicitly). Other databases only get
+the aggregates table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from datetime import date, datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+PARTITIONED_TABLES = {
+    "work_sessions": "start_time",
+    "meetings": "start_time",
+    "emails": "sent_at",
+    "burnout_scores": "calculated_at",
+}
+MONTHS_AHEAD = 3
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def _create_monthly_partitions(table: str, first_month: date, last_month: date):
+    month = first_month
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF {table} FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+
+def upgrade():
+    op.create_table(
+        "daily_activity_aggregates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("day", sa.Date()),
+        sa.Column("work_session_count", sa.Integer()),
+        sa.Column("work_minutes", sa.Integer()),
+        sa.Column("meeting_count", sa.Integer()),
+        sa.Column("meeting_minutes", sa.Integer()),
+        sa.Column("after_hours_meeting_count", sa.Integer()),
+        sa.Column("email_count", sa.Integer()),
+        sa.Column("after_hours_email_count", sa.Integer()),
+        sa.Column("email_sentiment_sum", sa.Float()),
+        sa.Column("email_sentiment_count", sa.Integer()),
+        sa.Column("burnout_score_count", sa.Integer()),
+        sa.Column("burnout_score_mean", sa.Float()),
+        sa.Column("burnout_score_min", sa.Float()),
+        sa.Column("burnout_score_max", sa.Float()),
+        sa.UniqueConstraint("user_id", "day", name="uq_daily_activity_aggregates_user_day"),
+    )
+    op.create_index("ix_daily_activity_aggregates_id", "daily_activity_aggregates", ["id"])
+    op.create_index("ix_daily_activity_aggregates_user_id", "daily_activity_aggregates", ["user_id"])
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        return
+
+    current_month = date.today().replace(day=1)
+    for table, key in PARTITIONED_TABLES.items():
+        fallback = "created_at" if table != "burnout_scores" else "now()"
+        legacy = f"{table}_unpartitioned"
+
+        # The partition key becomes part of the primary key, so it cannot be NULL
+        op.execute(f"UPDATE {table} SET {key} = COALESCE({key}, {fallback}, now()) WHERE {key} IS NULL")
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+        op.execute(f"ALTER INDEX ix_{table}_id RENAME TO ix_{legacy}_id")
+
+        op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {key} SET NOT NULL")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {key})")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)")
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+        op.execute(f"CREATE INDEX ix_{table}_user_id_{key} ON {table} (user_id, {key})")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        oldest = connection.execute(sa.text(f"SELECT min({key}) FROM {legacy}")).scalar()
+        first_month = oldest.date().replace(day=1) if isinstance(oldest, datetime) else current_month
+        _create_monthly_partitions(table, min(first_month, current_month), _add_months(current_month, MONTHS_AHEAD))
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        # Keep the id sequence alive when the legacy table is dropped
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f"DROP TABLE {legacy} CASCADE")
+
+def downgrade():
+    connection = op.get_bind()
+    if connection.dialect.name == "postgresql":
+        for table, key in PARTITIONED_TABLES.items():
+            partitioned = f"{table}_partitioned"
+            op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+            op.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey")
+            op.execute(f"ALTER INDEX ix_{table}_id RENAME TO ix_{partitioned}_id")
+
+            op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {key} DROP NOT NULL")
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)")
+            op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+            op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+            op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+            op.execute(f"DROP TABLE {partitioned} CASCADE")
+
+        op.execute(
+            "ALTER TABLE email_bodies ADD CONSTRAINT email_bodies_email_id_fkey "
+            "FOREIGN KEY (email_id) REFERENCES emails (id) ON DELETE CASCADE"
+        )
+
+    op.drop_table("daily_activity_aggregates")
@@ -0,0 +1,25 @@
+"""Client-supplied ids on work sessions for idempotent batch uploads
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("work_sessions") as batch_op:
+        batch_op.add_column(sa.Column("client_id", sa.String(), nullable=True))
+        batch_op.create_unique_constraint(
+            "uq_work_sessions_user_client_start", ["user_id", "client_id", "start_time"]
+        )
+
+def downgrade():
+    with op.batch_alter_table("work_sessions") as batch_op:
+        batch_op.drop_constraint("uq_work_sessions_user_client_start", type_="unique")
+        batch_op.drop_column("client_id")
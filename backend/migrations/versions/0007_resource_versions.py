@@ -0,0 +1,25 @@
+"""Per-user resource version counters for conditional GET
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "resource_versions",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("resource", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+def downgrade():
+    op.drop_table("resource_versions")
@@ -0,0 +1,64 @@
+"""Full-text search over journal entries and email subjects
+
+PostgreSQL gets a generated tsvector column with a GIN index on each
+table. SQLite gets an external-content FTS5 table per source table, kept
+in sync by triggers. A SQLite batch migration that rebuilds
+journal_entries or emails drops those triggers and must recreate them.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SEARCH_TABLES = {
+    "journal_entries": "content",
+    "emails": "subject",
+}
+
+def _sqlite_ddl(table: str, column: str):
+    return [
+        f"CREATE VIRTUAL TABLE {table}_fts USING fts5({column}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {table}_fts(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+        f"CREATE TRIGGER {table}_fts_au AFTER UPDATE OF {column} ON {table} BEGIN "
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {table}_fts(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+    ]
+
+def upgrade():
+    # Per-user filters on journal entries had no index; search and /journal/recent both use this one
+    op.create_index("ix_journal_entries_user_id_created_at", "journal_entries", ["user_id", "created_at"])
+
+    dialect = op.get_bind().dialect.name
+    for table, column in SEARCH_TABLES.items():
+        if dialect == "postgresql":
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('english', coalesce({column}, ''))) STORED"
+            )
+            op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+        elif dialect == "sqlite":
+            for statement in _sqlite_ddl(table, column):
+                op.execute(statement)
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_TABLES:
+        if dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+        elif dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+    op.drop_index("ix_journal_entries_user_id_created_at", table_name="journal_entries")
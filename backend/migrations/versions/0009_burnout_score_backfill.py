@@ -0,0 +1,21 @@
+"""Mark burnout scores written by the historical backfill
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.add_column(sa.Column("is_backfill", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+def downgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.drop_column("is_backfill")
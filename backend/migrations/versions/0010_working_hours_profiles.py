@@ -0,0 +1,26 @@
+"""Per-user working hours profiles for after-hours classification
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "working_hours_profiles",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("timezone", sa.String()),
+        sa.Column("schedule", sa.JSON()),
+        sa.Column("holidays", sa.JSON()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+def downgrade():
+    op.drop_table("working_hours_profiles")
@@ -0,0 +1,21 @@
+"""Meeting fragmentation component of the burnout score
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.add_column(sa.Column("fragmentation_score", sa.Float(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.drop_column("fragmentation_score")
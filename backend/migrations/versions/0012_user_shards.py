@@ -0,0 +1,46 @@
+"""Shard directory on users
+
+users.shard records which of SHARD_DATABASE_URLS holds each user's rows
+and users.shard_locked marks a user whose rows are being moved. Existing
+users stay on shard 0, the database they are in now. On PostgreSQL the
+per-user tables' foreign keys to users are dropped, since on a shard the
+users live in the global database; SQLite does not enforce them.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+USER_TABLES = (
+    "journal_entries", "work_sessions", "burnout_scores", "working_hours_profiles", "burnout_baselines",
+    "resource_versions", "daily_activity_aggregates", "meetings", "emails",
+)
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("shard", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("shard_locked", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        inspector = sa.inspect(bind)
+        for table in USER_TABLES:
+            for foreign_key in inspector.get_foreign_keys(table):
+                if foreign_key["referred_table"] == "users" and foreign_key["name"]:
+                    op.drop_constraint(foreign_key["name"], table, type_="foreignkey")
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for table in USER_TABLES:
+            op.create_foreign_key(f"{table}_user_id_fkey", table, "users", ["user_id"], ["id"])
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("shard_locked")
+        batch_op.drop_column("shard")
@@ -0,0 +1,21 @@
+"""Record the window each burnout score covers
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.add_column(sa.Column("timeframe_days", sa.Integer(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.drop_column("timeframe_days")
@@ -0,0 +1,32 @@
+"""Team join codes and per-member team sketch contributions
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+import secrets
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("teams") as batch_op:
+        batch_op.add_column(sa.Column("join_code", sa.String(), nullable=True))
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.add_column(sa.Column("member_scores", sa.JSON(), nullable=True))
+
+    # Existing teams get a code too, so they can still be joined
+    teams = sa.table("teams", sa.column("id", sa.Integer()), sa.column("join_code", sa.String()))
+    connection = op.get_bind()
+    for (team_id,) in connection.execute(sa.select(teams.c.id)).fetchall():
+        connection.execute(teams.update().where(teams.c.id == team_id).values(join_code=secrets.token_urlsafe(16)))
+
+def downgrade():
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.drop_column("member_scores")
+    with op.batch_alter_table("teams") as batch_op:
+        batch_op.drop_column("join_code")
@@ -0,0 +1,21 @@
+"""Daily cadence for anomaly baselines
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("burnout_baselines") as batch_op:
+        batch_op.add_column(sa.Column("pending", sa.JSON(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table("burnout_baselines") as batch_op:
+        batch_op.drop_column("pending")
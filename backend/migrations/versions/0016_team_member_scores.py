@@ -0,0 +1,109 @@
+"""Per-member-day team scores, so team sketches update incrementally
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+METRICS = ["overall_score", "work_hours_score", "sentiment_score", "meeting_load_score", "email_stress_score", "fragmentation_score"]
+
+def upgrade():
+    op.create_table(
+        "team_member_scores",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("teams.id")),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("day", sa.Date()),
+        sa.Column("burnout_level", sa.String()),
+        *[sa.Column(metric, sa.Float()) for metric in METRICS],
+        sa.Column("updated_at", sa.DateTime()),
+        sa.UniqueConstraint("team_id", "user_id", "day", name="uq_team_member_scores_team_user_day"),
+    )
+    op.create_index("ix_team_member_scores_id", "team_member_scores", ["id"])
+    op.create_index("ix_team_member_scores_team_id", "team_member_scores", ["team_id"])
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.add_column(sa.Column("metric_counts", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("stale_count", sa.Integer(), nullable=True))
+
+    # Each day's member_scores map becomes rows; its sketches were built from exactly those values, so none are stale
+    sketches = sa.table(
+        "team_burnout_sketches",
+        sa.column("id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("updated_at", sa.DateTime()),
+        sa.column("member_scores", sa.JSON()),
+        sa.column("metric_counts", sa.JSON()),
+        sa.column("stale_count", sa.Integer()),
+    )
+    members = sa.table(
+        "team_member_scores",
+        sa.column("team_id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("burnout_level", sa.String()),
+        sa.column("updated_at", sa.DateTime()),
+        *[sa.column(metric, sa.Float()) for metric in METRICS],
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(
+        sketches.c.id, sketches.c.team_id, sketches.c.day, sketches.c.updated_at, sketches.c.member_scores
+    )).fetchall()
+    for sketch_id, team_id, day, updated_at, member_scores in rows:
+        counts = {}
+        for user_id, scores in (member_scores or {}).items():
+            connection.execute(members.insert().values(
+                team_id=team_id, user_id=int(user_id), day=day, burnout_level=scores.get("burnout_level"),
+                updated_at=updated_at, **{metric: scores.get(metric) for metric in METRICS}
+            ))
+            for metric in METRICS:
+                if scores.get(metric) is not None:
+                    counts[metric] = counts.get(metric, 0) + 1
+        connection.execute(sketches.update().where(sketches.c.id == sketch_id).values(metric_counts=counts, stale_count=0))
+
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.drop_column("member_scores")
+
+def downgrade():
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.add_column(sa.Column("member_scores", sa.JSON(), nullable=True))
+
+    sketches = sa.table(
+        "team_burnout_sketches",
+        sa.column("id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("member_scores", sa.JSON()),
+    )
+    members = sa.table(
+        "team_member_scores",
+        sa.column("team_id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("burnout_level", sa.String()),
+        *[sa.column(metric, sa.Float()) for metric in METRICS],
+    )
+    connection = op.get_bind()
+    by_day = {}
+    for row in connection.execute(sa.select(members)).mappings():
+        by_day.setdefault((row["team_id"], row["day"]), {})[str(row["user_id"])] = {
+            "burnout_level": row["burnout_level"], **{metric: row[metric] for metric in METRICS}
+        }
+    for (team_id, day), member_scores in by_day.items():
+        connection.execute(sketches.update().where(
+            sketches.c.team_id == team_id, sketches.c.day == day
+        ).values(member_scores=member_scores))
+
+    with op.batch_alter_table("team_burnout_sketches") as batch_op:
+        batch_op.drop_column("stale_count")
+        batch_op.drop_column("metric_counts")
+    op.drop_index("ix_team_member_scores_team_id", table_name="team_member_scores")
+    op.drop_index("ix_team_member_scores_id", table_name="team_member_scores")
+    op.drop_table("team_member_scores")
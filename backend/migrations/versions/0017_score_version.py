@@ -0,0 +1,141 @@
+"""Fragmentation weighted into the overall score, with a version per score
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+# Version 1 weighted four components at 25%, version 2 adds fragmentation with all five at 20%, so
+# v2 = 0.8 * v1 + 0.2 * fragmentation exactly; scores without a fragmentation score stay version 1
+FRAGMENTATION_WEIGHT = 0.2
+
+def _level(score):
+    return sa.case((score <= 0.3, "low"), (score <= 0.6, "moderate"), else_="high")
+
+def _scores():
+    return sa.table(
+        "burnout_scores",
+        sa.column("overall_score", sa.Float()),
+        sa.column("fragmentation_score", sa.Float()),
+        sa.column("burnout_level", sa.String()),
+        sa.column("score_version", sa.Integer()),
+    )
+
+def _members():
+    return sa.table(
+        "team_member_scores",
+        sa.column("team_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("overall_score", sa.Float()),
+        sa.column("fragmentation_score", sa.Float()),
+        sa.column("burnout_level", sa.String()),
+    )
+
+def _reset_overall_baselines(connection):
+    """Baselines learned the old overall score; it restarts its warmup (rebuild_anomaly_baselines replays history)"""
+    baselines = sa.table(
+        "burnout_baselines",
+        sa.column("user_id", sa.Integer()),
+        sa.column("state", sa.JSON()),
+        sa.column("pending", sa.JSON()),
+    )
+    for user_id, state, pending in connection.execute(sa.select(baselines.c.user_id, baselines.c.state, baselines.c.pending)).fetchall():
+        state = {metric: value for metric, value in (state or {}).items() if metric != "overall_score"}
+        if pending:
+            pending = {
+                **pending,
+                "values": {metric: value for metric, value in (pending.get("values") or {}).items() if metric != "overall_score"},
+                "alerted": [metric for metric in pending.get("alerted") or [] if metric != "overall_score"],
+            }
+        connection.execute(baselines.update().where(baselines.c.user_id == user_id).values(state=state, pending=pending))
+
+def _rebuild_team_overall(connection):
+    """Recompute each team day's overall sketch, sum and level counts from its member values"""
+    sketches = sa.table(
+        "team_burnout_sketches",
+        sa.column("id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("level_counts", sa.JSON()),
+        sa.column("metric_sums", sa.JSON()),
+        sa.column("metric_counts", sa.JSON()),
+        sa.column("sketches", sa.JSON()),
+    )
+    members = _members()
+    by_day = {}
+    for team_id, day, overall, level in connection.execute(
+        sa.select(members.c.team_id, members.c.day, members.c.overall_score, members.c.burnout_level)
+    ).fetchall():
+        entry = by_day.setdefault((team_id, day), {"values": [], "levels": {}})
+        if overall is not None:
+            entry["values"].append(overall)
+        entry["levels"][level] = entry["levels"].get(level, 0) + 1
+
+    rows = connection.execute(sa.select(
+        sketches.c.id, sketches.c.team_id, sketches.c.day, sketches.c.metric_sums, sketches.c.metric_counts, sketches.c.sketches
+    )).fetchall()
+    for sketch_id, team_id, day, sums, counts, day_sketches in rows:
+        entry = by_day.get((team_id, day), {"values": [], "levels": {}})
+        values = sorted(entry["values"])
+        sums, counts, day_sketches = dict(sums or {}), dict(counts or {}), dict(day_sketches or {})
+        if values:
+            sums["overall_score"] = sum(values)
+            counts["overall_score"] = len(values)
+            # An exact sketch: every value at level 0; the next update compacts it as usual
+            day_sketches["overall_score"] = {
+                "k": (day_sketches.get("overall_score") or {}).get("k", 200), "n": len(values),
+                "min": values[0], "max": values[-1], "compactors": [[round(value, 4) for value in values]],
+            }
+        else:
+            for column in (sums, counts, day_sketches):
+                column.pop("overall_score", None)
+        connection.execute(sketches.update().where(sketches.c.id == sketch_id).values(
+            level_counts=entry["levels"], metric_sums=sums, metric_counts=counts, sketches=day_sketches
+        ))
+
+def upgrade():
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.add_column(sa.Column("score_version", sa.Integer(), nullable=False, server_default="1"))
+
+    connection = op.get_bind()
+    scores = _scores()
+    reweighted = (1 - FRAGMENTATION_WEIGHT) * scores.c.overall_score + FRAGMENTATION_WEIGHT * scores.c.fragmentation_score
+    connection.execute(scores.update().where(scores.c.fragmentation_score.isnot(None)).values(
+        overall_score=reweighted, burnout_level=_level(reweighted), score_version=2
+    ))
+
+    members = _members()
+    reweighted = (1 - FRAGMENTATION_WEIGHT) * members.c.overall_score + FRAGMENTATION_WEIGHT * members.c.fragmentation_score
+    connection.execute(members.update().where(members.c.fragmentation_score.isnot(None)).values(
+        overall_score=reweighted, burnout_level=_level(reweighted)
+    ))
+    # Team sketches hold one version only: member values that cannot be reweighted leave the overall distribution
+    connection.execute(members.update().where(members.c.fragmentation_score.is_(None)).values(overall_score=None))
+    _rebuild_team_overall(connection)
+    _reset_overall_baselines(connection)
+
+def downgrade():
+    connection = op.get_bind()
+    scores = _scores()
+    unweighted = (scores.c.overall_score - FRAGMENTATION_WEIGHT * scores.c.fragmentation_score) / (1 - FRAGMENTATION_WEIGHT)
+    connection.execute(scores.update().where(scores.c.score_version == 2, scores.c.fragmentation_score.isnot(None)).values(
+        overall_score=unweighted, burnout_level=_level(unweighted)
+    ))
+
+    members = _members()
+    unweighted = (members.c.overall_score - FRAGMENTATION_WEIGHT * members.c.fragmentation_score) / (1 - FRAGMENTATION_WEIGHT)
+    connection.execute(members.update().where(members.c.fragmentation_score.isnot(None)).values(
+        overall_score=unweighted, burnout_level=_level(unweighted)
+    ))
+    _rebuild_team_overall(connection)
+    _reset_overall_baselines(connection)
+
+    with op.batch_alter_table("burnout_scores") as batch_op:
+        batch_op.drop_column("score_version")
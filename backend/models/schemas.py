@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 # User schemas
 class UserCreate(BaseModel):
@@ -13,6 +13,7 @@ class UserResponse(BaseModel):
     email: str
     full_name: str
     is_active: bool
+    team_id: Optional[int] = None
     created_at: datetime
 
 class UserLogin(BaseModel):
@@ -23,6 +24,42 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+# Team schemas
+class TeamCreate(BaseModel):
+    name: str
+    organization: str
+
+class TeamJoin(BaseModel):
+    join_code: str
+
+class TeamResponse(BaseModel):
+    id: int
+    name: str
+    organization: str
+    created_at: datetime
+    join_code: Optional[str] = None  # only shown to the team's members
+
+class MetricDistribution(BaseModel):
+    mean: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+class BurnoutDistribution(BaseModel):
+    score_count: int
+    level_counts: Dict[str, int]
+    metrics: Dict[str, MetricDistribution]
+
+class TeamBurnoutDistribution(BaseModel):
+    team_id: int
+    team_name: str
+    distribution: BurnoutDistribution
+
+class OrganizationBurnoutDistribution(BaseModel):
+    organization: str
+    distribution: BurnoutDistribution
+    teams: List[TeamBurnoutDistribution]
+
 # Journal schemas
 class JournalEntryCreate(BaseModel):
     content: str
@@ -40,6 +77,8 @@ class WorkSessionCreate(BaseModel):
     end_time: datetime
     activity_type: str
     productivity_score: Optional[float] = None
+    # Set by agents that upload in batches, so retried uploads are not stored twice
+    client_id: Optional[str] = None
 
 class WorkSessionResponse(BaseModel):
     id: int
@@ -50,6 +89,19 @@ class WorkSessionResponse(BaseModel):
     productivity_score: Optional[float]
     created_at: datetime
 
+class WorkSessionBatchItemResult(BaseModel):
+    index: int
+    status: str
+    client_id: Optional[str] = None
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class WorkSessionBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[WorkSessionBatchItemResult]
+
 # Burnout schemas
 class BurnoutScoreResponse(BaseModel):
     id: int
@@ -58,9 +110,20 @@ class BurnoutScoreResponse(BaseModel):
     sentiment_score: float
     meeting_load_score: float
     email_stress_score: float
+    fragmentation_score: Optional[float] = None
     burnout_level: str
+    score_version: int
     calculated_at: datetime
 
+class BurnoutWindowScore(BaseModel):
+    overall_score: float
+    work_hours_score: float
+    sentiment_score: float
+    meeting_load_score: float
+    email_stress_score: float
+    fragmentation_score: float
+    burnout_level: str
+
 class BurnoutMetrics(BaseModel):
     current_score: float
     burnout_level: str
@@ -69,6 +132,19 @@ class BurnoutMetrics(BaseModel):
     meeting_load: int
     email_stress: float
     journal_sentiment: float
+    fragmentation: Optional[float] = None
+    windows: Optional[Dict[str, BurnoutWindowScore]] = None
+
+class BurnoutTrendPoint(BaseModel):
+    timestamp: datetime
+    score: float
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    count: int
+
+class BurnoutTrendResponse(BaseModel):
+    resolution: str
+    points: List[BurnoutTrendPoint]
 
 # Meeting schemas
 class MeetingResponse(BaseModel):
@@ -80,6 +156,21 @@ class MeetingResponse(BaseModel):
     attendees_count: int
     is_after_hours: bool
 
+class MeetingAnalyticsDay(BaseModel):
+    day: date
+    meeting_count: int
+    meeting_minutes: float
+    overlap_minutes: float
+    context_switches: int
+    longest_focus_minutes: Optional[float] = None
+    working_minutes: float
+
+class MeetingAnalyticsResponse(BaseModel):
+    days: List[MeetingAnalyticsDay]
+    overlap_minutes: float
+    context_switches: int
+    average_longest_focus_minutes: Optional[float] = None
+
 # Email schemas
 class EmailResponse(BaseModel):
     id: int
@@ -88,4 +179,41 @@ class EmailResponse(BaseModel):
     is_sent: bool
     is_after_hours: bool
     sentiment_score: Optional[float]
-    stress_indicators: Optional[Dict[str, Any]]
\ No newline at end of file
+    stress_indicators: Optional[Dict[str, Any]]
+# Working hours schemas
+class WorkingHoursProfileUpdate(BaseModel):
+    timezone: str = "UTC"
+    schedule: Dict[str, List[List[str]]]
+    holidays: List[date] = []
+
+class WorkingHoursProfileResponse(BaseModel):
+    timezone: str
+    schedule: Dict[str, List[List[str]]]
+    holidays: List[date]
+    updated_at: Optional[datetime] = None
+    reclassified: Optional[Dict[str, int]] = None
+
+# Search schemas
+class SearchResult(BaseModel):
+    type: str
+    id: int
+    title: Optional[str] = None
+    snippet: str
+    rank: float
+    occurred_at: datetime
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    limit: int
+    offset: int
+    next_offset: Optional[int] = None
+
+# Dashboard schemas
+class DashboardResponse(BaseModel):
+    metrics: Optional[BurnoutMetrics] = None
+    history: Optional[List[BurnoutScoreResponse]] = None
+    patterns: Optional[Dict[str, Any]] = None
+    journal: Optional[List[JournalEntryResponse]] = None
+    meetings: Optional[List[MeetingResponse]] = None
+    emails: Optional[List[EmailResponse]] = None
@@ -0,0 +1,45 @@
+"""Backfill daily burnout scores for a past date range.
+
+Writes one score per user per day, computed as of the end of that day
+from the events already stored (for example after an integration imports
+a year of history). Rerunning over the same range replaces the earlier
+backfill, so it is safe to repeat after more history arrives.
+
+Usage:
+    python -m scripts.backfill_scores --start 2025-01-01 --end 2025-12-31 [--user-id 1 --user-id 2] [--window-days 7]
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from database.database import SessionLocal, use_user_shard
+from database.models import User
+from services.burnout_analyzer import burnout_analyzer
+
+def main(argv=None) -> int:
+    yesterday = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description="Compute and store as-of-date daily burnout scores")
+    parser.add_argument("--start", type=date.fromisoformat, default=yesterday - timedelta(days=364), help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=yesterday, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Restrict to a user (repeatable)")
+    parser.add_argument("--window-days", type=int, default=7, help="Days of events behind each score")
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("--end must not be before --start")
+
+    db = SessionLocal()
+    try:
+        user_ids = args.user_ids or [
+            user_id for (user_id,) in db.query(User.id).filter(User.is_active == True).order_by(User.id).all()
+        ]
+        for user_id in user_ids:
+            use_user_shard(db, user_id)
+            written = burnout_analyzer.backfill_daily_scores(db, user_id, args.start, args.end, args.window_days)
+            print(f"user {user_id}: {written} daily scores from {args.start} to {args.end}")
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Cold-start import-time report.
+
+Imports the application in fresh interpreters, reports the wall-clock
+import time and the slowest modules from ``python -X importtime``, and
+fails when the median exceeds the budget.
+
+Usage:
+    python -m scripts.check_import_time --budget-ms 1200 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1200"))
+
+TIMER = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+def measure_once(module: str) -> float:
+    """Import the module in a fresh interpreter and return milliseconds"""
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(module=module)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def slowest_modules(module: str, top: int):
+    """Return the top-level imports with the largest cumulative import time"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        cumulative = int(parts[1])
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((cumulative / 1000, name.strip(), depth))
+    top_level = [entry for entry in entries if entry[2] <= 1]
+    return sorted(top_level, key=lambda entry: entry[0], reverse=True)[:top]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the API")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    args = parser.parse_args(argv)
+
+    samples = [measure_once(args.module) for _ in range(args.runs)]
+    median = statistics.median(samples)
+    modules = slowest_modules(args.module, args.top)
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": median,
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "budget_ms": args.budget_ms,
+        "within_budget": median <= args.budget_ms,
+        "slowest_imports": [{"module": name, "cumulative_ms": ms} for ms, name, _ in modules],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.module}: median {median:.0f}ms (min {min(samples):.0f}ms, max {max(samples):.0f}ms) "
+              f"over {args.runs} runs, budget {args.budget_ms:.0f}ms")
+        print("Slowest imports (cumulative):")
+        for ms, name, _ in modules:
+            print(f"  {ms:8.1f}ms  {name}")
+        if not report["within_budget"]:
+            print("Import time exceeds budget", file=sys.stderr)
+
+    return 0 if report["within_budget"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Bulk export of burnout and activity data.
+
+Usage:
+    python -m scripts.export_data emails --format parquet --output emails.parquet \
+        --start-date 2024-01-01 --user-id 1 --user-id 2
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from database.database import SessionLocal, shard_count, use_shard, use_user_shard
+from services.export_service import export_service, ExportError, EXPORT_TABLES, EXPORT_FORMATS
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a table export to NDJSON, Parquet or Arrow")
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("--format", default="ndjson", choices=EXPORT_FORMATS)
+    parser.add_argument("--output", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Restrict to a user (repeatable)")
+    parser.add_argument("--start-date", type=datetime.fromisoformat, help="Only rows at or after this time")
+    parser.add_argument("--end-date", type=datetime.fromisoformat, help="Only rows before this time")
+    parser.add_argument("--columns", help="Comma-separated column projection")
+    parser.add_argument("--include-body", action="store_true", help="Include email bodies")
+    parser.add_argument("--chunk-size", type=int, default=export_service.chunk_size)
+    parser.add_argument("--shard", type=int, help="Shard to export from when sharded (default: the shard of the --user-id users)")
+    args = parser.parse_args(argv)
+
+    export_service.chunk_size = args.chunk_size
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+
+    db = SessionLocal()
+    try:
+        if args.shard is not None:
+            use_shard(db, args.shard)
+        elif shard_count() > 1:
+            # One output file holds one shard's rows
+            shards = {use_user_shard(db, user_id, allow_locked=True).info["shard"] for user_id in args.user_ids or []}
+            if len(shards) != 1:
+                parser.error("rows are sharded; pass --shard, or --user-id users who are all on one shard")
+            use_shard(db, shards.pop())
+        chunks = export_service.export(
+            db, args.table, args.format,
+            user_ids=args.user_ids,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            columns=columns,
+            include_body=args.include_body
+        )
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            written = 0
+            for data in chunks:
+                output.write(data)
+                written += len(data)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+    except ExportError as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(f"Exported {args.table} ({written} bytes)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
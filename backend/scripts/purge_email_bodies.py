@@ -0,0 +1,30 @@
+"""Drop stored email bodies that are past the retention window.
+
+Usage:
+    python -m scripts.purge_email_bodies [--retention-days 7]
+"""
+import argparse
+import sys
+
+from database.database import SessionLocal, shard_count, use_shard
+from services.email_body_store import email_body_store
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Purge email bodies past EMAIL_BODY_RETENTION_DAYS")
+    parser.add_argument("--retention-days", type=int, default=email_body_store.retention_days)
+    args = parser.parse_args(argv)
+
+    email_body_store.retention_days = args.retention_days
+    deleted = 0
+    for shard in range(shard_count()):
+        db = use_shard(SessionLocal(), shard)
+        try:
+            deleted += email_body_store.purge_expired(db)
+        finally:
+            db.close()
+
+    print(f"Purged {deleted} email bodies")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
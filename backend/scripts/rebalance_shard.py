@@ -0,0 +1,205 @@
+"""Move users' rows between the databases in SHARD_DATABASE_URLS.
+
+A move locks the user in the directory (writes get a 503 with Retry-After),
+waits for requests already routed to finish, copies every per-user row to
+the target shard, points the directory at it, unlocks and finally deletes
+the rows from the source. Copied rows get new ids on the target, so the
+user's resource versions are bumped and clients refetch. A move that fails
+before the directory changes leaves the user on the source; leftovers on
+the target are cleared by the next move there.
+
+After appending a shard, --rehash moves exactly the users whose hashed shard
+is now the new one (about 1/N of them).
+
+Usage:
+    python -m scripts.rebalance_shard --status
+    python -m scripts.rebalance_shard --user-id 42 --to-shard 2 [--user-id 43]
+    python -m scripts.rebalance_shard --rehash [--dry-run] [--grace-seconds 5]
+"""
+import argparse
+import sys
+import time
+from typing import Dict, Iterable, List
+
+from sqlalchemy import case, delete, func, insert, select
+
+from database.database import SessionLocal, GLOBAL_TABLES, SHARD_LOCK_RETRY_SECONDS, shard_count, shard_for_user_id, use_shard
+from database.models import (
+    Base, User, JournalEntry, WorkSession, Meeting, Email, EmailBody, BurnoutScore,
+    WorkingHoursProfile, BurnoutBaseline, ResourceVersion, DailyActivityAggregate
+)
+from services.resource_versions import resource_versions, RESOURCES
+
+# Per-user tables in copy order: baselines refer to scores, email bodies to emails
+USER_MODELS = [
+    JournalEntry, WorkSession, Meeting, Email, BurnoutScore,
+    WorkingHoursProfile, BurnoutBaseline, ResourceVersion, DailyActivityAggregate,
+]
+COPIED_TABLES = {model.__tablename__ for model in USER_MODELS} | {EmailBody.__tablename__}
+
+def _has_surrogate_id(table) -> bool:
+    return "id" in table.c and table.c.id.primary_key
+
+def copy_rows(user_id: int, source: int, target: int, chunk_size: int) -> Dict[str, int]:
+    """Copy the user's rows from source to target in one target transaction; returns rows per table"""
+    src = use_shard(SessionLocal(), source)
+    dst = use_shard(SessionLocal(), target)
+    counts: Dict[str, int] = {}
+    new_ids: Dict[str, Dict[int, int]] = {}
+    try:
+        delete_rows(dst, user_id)
+        for model in USER_MODELS:
+            table = model.__table__
+            order = [column for column in table.primary_key.columns]
+            result = src.execute(
+                select(table).where(table.c.user_id == user_id).order_by(*order).execution_options(yield_per=chunk_size)
+            ).mappings()
+            counts[table.name] = 0
+            for chunk in result.partitions():
+                rows = [dict(row) for row in chunk]
+                if model is BurnoutBaseline:
+                    for row in rows:
+                        row["last_score_id"] = new_ids.get("burnout_scores", {}).get(row["last_score_id"])
+                if _has_surrogate_id(table):
+                    # Ids come from the target's own sequence; the source ids may already be taken there
+                    old_ids = [row.pop("id") for row in rows]
+                    ids = dst.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars().all()
+                    new_ids.setdefault(table.name, {}).update(zip(old_ids, ids))
+                    if model is Email:
+                        counts["email_bodies"] = counts.get("email_bodies", 0) + _copy_email_bodies(src, dst, dict(zip(old_ids, ids)))
+                else:
+                    dst.execute(insert(table), rows)
+                counts[table.name] += len(rows)
+
+        # Copies have new ids, so cached ETags and event caches must not match them
+        resource_versions.bump(dst, user_id, *RESOURCES)
+        dst.commit()
+    except BaseException:
+        dst.rollback()
+        raise
+    finally:
+        src.close()
+        dst.close()
+    return counts
+
+def _copy_email_bodies(src, dst, email_ids: Dict[int, int]) -> int:
+    table = EmailBody.__table__
+    rows = [dict(row) for row in src.execute(select(table).where(table.c.email_id.in_(list(email_ids)))).mappings()]
+    for row in rows:
+        row["email_id"] = email_ids[row["email_id"]]
+    if rows:
+        dst.execute(insert(table), rows)
+    return len(rows)
+
+def delete_rows(db, user_id: int):
+    """Delete every per-user row of the user from db's shard, in the caller's transaction"""
+    bodies = EmailBody.__table__
+    emails = Email.__table__
+    db.execute(delete(bodies).where(bodies.c.email_id.in_(select(emails.c.id).where(emails.c.user_id == user_id))))
+    for model in reversed(USER_MODELS):
+        db.execute(delete(model.__table__).where(model.__table__.c.user_id == user_id))
+
+def move_user(user_id: int, target: int, grace_seconds: float, chunk_size: int) -> Dict[str, int]:
+    """Move one user's rows to target and repoint the directory; returns rows copied per table"""
+    directory = SessionLocal()
+    try:
+        user = directory.get(User, user_id)
+        if user is None:
+            raise LookupError(f"User {user_id} not found")
+        source = user.shard
+        if source == target:
+            return {}
+        user.shard_locked = True
+        directory.commit()
+
+        try:
+            # Requests routed to the source before the lock may still be writing there
+            time.sleep(grace_seconds)
+            counts = copy_rows(user_id, source, target, chunk_size)
+            user.shard = target
+            user.shard_locked = False
+            directory.commit()
+        except BaseException:
+            directory.rollback()
+            user.shard_locked = False
+            directory.commit()
+            raise
+    finally:
+        directory.close()
+
+    # The directory already points at the target; leftovers here are never read
+    src = use_shard(SessionLocal(), source)
+    try:
+        delete_rows(src, user_id)
+        src.commit()
+    finally:
+        src.close()
+    return counts
+
+def rehash_moves(user_ids: Iterable[int] = ()) -> List[tuple]:
+    """(user_id, current shard, hashed shard) for users not on the shard their id hashes to"""
+    db = SessionLocal()
+    try:
+        query = db.query(User.id, User.shard).order_by(User.id)
+        if user_ids:
+            query = query.filter(User.id.in_(list(user_ids)))
+        return [(user_id, shard, shard_for_user_id(user_id)) for user_id, shard in query if shard != shard_for_user_id(user_id)]
+    finally:
+        db.close()
+
+def print_status():
+    db = SessionLocal()
+    try:
+        rows = db.query(User.shard, func.count(User.id), func.sum(case((User.shard_locked, 1), else_=0))).group_by(User.shard).all()
+    finally:
+        db.close()
+    for shard, users, locked in sorted(rows):
+        print(f"shard {shard}: {users} users" + (f", {locked} locked" if locked else ""))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Move users' rows between shards")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="User to move (repeatable)")
+    parser.add_argument("--to-shard", type=int, help="Target shard index in SHARD_DATABASE_URLS")
+    parser.add_argument("--rehash", action="store_true", help="Move users not on the shard their id hashes to")
+    parser.add_argument("--status", action="store_true", help="Print users per shard and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the moves")
+    parser.add_argument("--grace-seconds", type=float, default=SHARD_LOCK_RETRY_SECONDS,
+                        help="Wait after locking a user, for requests already routed to finish")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    # A per-user table missing from USER_MODELS would be left behind by every move
+    uncopied = set(Base.metadata.tables) - GLOBAL_TABLES - COPIED_TABLES
+    if uncopied:
+        raise SystemExit(f"Per-user tables not handled by rebalance_shard: {', '.join(sorted(uncopied))}")
+
+    if args.status:
+        print_status()
+        return 0
+    if shard_count() < 2:
+        parser.error("SHARD_DATABASE_URLS must list at least two databases")
+    if args.rehash == (args.to_shard is not None):
+        parser.error("pass either --to-shard with --user-id, or --rehash")
+    if args.to_shard is not None:
+        if not args.user_ids:
+            parser.error("--to-shard needs --user-id")
+        if not 0 <= args.to_shard < shard_count():
+            parser.error(f"--to-shard must be between 0 and {shard_count() - 1}")
+        moves = [(user_id, None, args.to_shard) for user_id in args.user_ids]
+    else:
+        moves = rehash_moves(args.user_ids or ())
+
+    for user_id, source, target in moves:
+        if args.dry_run:
+            print(f"user {user_id}: would move {'' if source is None else f'from shard {source} '}to shard {target}")
+            continue
+        counts = move_user(user_id, target, args.grace_seconds, args.chunk_size)
+        if not counts:
+            print(f"user {user_id}: already on shard {target}")
+            continue
+        summary = ", ".join(f"{table}={count}" for table, count in counts.items() if count)
+        print(f"user {user_id}: moved to shard {target} ({summary or 'no rows'})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Rebuild per-user anomaly baselines from burnout score history.
+
+Only needed for recovery (lost or corrupted state, or changed EWMA
+parameters); normal operation updates baselines as scores are written.
+
+Usage:
+    python -m scripts.rebuild_anomaly_baselines [--user-id 1 --user-id 2]
+"""
+import argparse
+import sys
+
+from database.database import SessionLocal, shard_count, use_shard, use_user_shard
+from database.models import BurnoutScore
+from services.anomaly_detector import anomaly_detector
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay burnout history into anomaly baselines")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Restrict to a user (repeatable)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_ids = args.user_ids
+        if not user_ids:
+            user_ids = set()
+            for shard in range(shard_count()):
+                use_shard(db, shard)
+                user_ids.update(user_id for (user_id,) in db.query(BurnoutScore.user_id).distinct().all())
+            user_ids = sorted(user_ids)
+        for user_id in user_ids:
+            use_user_shard(db, user_id)
+            state = anomaly_detector.rebuild_from_history(db, user_id)
+            print(f"user {user_id}: {state.get('overall_score', {}).get('count', 0)} days replayed")
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
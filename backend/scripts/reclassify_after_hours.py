@@ -0,0 +1,35 @@
+"""Recompute the after-hours flag on stored meetings and emails.
+
+Saving a working hours profile already reclassifies that user's rows.
+Run this after upgrading, to replace flags that came from the sync
+payload, or after changing the default schedule.
+
+Usage:
+    python -m scripts.reclassify_after_hours [--user-id 1 --user-id 2]
+"""
+import argparse
+import sys
+
+from database.database import SessionLocal, use_user_shard
+from database.models import User
+from services.working_hours import working_hours
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reclassify after-hours meetings and emails against working hours")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Restrict to a user (repeatable)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_ids = args.user_ids or [user_id for (user_id,) in db.query(User.id).order_by(User.id).all()]
+        for user_id in user_ids:
+            use_user_shard(db, user_id)
+            changed = working_hours.reclassify(db, user_id)
+            db.commit()
+            print(f"user {user_id}: {changed['meetings']} meetings, {changed['emails']} emails reclassified")
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
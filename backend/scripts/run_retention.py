@@ -0,0 +1,46 @@
+"""Archive and drop raw events older than the retention window.
+
+Expired months are rolled up into daily_activity_aggregates, written to
+gzipped NDJSON under ARCHIVE_DIR and removed from the hot tables (whole
+partitions are dropped on PostgreSQL). Upcoming monthly partitions are
+created on every run, so schedule it at least monthly.
+
+Usage:
+    python -m scripts.run_retention [--retention-days 90] [--archive-dir archive] [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+from database.database import SessionLocal, shard_count, use_shard
+from services.retention_service import retention_service
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Roll up, archive and drop events past EVENT_RETENTION_DAYS")
+    parser.add_argument("--retention-days", type=int, default=retention_service.retention_days)
+    parser.add_argument("--archive-dir", default=retention_service.archive_dir)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    args = parser.parse_args(argv)
+
+    retention_service.retention_days = args.retention_days
+    shards = shard_count()
+    for shard in range(shards):
+        # Each shard archives the same months, so shards get their own archive directories
+        retention_service.archive_dir = args.archive_dir if shards == 1 else os.path.join(args.archive_dir, f"shard-{shard}")
+        db = use_shard(SessionLocal(), shard)
+        try:
+            report = retention_service.run(db, dry_run=args.dry_run)
+        finally:
+            db.close()
+
+        prefix = "" if shards == 1 else f"Shard {shard}: "
+        if report["partitions_created"]:
+            print(f"{prefix}Created partitions: {', '.join(report['partitions_created'])}")
+        print(f"{prefix}Cutoff: {report['cutoff']}")
+        for month, counts in report["months"].items():
+            summary = ", ".join(f"{table}={count}" for table, count in counts.items())
+            print(f"{prefix}{'Would archive' if args.dry_run else 'Archived'} {month}: {summary}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import math
+import os
+from dotenv import load_dotenv
+
+from database.models import BurnoutBaseline, BurnoutScore, SCORE_VERSION
+
+load_dotenv()
+
+ANOMALY_EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", "0.1"))
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3.0"))
+# Scored days before alerts start
+ANOMALY_WARMUP_SCORES = int(os.getenv("ANOMALY_WARMUP_SCORES", "10"))
+# Floor on the standard deviation so a flat history does not turn tiny changes into alerts
+ANOMALY_MIN_STD = float(os.getenv("ANOMALY_MIN_STD", "0.05"))
+
+# Only scores over this window feed the baseline, so a 30-day refresh is never compared with 7-day history
+BASELINE_TIMEFRAME_DAYS = 7
+
+ANOMALY_METRICS = ["overall_score", "work_hours_score", "sentiment_score", "meeting_load_score", "email_stress_score", "fragmentation_score"]
+
+class BurnoutAnomalyDetector:
+    """Online per-user anomaly detection using exponentially weighted mean and variance.
+
+    The baseline takes one value per day: each 7-day score is compared with
+    the baseline through the previous day and kept as the day's pending value,
+    and a day's last pending value is folded in once a later day is scored.
+    Refreshing without new data, or in another timeframe, leaves it unchanged.
+    """
+
+    def __init__(self, alpha: float = ANOMALY_EWMA_ALPHA, threshold: float = ANOMALY_Z_THRESHOLD,
+                 warmup: int = ANOMALY_WARMUP_SCORES, min_std: float = ANOMALY_MIN_STD):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_std = min_std
+
+    def _z_score(self, state: Dict[str, Dict], metric: str, value: float) -> Optional[float]:
+        """z-score of value against one metric's state; None until the warmup is over"""
+        current = state.get(metric)
+        if current is None or current["count"] < self.warmup:
+            return None
+        return (value - current["mean"]) / max(math.sqrt(current["var"]), self.min_std)
+
+    def _step(self, state: Dict[str, Dict], metric: str, value: float) -> Optional[float]:
+        """Update one metric's EWMA state in place and return the z-score of value against the prior state"""
+        current = state.get(metric)
+        if current is None:
+            state[metric] = {"mean": value, "var": 0.0, "count": 1}
+            return None
+
+        z_score = self._z_score(state, metric, value)
+        mean, var, count = current["mean"], current["var"], current["count"]
+
+        # Incremental EWMA update (West, 1979): O(1) per score
+        diff = value - mean
+        increment = self.alpha * diff
+        state[metric] = {
+            "mean": mean + increment,
+            "var": (1 - self.alpha) * (var + diff * increment),
+            "count": count + 1
+        }
+        return z_score
+
+    def _fold(self, state: Dict[str, Dict], pending: Optional[Dict]):
+        for metric, value in ((pending or {}).get("values") or {}).items():
+            self._step(state, metric, value)
+
+    def _pending(self, state: Dict[str, Dict], score: BurnoutScore, alerted=()) -> Tuple[Dict, List[Dict]]:
+        """The day's pending entry for score and the alerts it raises, skipping metrics already alerted that day"""
+        values = {metric: getattr(score, metric) for metric in ANOMALY_METRICS if getattr(score, metric) is not None}
+        if score.score_version != SCORE_VERSION:
+            # An overall score under older weights is not comparable with the baseline; its components still are
+            values.pop("overall_score", None)
+        alerted = set(alerted)
+        alerts = []
+        for metric, value in values.items():
+            z_score = self._z_score(state, metric, value)
+            # Only rises are burnout risk; every component is "higher is worse"
+            if z_score is not None and z_score >= self.threshold and metric not in alerted:
+                alerted.add(metric)
+                alerts.append({
+                    "metric": metric,
+                    "value": value,
+                    "baseline_mean": state[metric]["mean"],
+                    "z_score": z_score,
+                    "calculated_at": score.calculated_at
+                })
+        day = (score.calculated_at or datetime.utcnow()).date().isoformat()
+        return {"day": day, "values": values, "alerted": sorted(alerted)}, alerts
+
+    def _insert(self, db: Session):
+        dialect = db.get_bind(BurnoutBaseline.__mapper__).dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Anomaly baselines are not supported on {dialect}")
+        return dialect_insert(BurnoutBaseline.__table__)
+
+    def update(self, db: Session, user_id: int, score: BurnoutScore) -> List[Dict]:
+        """Compare a newly written 7-day score with the user's baseline and return any alerts"""
+        if score.timeframe_days != BASELINE_TIMEFRAME_DAYS:
+            return []
+
+        # Concurrent first scores would both insert the row; the loser waits on the lock below instead
+        db.execute(self._insert(db).values(
+            user_id=user_id, state={}, updated_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=["user_id"]))
+        baseline = db.query(BurnoutBaseline).filter(
+            BurnoutBaseline.user_id == user_id
+        ).with_for_update().populate_existing().one()
+
+        state = dict(baseline.state or {})
+        pending = baseline.pending or {}
+        day = (score.calculated_at or datetime.utcnow()).date().isoformat()
+        if pending.get("day") != day:
+            self._fold(state, pending)
+            pending = {}
+
+        pending, alerts = self._pending(state, score, pending.get("alerted", ()))
+
+        baseline.state = state
+        baseline.pending = pending
+        baseline.last_score_id = score.id
+        baseline.updated_at = datetime.utcnow()
+        return alerts
+
+    def rebuild_from_history(self, db: Session, user_id: int, batch_size: int = 1000) -> Dict[str, Dict]:
+        """Recompute a user's baseline by replaying their daily 7-day score history once"""
+        state: Dict[str, Dict] = {}
+        pending: Optional[Dict] = None
+        last_score = None
+
+        query = db.query(BurnoutScore).filter(
+            BurnoutScore.user_id == user_id,
+            BurnoutScore.timeframe_days == BASELINE_TIMEFRAME_DAYS
+        ).order_by(BurnoutScore.calculated_at, BurnoutScore.id).yield_per(batch_size)
+        for score in query:
+            # Only each day's last score counts, as when the scores were written
+            if last_score is not None and last_score.calculated_at.date() != score.calculated_at.date():
+                self._fold(state, self._pending(state, last_score)[0])
+            last_score = score
+        if last_score is not None:
+            # The latest day stays pending; its alerts were sent when it was scored
+            pending, _ = self._pending(state, last_score)
+
+        baseline = db.query(BurnoutBaseline).filter(BurnoutBaseline.user_id == user_id).first()
+        if baseline is None:
+            baseline = BurnoutBaseline(user_id=user_id)
+            db.add(baseline)
+        baseline.state = state
+        baseline.pending = pending
+        baseline.last_score_id = last_score.id if last_score is not None else None
+        baseline.updated_at = datetime.utcnow()
+        db.commit()
+        return state
+
+anomaly_detector = BurnoutAnomalyDetector()
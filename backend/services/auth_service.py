@@ -8,6 +8,7 @@ import os
 from dotenv import load_dotenv
 
 from database.models import User
+from database.database import place_new_user
 from models.schemas import UserCreate
 
 load_dotenv()
@@ -73,6 +74,7 @@ class AuthService:
             full_name=user_data.full_name
         )
         db.add(db_user)
+        place_new_user(db, db_user)
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -1,52 +1,256 @@
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, date, time
+from typing import Callable, Dict, List, Optional, Sequence
+from itertools import accumulate
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 import statistics
 
-from database.models import User, WorkSession, JournalEntry, Meeting, Email, BurnoutScore
+from database.models import User, BurnoutScore, SCORE_VERSION
+from services.downsampling import lttb
+from services.team_aggregator import team_aggregator
+from services.anomaly_detector import anomaly_detector
+from services.resource_versions import resource_versions
+from services.working_hours import working_hours
+from services.meeting_analytics import meeting_analytics
+from services.event_cache import event_cache
+
+DAY = timedelta(days=1)
+# Rows per INSERT when backfilling historical scores
+BACKFILL_CHUNK_SIZE = 1000
+# Trends chart one series: the 7-day score, whichever timeframe the dashboard was refreshed with
+TREND_TIMEFRAME_DAYS = 7
 
 class BurnoutAnalyzer:
     def __init__(self):
-        self.work_hours_weight = 0.25
-        self.sentiment_weight = 0.25
-        self.meeting_load_weight = 0.25
-        self.email_stress_weight = 0.25
+        # Weights of SCORE_VERSION 2; changing them means a new version, stored with each score
+        self.work_hours_weight = 0.2
+        self.sentiment_weight = 0.2
+        self.meeting_load_weight = 0.2
+        self.email_stress_weight = 0.2
+        self.fragmentation_weight = 0.2
     
-    def calculate_burnout_score(self, db: Session, user_id: int, timeframe_days: int = 7) -> Dict:
-        """Calculate comprehensive burnout score for a user"""
+    def calculate_burnout_score(self, db: Session, user_id: int, timeframe_days: int = 7, windows: Sequence[int] = ()) -> Dict:
+        """Calculate comprehensive burnout score for a user.
+        
+        The score for timeframe_days is stored; every extra window in windows is
+        computed from the same scan and returned under "windows".
+        """
         end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=timeframe_days)
+        breakdowns = self.calculate_window_scores(db, user_id, [timeframe_days, *windows], end_date)
+        primary = breakdowns[timeframe_days]
+        
+        # Save to database
+        burnout_record = BurnoutScore(
+            user_id=user_id,
+            overall_score=primary["overall_score"],
+            work_hours_score=primary["work_hours_score"],
+            sentiment_score=primary["sentiment_score"],
+            meeting_load_score=primary["meeting_load_score"],
+            email_stress_score=primary["email_stress_score"],
+            fragmentation_score=primary["fragmentation_score"],
+            burnout_level=primary["burnout_level"],
+            timeframe_days=timeframe_days,
+            score_version=SCORE_VERSION,
+            calculated_at=datetime.utcnow()
+        )
+        db.add(burnout_record)
+        db.flush()
+        
+        # Keep the team distribution sketch and the user's baseline current in the same transaction
+        team_aggregator.record_score(db, user_id, burnout_record)
+        anomalies = anomaly_detector.update(db, user_id, burnout_record)
+        resource_versions.bump(db, user_id, "burnout_scores")
+        db.commit()
+        
+        result = {
+            **primary,
+            "calculated_at": datetime.utcnow(),
+            "anomalies": anomalies
+        }
+        if windows:
+            result["windows"] = {f"{days}d": breakdowns[days] for days in sorted(set(windows))}
+        return result
+    
+    def calculate_window_scores(self, db: Session, user_id: int, windows: Sequence[int], end_date: Optional[datetime] = None) -> Dict[int, Dict]:
+        """Component and overall scores for each window (in days) ending at end_date.
+        
+        Events of the longest window are read once and summed into one bucket
+        per day of age (bucket k holds events between k and k+1 days old), so
+        every shorter window is a prefix sum over the same buckets.
+        """
+        end_date = end_date or datetime.utcnow()
+        windows = sorted(set(windows))
+        longest = windows[-1]
+        
+        def bucket(timestamp: datetime) -> int:
+            # ceil(age / 1 day) - 1 in exact integer arithmetic, so an event exactly N days old is inside the N-day window
+            return max(0, -((timestamp - end_date) // DAY) - 1)
+        
+        series = self._daily_series(db, user_id, end_date - timedelta(days=longest), end_date, longest, bucket)
+        prefix = {name: list(accumulate(values)) for name, values in series.items()}
+        return {
+            days: self._breakdown({name: values[days - 1] for name, values in prefix.items()})
+            for days in windows
+        }
+    
+    def backfill_daily_scores(self, db: Session, user_id: int, start: date, end: date, window_days: int = 7) -> int:
+        """Store one score per day from start to end, as of the end of that day, and return how many were written.
+        
+        Each score covers the window_days calendar days ending with its day.
+        Events are read in one pass and combined with sliding-window sums.
+        Rerunning replaces the earlier backfill for the range.
+        """
+        first_day = start - timedelta(days=window_days - 1)
+        size = (end - first_day).days + 1
+        
+        def bucket(timestamp: datetime) -> int:
+            return (timestamp.date() - first_day).days
+        
+        series = self._daily_series(
+            db, user_id, datetime.combine(first_day, time.min), datetime.combine(end + DAY, time.min), size, bucket,
+            include_end=False
+        )
+        
+        rows = []
+        running = dict.fromkeys(series, 0)
+        for index in range(size):
+            for name, values in series.items():
+                running[name] += values[index]
+                if index >= window_days:
+                    running[name] -= values[index - window_days]
+            if index < window_days - 1:
+                continue
+            breakdown = self._breakdown(running)
+            rows.append({
+                "user_id": user_id,
+                **breakdown,
+                # Stamped on the day it describes, so daily trends bucket it correctly
+                "calculated_at": datetime.combine(first_day + timedelta(days=index), time.max),
+                "timeframe_days": window_days,
+                "score_version": SCORE_VERSION,
+                "is_backfill": True
+            })
+        
+        # Delete-then-insert keeps reruns over the same range idempotent
+        db.query(BurnoutScore).filter(
+            BurnoutScore.user_id == user_id,
+            BurnoutScore.is_backfill == True,
+            BurnoutScore.calculated_at >= datetime.combine(start, time.min),
+            BurnoutScore.calculated_at < datetime.combine(end + DAY, time.min)
+        ).delete(synchronize_session=False)
+        for offset in range(0, len(rows), BACKFILL_CHUNK_SIZE):
+            db.execute(insert(BurnoutScore), rows[offset:offset + BACKFILL_CHUNK_SIZE])
+        resource_versions.bump(db, user_id, "burnout_scores")
+        db.commit()
+        return len(rows)
+    
+    def _daily_series(
+        self,
+        db: Session,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        size: int,
+        bucket: Callable[[datetime], int],
+        include_end: bool = True
+    ) -> Dict[str, List[float]]:
+        """One pass over each event table between start_date and end_date, summed into size daily buckets"""
+        # Only the columns the score needs, from the in-memory event cache when the user is warm; bodies are never loaded
+        events = event_cache.rows(
+            db, user_id, ("work_sessions", "journal_entries", "meetings", "emails"), start_date, end_date, include_end
+        )
+        
+        def series():
+            return [0] * size
+        
+        # Work sessions: hours per bucket, and the newest bucket of each calendar day for the active-day count
+        work_hours, first_bucket_of_day, session_intervals = series(), {}, []
+        # Legacy rows may have no end time; they count as zero-length intervals
+        for start_time, end_time, duration_minutes, activity_type in events["work_sessions"]:
+            session_intervals.append((start_time, end_time or start_time, activity_type))
+            k = bucket(start_time)
+            work_hours[k] += duration_minutes / 60
+            day = start_time.date()
+            first_bucket_of_day[day] = min(k, first_bucket_of_day.get(day, k))
+        active_days = series()
+        for k in first_bucket_of_day.values():
+            active_days[k] += 1
+        
+        journal_sentiment, journal_count = series(), series()
+        for created_at, sentiment_score in events["journal_entries"]:
+            if sentiment_score is None:
+                continue
+            k = bucket(created_at)
+            journal_sentiment[k] += sentiment_score
+            journal_count[k] += 1
+        
+        meeting_count, meeting_minutes, meeting_after_hours, meeting_intervals = series(), series(), series(), []
+        for start_time, end_time, duration_minutes, is_after_hours in events["meetings"]:
+            meeting_intervals.append((start_time, end_time or start_time))
+            k = bucket(start_time)
+            meeting_count[k] += 1
+            meeting_minutes[k] += duration_minutes
+            meeting_after_hours[k] += 1 if is_after_hours else 0
+        
+        email_count, email_after_hours, email_sentiment, email_sentiment_count = series(), series(), series(), series()
+        for sent_at, is_after_hours, sentiment_score in events["emails"]:
+            k = bucket(sent_at)
+            email_count[k] += 1
+            email_after_hours[k] += 1 if is_after_hours else 0
+            if sentiment_score is not None:
+                email_sentiment[k] += sentiment_score
+                email_sentiment_count[k] += 1
+        
+        # Fragmentation is measured per day in the user's timezone, from the rows already read
+        overlap, switches, analyzed_days, focus_minutes, focus_days = series(), series(), series(), series(), series()
+        profile = working_hours.get_profile(db, user_id)
+        for metrics in meeting_analytics.daily_metrics(
+            profile, meeting_intervals, session_intervals,
+            working_hours.local_day(profile, start_date), working_hours.local_day(profile, end_date)
+        ).values():
+            anchor = metrics["anchor"]
+            # Days mostly outside the range; the current day counts as its latest bucket
+            if anchor < start_date or (anchor >= end_date and not include_end):
+                continue
+            k = bucket(min(anchor, end_date))
+            overlap[k] += metrics["overlap_minutes"]
+            switches[k] += metrics["context_switches"]
+            analyzed_days[k] += 1
+            if metrics["longest_focus_minutes"] is not None:
+                focus_minutes[k] += metrics["longest_focus_minutes"]
+                focus_days[k] += 1
         
-        # Calculate individual metrics
-        work_hours_score = self._calculate_work_hours_score(db, user_id, start_date, end_date)
-        sentiment_score = self._calculate_sentiment_score(db, user_id, start_date, end_date)
-        meeting_load_score = self._calculate_meeting_load_score(db, user_id, start_date, end_date)
-        email_stress_score = self._calculate_email_stress_score(db, user_id, start_date, end_date)
+        return {
+            "work_hours": work_hours, "active_days": active_days,
+            "journal_sentiment": journal_sentiment, "journal_count": journal_count,
+            "meeting_count": meeting_count, "meeting_minutes": meeting_minutes, "meeting_after_hours": meeting_after_hours,
+            "email_count": email_count, "email_after_hours": email_after_hours,
+            "email_sentiment": email_sentiment, "email_sentiment_count": email_sentiment_count,
+            "overlap_minutes": overlap, "context_switches": switches, "analyzed_days": analyzed_days,
+            "focus_minutes": focus_minutes, "focus_days": focus_days,
+        }
+    
+    def _breakdown(self, total: Dict[str, float]) -> Dict:
+        """Component, overall score and level from the summed events of one window"""
+        work_hours_score = self._work_hours_score(total["work_hours"], total["active_days"])
+        sentiment_score = self._sentiment_score(total["journal_sentiment"], total["journal_count"])
+        meeting_load_score = self._meeting_load_score(total["meeting_count"], total["meeting_minutes"], total["meeting_after_hours"])
+        email_stress_score = self._email_stress_score(
+            total["email_count"], total["email_after_hours"], total["email_sentiment"], total["email_sentiment_count"]
+        )
+        fragmentation_score = self._fragmentation_score(
+            total["overlap_minutes"], total["context_switches"], total["analyzed_days"],
+            total["focus_minutes"], total["focus_days"]
+        )
         
         # Calculate weighted overall score
         overall_score = (
             work_hours_score * self.work_hours_weight +
             sentiment_score * self.sentiment_weight +
             meeting_load_score * self.meeting_load_weight +
-            email_stress_score * self.email_stress_weight
-        )
-        
-        # Determine burnout level
-        burnout_level = self._classify_burnout_level(overall_score)
-        
-        # Save to database
-        burnout_record = BurnoutScore(
-            user_id=user_id,
-            overall_score=overall_score,
-            work_hours_score=work_hours_score,
-            sentiment_score=sentiment_score,
-            meeting_load_score=meeting_load_score,
-            email_stress_score=email_stress_score,
-            burnout_level=burnout_level
+            email_stress_score * self.email_stress_weight +
+            fragmentation_score * self.fragmentation_weight
         )
-        db.add(burnout_record)
-        db.commit()
         
         return {
             "overall_score": overall_score,
@@ -54,31 +258,17 @@ class BurnoutAnalyzer:
             "sentiment_score": sentiment_score,
             "meeting_load_score": meeting_load_score,
             "email_stress_score": email_stress_score,
-            "burnout_level": burnout_level,
-            "calculated_at": datetime.utcnow()
+            "fragmentation_score": fragmentation_score,
+            "burnout_level": self._classify_burnout_level(overall_score)
         }
     
-    def _calculate_work_hours_score(self, db: Session, user_id: int, start_date: datetime, end_date: datetime) -> float:
-        """Calculate work hours stress score (0-1)"""
-        work_sessions = db.query(WorkSession).filter(
-            WorkSession.user_id == user_id,
-            WorkSession.start_time >= start_date,
-            WorkSession.start_time <= end_date
-        ).all()
-        
-        if not work_sessions:
+    def _work_hours_score(self, total_hours: float, active_days: int) -> float:
+        """Work hours stress score (0-1) from the hours worked and the number of days with work"""
+        if not active_days:
             return 0.0
         
-        # Calculate daily work hours
-        daily_hours = {}
-        for session in work_sessions:
-            date = session.start_time.date()
-            if date not in daily_hours:
-                daily_hours[date] = 0
-            daily_hours[date] += session.duration_minutes / 60
-        
         # Calculate average daily hours
-        avg_daily_hours = sum(daily_hours.values()) / len(daily_hours)
+        avg_daily_hours = total_hours / active_days
         
         # Score based on work hours (8 hours = 0.5, 12+ hours = 1.0)
         if avg_daily_hours <= 8:
@@ -86,40 +276,22 @@ class BurnoutAnalyzer:
         else:
             return 0.5 + min((avg_daily_hours - 8) / 8, 0.5)  # Accelerated scale after 8 hours
     
-    def _calculate_sentiment_score(self, db: Session, user_id: int, start_date: datetime, end_date: datetime) -> float:
-        """Calculate sentiment stress score (0-1)"""
-        journal_entries = db.query(JournalEntry).filter(
-            JournalEntry.user_id == user_id,
-            JournalEntry.created_at >= start_date,
-            JournalEntry.created_at <= end_date,
-            JournalEntry.sentiment_score.isnot(None)
-        ).all()
-        
-        if not journal_entries:
+    def _sentiment_score(self, sentiment_sum: float, entry_count: int) -> float:
+        """Sentiment stress score (0-1) from journal sentiment"""
+        if not entry_count:
             return 0.0
         
         # Calculate average sentiment (assuming sentiment is -1 to 1)
-        avg_sentiment = sum(entry.sentiment_score for entry in journal_entries) / len(journal_entries)
+        avg_sentiment = sentiment_sum / entry_count
         
         # Convert to stress score (negative sentiment = higher stress)
         return max(0, -avg_sentiment)  # Convert negative sentiment to positive stress score
     
-    def _calculate_meeting_load_score(self, db: Session, user_id: int, start_date: datetime, end_date: datetime) -> float:
-        """Calculate meeting load stress score (0-1)"""
-        meetings = db.query(Meeting).filter(
-            Meeting.user_id == user_id,
-            Meeting.start_time >= start_date,
-            Meeting.start_time <= end_date
-        ).all()
-        
-        if not meetings:
+    def _meeting_load_score(self, total_meetings: int, total_duration: int, after_hours_meetings: int) -> float:
+        """Meeting load stress score (0-1)"""
+        if not total_meetings:
             return 0.0
         
-        # Calculate meeting metrics
-        total_meetings = len(meetings)
-        total_duration = sum(meeting.duration_minutes for meeting in meetings)
-        after_hours_meetings = sum(1 for meeting in meetings if meeting.is_after_hours)
-        
         # Scoring factors
         meeting_frequency_score = min(total_meetings / 35, 1.0)  # 5 meetings per day = 1.0
         meeting_duration_score = min(total_duration / (7 * 480), 1.0)  # 8 hours of meetings per day = 1.0
@@ -128,26 +300,15 @@ class BurnoutAnalyzer:
         # Weighted combination
         return (meeting_frequency_score * 0.4 + meeting_duration_score * 0.4 + after_hours_score * 0.2)
     
-    def _calculate_email_stress_score(self, db: Session, user_id: int, start_date: datetime, end_date: datetime) -> float:
-        """Calculate email stress score (0-1)"""
-        emails = db.query(Email).filter(
-            Email.user_id == user_id,
-            Email.sent_at >= start_date,
-            Email.sent_at <= end_date
-        ).all()
-        
-        if not emails:
+    def _email_stress_score(self, total_emails: int, after_hours_emails: int, sentiment_sum: float, sentiment_count: int) -> float:
+        """Email stress score (0-1)"""
+        if not total_emails:
             return 0.0
         
-        # Calculate email metrics
-        total_emails = len(emails)
-        after_hours_emails = sum(1 for email in emails if email.is_after_hours)
-        
         # Sentiment analysis
-        sentiment_emails = [email for email in emails if email.sentiment_score is not None]
         avg_email_sentiment = 0
-        if sentiment_emails:
-            avg_email_sentiment = sum(email.sentiment_score for email in sentiment_emails) / len(sentiment_emails)
+        if sentiment_count:
+            avg_email_sentiment = sentiment_sum / sentiment_count
         
         # Scoring factors
         email_volume_score = min(total_emails / 140, 1.0)  # 20 emails per day = 1.0
@@ -157,6 +318,20 @@ class BurnoutAnalyzer:
         # Weighted combination
         return (email_volume_score * 0.4 + after_hours_score * 0.3 + sentiment_stress_score * 0.3)
     
+    def _fragmentation_score(self, overlap_minutes: float, switches: int, days: int, focus_minutes: float, focus_days: int) -> float:
+        """Meeting fragmentation stress score (0-1) from double-booking, context switches and focus time"""
+        if not days:
+            return 0.0
+        
+        # Scoring factors
+        overlap_score = min(overlap_minutes / days / 60, 1.0)  # 1 hour double-booked per day = 1.0
+        switch_score = min(switches / days / 10, 1.0)  # 10 context switches per day = 1.0
+        # Average longest focus block of 0 minutes = 1.0, 4 hours or more = 0
+        focus_score = max(0, 1 - focus_minutes / focus_days / 240) if focus_days else 0.0
+        
+        # Weighted combination
+        return (overlap_score * 0.3 + switch_score * 0.3 + focus_score * 0.4)
+    
     def _classify_burnout_level(self, score: float) -> str:
         """Classify burnout level based on score"""
         if score <= 0.3:
@@ -167,16 +342,81 @@ class BurnoutAnalyzer:
             return "high"
     
     def get_burnout_trend(self, db: Session, user_id: int, days: int = 30) -> List[float]:
-        """Get burnout trend over specified days"""
+        """Get burnout trend over specified days (one daily mean per day)"""
+        return [point["score"] for point in self.get_daily_burnout_trend(db, user_id, days)]
+    
+    def get_daily_burnout_trend(self, db: Session, user_id: int, days: int = 30) -> List[Dict]:
+        """Get daily mean/min/max of the 7-day burnout score, bucketed in the database.
+        
+        A day with live scores uses them; a backfilled score fills a day with none.
+        Scores from older weightings (score_version) are left out.
+        """
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
-        scores = db.query(BurnoutScore).filter(
+        day = func.date(BurnoutScore.calculated_at)
+        rows = db.query(
+            day.label("day"),
+            BurnoutScore.is_backfill,
+            func.avg(BurnoutScore.overall_score).label("mean_score"),
+            func.min(BurnoutScore.overall_score).label("min_score"),
+            func.max(BurnoutScore.overall_score).label("max_score"),
+            func.count(BurnoutScore.id).label("count")
+        ).filter(
             BurnoutScore.user_id == user_id,
+            BurnoutScore.timeframe_days == TREND_TIMEFRAME_DAYS,
+            BurnoutScore.score_version == SCORE_VERSION,
+            BurnoutScore.calculated_at >= start_date,
+            BurnoutScore.calculated_at <= end_date
+        ).group_by(day, BurnoutScore.is_backfill).order_by(day).all()
+        
+        buckets: Dict[date, object] = {}
+        for row in rows:
+            # SQLite returns the bucket as an ISO string, Postgres as a date
+            bucket = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+            if bucket not in buckets or not row.is_backfill:
+                buckets[bucket] = row
+        
+        return [
+            {
+                "timestamp": datetime.combine(bucket, time.min),
+                "score": float(row.mean_score),
+                "min_score": float(row.min_score),
+                "max_score": float(row.max_score),
+                "count": row.count
+            }
+            for bucket, row in sorted(buckets.items())
+        ]
+    
+    def get_downsampled_burnout_trend(self, db: Session, user_id: int, days: int = 30, max_points: int = 100) -> List[Dict]:
+        """Get raw 7-day burnout scores downsampled to at most max_points with LTTB.
+        
+        Backfilled scores are only kept on days without live scores, and older score
+        versions are left out, as in the daily trend.
+        """
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
+        
+        # Only the columns needed for the series, not full ORM rows
+        rows = db.query(
+            BurnoutScore.calculated_at,
+            BurnoutScore.overall_score,
+            BurnoutScore.is_backfill
+        ).filter(
+            BurnoutScore.user_id == user_id,
+            BurnoutScore.timeframe_days == TREND_TIMEFRAME_DAYS,
+            BurnoutScore.score_version == SCORE_VERSION,
             BurnoutScore.calculated_at >= start_date,
             BurnoutScore.calculated_at <= end_date
         ).order_by(BurnoutScore.calculated_at).all()
         
-        return [score.overall_score for score in scores]
+        live_days = {row.calculated_at.date() for row in rows if not row.is_backfill}
+        rows = [row for row in rows if not row.is_backfill or row.calculated_at.date() not in live_days]
+        series = [(row.calculated_at.timestamp(), row.overall_score) for row in rows]
+        
+        return [
+            {"timestamp": rows[i].calculated_at, "score": rows[i].overall_score, "count": 1}
+            for i in lttb(series, max_points)
+        ]
 
 burnout_analyzer = BurnoutAnalyzer()
\ No newline at end of file
@@ -0,0 +1,138 @@
+from typing import Dict, Optional, Sequence, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+import asyncio
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from database.database import open_user_session, read_your_writes
+from database.models import BurnoutScore
+from services.burnout_analyzer import burnout_analyzer
+from services.performance_monitor import performance_monitor
+
+load_dotenv()
+
+# Manual recalculations per user: a bucket of CALCULATE_BURST tokens refilled at CALCULATE_RATE_PER_MINUTE
+CALCULATE_RATE_PER_MINUTE = float(os.getenv("CALCULATE_RATE_PER_MINUTE", "6"))
+CALCULATE_BURST = float(os.getenv("CALCULATE_BURST", "3"))
+
+class TokenBucketLimiter:
+    """Per-key token buckets, per process"""
+
+    def __init__(self, rate_per_minute: float = CALCULATE_RATE_PER_MINUTE, burst: float = CALCULATE_BURST, max_entries: int = 100000):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_entries = max_entries
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: int) -> bool:
+        """Take a token for key if one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if len(self._buckets) >= self.max_entries:
+                # Buckets that have refilled completely carry no state worth keeping
+                self._buckets = {
+                    k: (t, u) for k, (t, u) in self._buckets.items()
+                    if t + (now - u) * self.rate < self.burst
+                }
+            self._buckets[key] = (tokens, now)
+            return allowed
+
+    def retry_after(self, key: int) -> int:
+        """Whole seconds until key has a token again"""
+        tokens, updated = self._buckets.get(key, (self.burst, time.monotonic()))
+        missing = 1 - min(self.burst, tokens + (time.monotonic() - updated) * self.rate)
+        return max(1, int(missing / self.rate + 0.999)) if self.rate > 0 else 60
+
+class BurnoutCalculationCoordinator:
+    """Single-flight burnout calculation: concurrent requests for one user and timeframe share one run"""
+
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None, max_cached: int = 10000):
+        self.limiter = limiter or TokenBucketLimiter()
+        self.max_cached = max_cached
+        self._in_flight: Dict[Tuple[int, int, Tuple[int, ...]], asyncio.Future] = {}
+        self._latest: Dict[Tuple[int, int], Dict] = {}
+
+        registry = performance_monitor.registry
+        self.calculations = registry.counter(
+            "burnout_calculations_total", "Burnout calculation requests by outcome (computed, coalesced, throttled)", ("outcome",)
+        )
+
+    async def calculate(
+        self,
+        user_id: int,
+        timeframe_days: int = 7,
+        client_key: Optional[str] = None,
+        windows: Sequence[int] = ()
+    ) -> Tuple[Dict, bool]:
+        """Return (burnout data, computed here); joins a running calculation for the same key if there is one"""
+        windows = tuple(sorted(set(windows)))
+        key = (user_id, timeframe_days, windows)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.calculations.inc(outcome="coalesced")
+            # shield: a caller that disconnects must not cancel the run other callers are waiting on
+            burnout_data = await asyncio.shield(future)
+            # The shared run committed on another session, so this client must also read from the primary
+            if client_key is not None:
+                read_your_writes.mark_write(client_key)
+            return burnout_data, False
+
+        self.calculations.inc(outcome="computed")
+        task = asyncio.ensure_future(run_in_threadpool(self._compute, user_id, timeframe_days, client_key, windows))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task), True
+
+    async def calculate_throttled(self, db: Session, user_id: int, client_key: Optional[str] = None) -> Tuple[Optional[Dict], bool, bool]:
+        """Like calculate, but over the user's rate limit return the latest result instead: (burnout data, computed here, throttled)"""
+        if self.limiter.allow(user_id):
+            burnout_data, computed = await self.calculate(user_id, 7, client_key)
+            return burnout_data, computed, False
+        self.calculations.inc(outcome="throttled")
+        return self.latest(db, user_id), False, True
+
+    def latest(self, db: Session, user_id: int) -> Optional[Dict]:
+        """Newest 7-day result: this process's last one, unless a newer score has been stored since"""
+        cached = self._latest.get((user_id, 7))
+        score = db.query(BurnoutScore).filter(
+            BurnoutScore.user_id == user_id,
+            BurnoutScore.timeframe_days == 7
+        ).order_by(BurnoutScore.calculated_at.desc()).first()
+        if score is None or (cached is not None and cached["calculated_at"] >= score.calculated_at):
+            return cached
+        return {
+            "overall_score": score.overall_score,
+            "work_hours_score": score.work_hours_score,
+            "sentiment_score": score.sentiment_score,
+            "meeting_load_score": score.meeting_load_score,
+            "email_stress_score": score.email_stress_score,
+            "fragmentation_score": score.fragmentation_score,
+            "burnout_level": score.burnout_level,
+            "calculated_at": score.calculated_at,
+            "anomalies": []
+        }
+
+    def _compute(self, user_id: int, timeframe_days: int, client_key: Optional[str], windows: Tuple[int, ...]) -> Dict:
+        db = open_user_session(user_id)
+        db.info["client_key"] = client_key
+        try:
+            burnout_data = burnout_analyzer.calculate_burnout_score(db, user_id, timeframe_days, windows)
+        finally:
+            db.close()
+        key = (user_id, timeframe_days)
+        if len(self._latest) >= self.max_cached and key not in self._latest:
+            self._latest.pop(next(iter(self._latest)))
+        # Anomalies were already alerted by the run that found them
+        self._latest[key] = {**burnout_data, "anomalies": []}
+        return burnout_data
+
+burnout_calculations = BurnoutCalculationCoordinator()
@@ -0,0 +1,49 @@
+from typing import List, Sequence, Tuple
+
+def lttb(points: Sequence[Tuple[float, float]], max_points: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Takes (x, y) points sorted by x and returns the indices of at most
+    ``max_points`` points that preserve the visual shape of the series.
+    The first and last points are always kept.
+    """
+    n = len(points)
+    if max_points >= n or n <= 2:
+        return list(range(n))
+    if max_points < 3:
+        return [0, n - 1]
+
+    selected = [0]
+    # Points between the first and last are split into equal-width buckets
+    bucket_size = (n - 2) / (max_points - 2)
+    a = 0
+
+    for i in range(max_points - 2):
+        bucket_start = int(i * bucket_size) + 1
+        bucket_end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = bucket_end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= n - 1:
+            avg_x, avg_y = points[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(points[j][0] for j in range(next_start, next_end)) / count
+            avg_y = sum(points[j][1] for j in range(next_start, next_end)) / count
+
+        ax, ay = points[a]
+        max_area = -1.0
+        max_index = bucket_start
+        for j in range(bucket_start, bucket_end):
+            bx, by = points[j]
+            area = abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                max_index = j
+
+        selected.append(max_index)
+        a = max_index
+
+    selected.append(n - 1)
+    return selected
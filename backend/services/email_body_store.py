@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+import os
+from dotenv import load_dotenv
+
+from database.models import EmailBody
+
+load_dotenv()
+
+# Days to keep email bodies after analysis; 0 drops them immediately, negative keeps them forever
+EMAIL_BODY_RETENTION_DAYS = int(os.getenv("EMAIL_BODY_RETENTION_DAYS", "30"))
+
+class EmailBodyStore:
+    def __init__(self, retention_days: int = EMAIL_BODY_RETENTION_DAYS):
+        self.retention_days = retention_days
+
+    def should_store(self) -> bool:
+        """Whether bodies should be persisted once sentiment and stress analysis are done"""
+        return self.retention_days != 0
+
+    def purge_expired(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete bodies older than the retention window and return how many were removed"""
+        if self.retention_days < 0:
+            return 0
+
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+        deleted = db.query(EmailBody).filter(
+            EmailBody.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+email_body_store = EmailBodyStore()
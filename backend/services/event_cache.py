@@ -0,0 +1,344 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Boolean, DateTime, Float, Integer, event
+from sqlalchemy.orm import Session
+import math
+import os
+import threading
+from dotenv import load_dotenv
+
+from database.database import SessionLocal
+from database.models import Email, JournalEntry, Meeting, ResourceVersion, WorkSession
+from services.performance_monitor import performance_monitor
+
+load_dotenv()
+
+EVENT_CACHE_ENABLED = os.getenv("EVENT_CACHE_ENABLED", "true").lower() == "true"
+# Events newer than this are held in memory per active user; older ranges always go to the database
+EVENT_CACHE_DAYS = int(os.getenv("EVENT_CACHE_DAYS", "30"))
+# Total size of the cached arrays per process; least recently used users are evicted beyond it
+EVENT_CACHE_MAX_MB = float(os.getenv("EVENT_CACHE_MAX_MB", "64"))
+
+# Cached columns per resource; the first is the event time, which the arrays are sorted by
+CACHED_COLUMNS = {
+    "work_sessions": (WorkSession, ("start_time", "end_time", "duration_minutes", "activity_type")),
+    "journal_entries": (JournalEntry, ("created_at", "sentiment_score")),
+    "meetings": (Meeting, ("start_time", "end_time", "duration_minutes", "is_after_hours")),
+    "emails": (Email, ("sent_at", "is_after_hours", "sentiment_score")),
+}
+
+# Loads reach this much further back, so a cached user keeps serving full windows for a day before reloading
+LOAD_MARGIN = timedelta(days=1)
+
+EPOCH = datetime(1970, 1, 1)
+MISSING = -(2 ** 63)  # None in int64 columns
+# Rough fixed cost per cached user and table beyond the arrays themselves
+ENTRY_OVERHEAD_BYTES = 512
+
+def _micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _kind(model, name: str) -> str:
+    column_type = model.__table__.c[name].type
+    if isinstance(column_type, DateTime):
+        return "datetime"
+    if isinstance(column_type, Boolean):
+        return "bool"
+    if isinstance(column_type, Integer):
+        return "int"
+    if isinstance(column_type, Float):
+        return "float"
+    return "str"
+
+TYPECODES = {"datetime": "q", "int": "q", "float": "d", "bool": "b", "str": "i"}
+
+class EventColumns:
+    """One resource's recent events for one user as parallel typed arrays, sorted by event time.
+
+    Timestamps are int64 microseconds since the epoch, strings are indexes
+    into a per-column table of distinct values, and None is stored as a
+    sentinel (MISSING, NaN, -1) so every column stays a flat array.
+    """
+
+    __slots__ = ("kinds", "arrays", "strings", "string_index", "version", "is_sorted")
+
+    def __init__(self, kinds: Sequence[str], version: int):
+        self.kinds = tuple(kinds)
+        self.arrays = [array(TYPECODES[kind]) for kind in kinds]
+        self.strings: Dict[int, List[str]] = {i: [] for i, kind in enumerate(kinds) if kind == "str"}
+        self.string_index: Dict[int, Dict[str, int]] = {i: {} for i in self.strings}
+        self.version = version
+        self.is_sorted = True
+
+    def append(self, rows: Iterable[Sequence]):
+        times = self.arrays[0]
+        for row in rows:
+            for i, (kind, value) in enumerate(zip(self.kinds, row)):
+                if kind == "datetime":
+                    value = MISSING if value is None else _micros(value)
+                    if i == 0 and times and value < times[-1]:
+                        self.is_sorted = False
+                elif kind == "int":
+                    value = MISSING if value is None else value
+                elif kind == "float":
+                    value = math.nan if value is None else value
+                elif kind == "bool":
+                    value = -1 if value is None else int(value)
+                elif value is None:
+                    value = -1
+                else:
+                    index = self.string_index[i].get(value)
+                    if index is None:
+                        index = self.string_index[i][value] = len(self.strings[i])
+                        self.strings[i].append(value)
+                    value = index
+                self.arrays[i].append(value)
+
+    def rows(self, start: datetime, end: Optional[datetime] = None, include_end: bool = True) -> List[Tuple]:
+        """Events with start <= time <= end (or < end; no end means no upper bound), decoded to the tuples a query would return"""
+        if not self.is_sorted:
+            self._sort()
+        times = self.arrays[0]
+        low = bisect_left(times, _micros(start))
+        if end is None:
+            high = len(times)
+        else:
+            high = bisect_right(times, _micros(end)) if include_end else bisect_left(times, _micros(end))
+        columns = [self._decode(i, self.arrays[i][low:high]) for i in range(len(self.kinds))]
+        return list(zip(*columns))
+
+    @property
+    def nbytes(self) -> int:
+        strings = sum(len(value) for values in self.strings.values() for value in values)
+        return sum(column.itemsize * len(column) for column in self.arrays) + strings + ENTRY_OVERHEAD_BYTES
+
+    def _decode(self, i: int, values: array) -> List:
+        kind = self.kinds[i]
+        if kind == "datetime":
+            return [None if value == MISSING else EPOCH + timedelta(microseconds=value) for value in values]
+        if kind == "int":
+            return [None if value == MISSING else value for value in values]
+        if kind == "float":
+            return [None if value != value else value for value in values]
+        if kind == "bool":
+            return [None if value < 0 else bool(value) for value in values]
+        strings = self.strings[i]
+        return [None if value < 0 else strings[value] for value in values]
+
+    def _sort(self):
+        order = sorted(range(len(self.arrays[0])), key=self.arrays[0].__getitem__)
+        self.arrays = [array(column.typecode, (column[j] for j in order)) for column in self.arrays]
+        self.is_sorted = True
+
+class UserEvents:
+    """A user's cached resources, covering event times from since onwards"""
+
+    __slots__ = ("since", "tables", "nbytes")
+
+    def __init__(self, since: datetime, tables: Dict[str, EventColumns]):
+        self.since = since
+        self.tables = tables
+        self.nbytes = sum(table.nbytes for table in tables.values())
+
+class EventCache:
+    """Per-process LRU of active users' recent events in columnar form.
+
+    A user's hot window (the last EVENT_CACHE_DAYS days) is loaded on the
+    first read that fits inside it. Every later read first compares the
+    cached per-resource versions with resource_versions in one query, so
+    writes from other processes are never missed: a mismatch reloads the
+    user. Writes committed through this process are appended in place when
+    the version they produced directly follows the cached one.
+    """
+
+    def __init__(self, enabled: bool = EVENT_CACHE_ENABLED, days: int = EVENT_CACHE_DAYS, max_bytes: int = int(EVENT_CACHE_MAX_MB * 1024 * 1024)):
+        self.enabled = enabled
+        self.days = days
+        self.max_bytes = max_bytes
+        self._users: "OrderedDict[int, UserEvents]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        registry = performance_monitor.registry
+        self.lookups = registry.counter(
+            "event_cache_lookups_total", "Event cache reads by result (hit, miss, bypass)", ("result",)
+        )
+        self.hit_ratio = registry.gauge("event_cache_hit_ratio", "Share of event cache reads served from memory")
+        self.evictions = registry.counter("event_cache_evictions_total", "Users evicted from the event cache to stay under its size")
+        self.size_bytes = registry.gauge("event_cache_bytes", "Bytes held by the event cache")
+        self.user_count = registry.gauge("event_cache_users", "Users held in the event cache")
+        self.bytes_per_user = registry.gauge("event_cache_bytes_per_user", "Mean bytes held per cached user")
+
+    def rows(
+        self,
+        db: Session,
+        user_id: int,
+        resources: Sequence[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        include_end: bool = True
+    ) -> Dict[str, List[Tuple]]:
+        """The user's events between start and end for each resource, as tuples of CACHED_COLUMNS"""
+        if not self.enabled or start < datetime.utcnow() - timedelta(days=self.days) - LOAD_MARGIN:
+            self._count("bypass")
+            return {resource: self._query(db, user_id, resource, start, end, include_end) for resource in resources}
+
+        versions = self._versions(db, user_id)
+        with self._lock:
+            entry = self._users.get(user_id)
+            current = entry is not None and entry.since <= start and all(
+                table.version == versions.get(resource, 0) for resource, table in entry.tables.items()
+            )
+            if current:
+                self._users.move_to_end(user_id)
+                result = {resource: entry.tables[resource].rows(start, end, include_end) for resource in resources}
+        if current:
+            self._count("hit")
+            return result
+
+        self._count("miss")
+        entry = self._load(db, user_id, versions)
+        # A commit between the two version reads may or may not be in the loaded rows, and its after-commit
+        # append could then add them a second time; such a load serves this read but is not cached
+        if self._versions(db, user_id) == versions:
+            self._store(user_id, entry)
+        return {resource: entry.tables[resource].rows(start, end, include_end) for resource in resources}
+
+    def record(self, db: Session, user_id: int, resource: str, rows: Iterable):
+        """Queue rows (dicts or model instances) written in db's transaction; they are cached once it commits.
+
+        Values are read immediately, so instances need every cached column set, including timestamps.
+        """
+        if not self.enabled:
+            return
+        _, columns = CACHED_COLUMNS[resource]
+        captured = [
+            tuple(row.get(name) for name in columns) if isinstance(row, dict) else tuple(getattr(row, name) for name in columns)
+            for row in rows
+        ]
+        db.info.setdefault("event_cache_pending", []).append((user_id, resource, captured))
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            entry = self._users.pop(user_id, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+        self._update_gauges()
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._bytes = 0
+        self._update_gauges()
+
+    def _apply(self, pending: List[Tuple[int, str, List[Tuple]]], bumped: Dict[Tuple[int, str], Tuple[int, int]]):
+        for user_id, resource, rows in pending:
+            versions = bumped.get((user_id, resource))
+            with self._lock:
+                entry = self._users.get(user_id)
+                if entry is None:
+                    continue
+                table = entry.tables[resource]
+                if versions is None or table.version != versions[0]:
+                    # Another process wrote in between; the next read reloads
+                    stale = True
+                else:
+                    stale = False
+                    before = table.nbytes
+                    table.append(rows)
+                    table.version = versions[1]
+                    entry.nbytes += table.nbytes - before
+                    self._bytes += table.nbytes - before
+            if stale:
+                self.invalidate(user_id)
+        self._evict()
+
+    def _versions(self, db: Session, user_id: int) -> Dict[str, int]:
+        return dict(db.query(ResourceVersion.resource, ResourceVersion.version).filter(
+            ResourceVersion.user_id == user_id,
+            ResourceVersion.resource.in_(list(CACHED_COLUMNS))
+        ).all())
+
+    def _load(self, db: Session, user_id: int, versions: Dict[str, int]) -> UserEvents:
+        # The caller re-reads the versions afterwards, so only a load with no commit in between is cached
+        since = datetime.utcnow() - timedelta(days=self.days) - LOAD_MARGIN
+        tables = {}
+        for resource, (model, columns) in CACHED_COLUMNS.items():
+            table = EventColumns([_kind(model, name) for name in columns], versions.get(resource, 0))
+            table.append(self._query(db, user_id, resource, since, None, True, ordered=True))
+            tables[resource] = table
+        return UserEvents(since, tables)
+
+    def _store(self, user_id: int, entry: UserEvents):
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._users.pop(user_id, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._users[user_id] = entry
+            self._bytes += entry.nbytes
+        self._evict()
+
+    def _evict(self):
+        evicted = 0
+        with self._lock:
+            while self._bytes > self.max_bytes and self._users:
+                _, entry = self._users.popitem(last=False)
+                self._bytes -= entry.nbytes
+                evicted += 1
+        if evicted:
+            self.evictions.inc(evicted)
+        self._update_gauges()
+
+    def _query(
+        self,
+        db: Session,
+        user_id: int,
+        resource: str,
+        start: datetime,
+        end: Optional[datetime],
+        include_end: bool,
+        ordered: bool = False
+    ) -> List[Tuple]:
+        model, columns = CACHED_COLUMNS[resource]
+        time_column = getattr(model, columns[0])
+        query = db.query(*[getattr(model, name) for name in columns]).filter(model.user_id == user_id, time_column >= start)
+        if end is not None:
+            query = query.filter(time_column <= end if include_end else time_column < end)
+        if ordered:
+            query = query.order_by(time_column)
+        return [tuple(row) for row in query]
+
+    def _count(self, result: str):
+        self.lookups.inc(result=result)
+        hits = self.lookups.value(result="hit")
+        total = hits + self.lookups.value(result="miss") + self.lookups.value(result="bypass")
+        self.hit_ratio.set(hits / total if total else 0.0)
+
+    def _update_gauges(self):
+        with self._lock:
+            users, size = len(self._users), self._bytes
+        self.size_bytes.set(size)
+        self.user_count.set(users)
+        self.bytes_per_user.set(size / users if users else 0)
+
+event_cache = EventCache()
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_committed_events(session):
+    pending = session.info.pop("event_cache_pending", None)
+    bumped = session.info.pop("bumped_versions", {})
+    if pending:
+        event_cache._apply(pending, bumped)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending_events(session):
+    session.info.pop("event_cache_pending", None)
+    session.info.pop("bumped_versions", None)
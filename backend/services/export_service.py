@@ -0,0 +1,228 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import select, Boolean, DateTime, Float, Integer
+from sqlalchemy.orm import Session
+import json
+import os
+
+from database.models import BurnoutScore, WorkSession, Meeting, Email, EmailBody
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+
+# Exportable tables: model and the timestamp column used for date filters
+EXPORT_TABLES = {
+    "burnout_scores": (BurnoutScore, "calculated_at"),
+    "work_sessions": (WorkSession, "start_time"),
+    "meetings": (Meeting, "start_time"),
+    "emails": (Email, "sent_at"),
+}
+
+# Columns stored in a side table and only exported when explicitly requested:
+# name -> (column, join condition)
+OPT_IN_COLUMNS = {
+    "emails": {"body": (EmailBody.__table__.c.compressed_body, EmailBody.email_id == Email.id)},
+}
+
+EXPORT_FORMATS = ("ndjson", "parquet", "arrow")
+
+class ExportError(ValueError):
+    """Raised for invalid export requests"""
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self.buffer: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.buffer.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.buffer)
+        self.buffer = []
+        return data
+
+class ExportService:
+    def __init__(self, chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def resolve_columns(self, table: str, columns: Optional[List[str]] = None, include_body: bool = False) -> List:
+        """Resolve the projected columns for a table"""
+        if table not in EXPORT_TABLES:
+            raise ExportError(f"Unknown table '{table}'. Expected one of: {', '.join(EXPORT_TABLES)}")
+
+        model, _ = EXPORT_TABLES[table]
+        opt_in_columns = {name: column.label(name) for name, (column, _) in OPT_IN_COLUMNS.get(table, {}).items()}
+        available = {column.name: column for column in model.__table__.columns}
+        available.update(opt_in_columns)
+
+        if columns:
+            unknown = [name for name in columns if name not in available]
+            if unknown:
+                raise ExportError(f"Unknown columns for {table}: {', '.join(unknown)}")
+            names = list(columns)
+        else:
+            names = [name for name in available if name not in opt_in_columns]
+
+        if include_body:
+            names.extend(name for name in opt_in_columns if name not in names)
+
+        return [available[name] for name in names]
+
+    def iter_chunks(
+        self,
+        db: Session,
+        table: str,
+        user_ids: Optional[List[int]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        include_body: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream rows in chunks from a server-side cursor"""
+        selected = self.resolve_columns(table, columns, include_body)
+        model, timestamp_name = EXPORT_TABLES[table]
+        timestamp_column = model.__table__.c[timestamp_name]
+
+        # Filters are pushed down into SQL rather than applied per row
+        stmt = select(*selected)
+        joined = model.__table__
+        for name, (column, condition) in OPT_IN_COLUMNS.get(table, {}).items():
+            if any(selected_column.name == name for selected_column in selected):
+                joined = joined.outerjoin(column.table, condition)
+        stmt = stmt.select_from(joined)
+        if user_ids:
+            stmt = stmt.where(model.__table__.c.user_id.in_(user_ids))
+        if start_date:
+            stmt = stmt.where(timestamp_column >= start_date)
+        if end_date:
+            stmt = stmt.where(timestamp_column < end_date)
+        stmt = stmt.order_by(model.__table__.c.id)
+
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=self.chunk_size))
+        try:
+            for partition in result.partitions():
+                yield [_decode_row(row._mapping) for row in partition]
+        finally:
+            result.close()
+
+    def iter_ndjson(self, chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+        """Encode chunks as newline-delimited JSON, one bytes block per chunk"""
+        for chunk in chunks:
+            yield "".join(json.dumps(row, default=_json_default) + "\n" for row in chunk).encode("utf-8")
+
+    def iter_arrow(self, table: str, chunks: Iterable[List[Dict[str, Any]]], fmt: str = "parquet",
+                   columns: Optional[List[str]] = None, include_body: bool = False) -> Iterator[bytes]:
+        """Encode chunks as a Parquet file or Arrow IPC stream, one row group/batch per chunk"""
+        pa, pq = _import_pyarrow()
+        schema = self.arrow_schema(table, columns, include_body)
+        sink = _ChunkSink()
+
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        try:
+            for chunk in chunks:
+                batch = pa.RecordBatch.from_pylist([_arrow_row(row) for row in chunk], schema=schema)
+                if fmt == "parquet":
+                    writer.write_table(pa.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+
+        data = sink.drain()
+        if data:
+            yield data
+
+    def arrow_schema(self, table: str, columns: Optional[List[str]] = None, include_body: bool = False):
+        """Build an Arrow schema from the projected SQLAlchemy columns"""
+        pa, _ = _import_pyarrow()
+        fields = []
+        for column in self.resolve_columns(table, columns, include_body):
+            if isinstance(column.type, Boolean):
+                arrow_type = pa.bool_()
+            elif isinstance(column.type, Integer):
+                arrow_type = pa.int64()
+            elif isinstance(column.type, Float):
+                arrow_type = pa.float64()
+            elif isinstance(column.type, DateTime):
+                arrow_type = pa.timestamp("us")
+            else:
+                # Strings, text and JSON documents are exported as strings
+                arrow_type = pa.string()
+            fields.append(pa.field(column.name, arrow_type))
+        return pa.schema(fields)
+
+    def export(
+        self,
+        db: Session,
+        table: str,
+        fmt: str = "ndjson",
+        user_ids: Optional[List[int]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        include_body: bool = False
+    ) -> Iterator[bytes]:
+        """Stream an export of one table in the requested format"""
+        if fmt not in EXPORT_FORMATS:
+            raise ExportError(f"Unknown format '{fmt}'. Expected one of: {', '.join(EXPORT_FORMATS)}")
+
+        # Validate the projection before any bytes are produced
+        self.resolve_columns(table, columns, include_body)
+        if fmt != "ndjson":
+            _import_pyarrow()
+
+        chunks = self.iter_chunks(db, table, user_ids, start_date, end_date, columns, include_body)
+        if fmt == "ndjson":
+            return self.iter_ndjson(chunks)
+        return self.iter_arrow(table, chunks, fmt, columns, include_body)
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ExportError("pyarrow is required for Parquet and Arrow exports")
+    return pyarrow, pyarrow.parquet
+
+def _decode_row(mapping) -> Dict[str, Any]:
+    row = dict(mapping)
+    # Email bodies are stored zlib-compressed
+    if isinstance(row.get("body"), bytes):
+        row["body"] = EmailBody.decompress(row["body"])
+    return row
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _arrow_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: json.dumps(value) if isinstance(value, (dict, list)) else value
+        for key, value in row.items()
+    }
+
+export_service = ExportService()
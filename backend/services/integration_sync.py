@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy.orm import Session
+
+from database.models import Meeting, Email
+from services.sentiment_backend import sentiment_backend
+from services.email_body_store import email_body_store
+from services.resource_versions import resource_versions
+from services.working_hours import working_hours
+from services.event_cache import event_cache
+
+# Mock calendar data - in production, this would come from the Google Calendar API
+MOCK_MEETINGS = [
+    {
+        "title": "Team Standup",
+        "start_time": "2024-01-15T09:00:00Z",
+        "end_time": "2024-01-15T09:30:00Z",
+        "attendees_count": 5
+    },
+    {
+        "title": "Project Review",
+        "start_time": "2024-01-15T14:00:00Z",
+        "end_time": "2024-01-15T15:00:00Z",
+        "attendees_count": 3
+    },
+    {
+        "title": "Client Call",
+        "start_time": "2024-01-15T19:00:00Z",
+        "end_time": "2024-01-15T20:00:00Z",
+        "attendees_count": 2
+    }
+]
+
+# Mock email data - in production, this would come from the Gmail API
+MOCK_EMAILS = [
+    {
+        "subject": "Urgent: Project deadline moved up",
+        "body": "Hi team, we need to move the project deadline up by 2 days. Please prioritize this work.",
+        "sent_at": "2024-01-15T08:30:00Z",
+        "is_sent": False
+    },
+    {
+        "subject": "Re: Client feedback",
+        "body": "Thanks for the feedback. I'll work on the changes tonight and send an updated version.",
+        "sent_at": "2024-01-15T21:15:00Z",
+        "is_sent": True
+    }
+]
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class IntegrationSyncService:
+    """Pulls calendar and email data for a user; shared by the API and the scheduler"""
+
+    def fetch_meetings(self, user_id: int) -> List[Dict]:
+        return MOCK_MEETINGS
+
+    def fetch_emails(self, user_id: int) -> List[Dict]:
+        return MOCK_EMAILS
+
+    def sync_calendar(self, db: Session, user_id: int) -> int:
+        """Store meetings not seen before and return how many were fetched"""
+        meetings = self.fetch_meetings(user_id)
+        existing = set(db.query(Meeting.title, Meeting.start_time).filter(
+            Meeting.user_id == user_id,
+            Meeting.start_time.in_([_parse_timestamp(m["start_time"]).replace(tzinfo=None) for m in meetings])
+        ).all())
+
+        # Re-syncing the same window must not duplicate meetings
+        new_meetings = [
+            (meeting_data, _parse_timestamp(meeting_data["start_time"]), _parse_timestamp(meeting_data["end_time"]))
+            for meeting_data in meetings
+            if (meeting_data["title"], _parse_timestamp(meeting_data["start_time"]).replace(tzinfo=None)) not in existing
+        ]
+        # After-hours comes from the user's working hours, classified for the whole batch at once
+        after_hours = working_hours.classify(db, user_id, [(start_time, end_time) for _, start_time, end_time in new_meetings])
+
+        added = []
+        for (meeting_data, start_time, end_time), is_after_hours in zip(new_meetings, after_hours):
+            meeting = Meeting(
+                user_id=user_id,
+                title=meeting_data["title"],
+                start_time=start_time,
+                end_time=end_time,
+                duration_minutes=int((end_time - start_time).total_seconds() / 60),
+                attendees_count=meeting_data["attendees_count"],
+                is_after_hours=is_after_hours
+            )
+            db.add(meeting)
+            added.append(meeting)
+
+        if added:
+            resource_versions.bump(db, user_id, "meetings")
+            event_cache.record(db, user_id, "meetings", added)
+        db.commit()
+        return len(meetings)
+
+    def sync_emails(self, db: Session, user_id: int) -> int:
+        """Analyze and store emails not seen before and return how many were fetched"""
+        emails = self.fetch_emails(user_id)
+        existing = set(db.query(Email.subject, Email.sent_at).filter(
+            Email.user_id == user_id,
+            Email.sent_at.in_([_parse_timestamp(e["sent_at"]).replace(tzinfo=None) for e in emails])
+        ).all())
+
+        new_emails = [
+            email_data for email_data in emails
+            if (email_data["subject"], _parse_timestamp(email_data["sent_at"]).replace(tzinfo=None)) not in existing
+        ]
+        # One batch call for every new body instead of a round-trip per email
+        sentiments = sentiment_backend.analyze_sentiment_batch([email_data["body"] for email_data in new_emails])
+        sent_times = [_parse_timestamp(email_data["sent_at"]) for email_data in new_emails]
+        after_hours = working_hours.classify(db, user_id, [(sent_at, None) for sent_at in sent_times])
+
+        added = []
+        for email_data, sentiment_analysis, sent_at, is_after_hours in zip(new_emails, sentiments, sent_times, after_hours):
+            stress_analysis = sentiment_backend.analyze_stress_indicators(email_data["body"])
+
+            email = Email(
+                user_id=user_id,
+                subject=email_data["subject"],
+                body=email_data["body"] if email_body_store.should_store() else None,
+                sent_at=sent_at,
+                is_sent=email_data["is_sent"],
+                is_after_hours=is_after_hours,
+                sentiment_score=sentiment_analysis["sentiment_score"],
+                stress_indicators=stress_analysis
+            )
+            db.add(email)
+            added.append(email)
+
+        if added:
+            resource_versions.bump(db, user_id, "emails")
+            event_cache.record(db, user_id, "emails", added)
+        db.commit()
+        return len(emails)
+
+integration_sync = IntegrationSyncService()
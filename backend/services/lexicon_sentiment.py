@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Tuple
+import math
+import re
+
+# Valence in [-4, 4], in the style of VADER (Hutto & Gilbert, 2014), focused on workplace language
+LEXICON = {
+    # Positive
+    "good": 1.9, "great": 3.1, "excellent": 3.2, "amazing": 2.8, "awesome": 3.1, "fantastic": 3.0,
+    "wonderful": 3.0, "nice": 1.8, "happy": 2.7, "glad": 2.0, "love": 3.2, "loved": 2.9, "enjoy": 2.2,
+    "enjoyed": 2.3, "fun": 2.3, "excited": 2.4, "energized": 2.3, "relaxed": 2.2, "relaxing": 2.2,
+    "calm": 1.3, "rested": 1.6, "refreshed": 2.0, "proud": 2.1, "productive": 1.8, "progress": 1.4,
+    "accomplished": 2.1, "finished": 0.8, "success": 2.7, "successful": 2.6, "win": 2.8, "won": 2.7,
+    "thanks": 1.9, "thank": 1.5, "grateful": 2.1, "appreciate": 1.9, "appreciated": 2.1, "helpful": 1.7,
+    "support": 1.7, "supportive": 1.9, "balanced": 1.2, "motivated": 1.9, "confident": 2.2, "focused": 1.3,
+    "smooth": 1.2, "easy": 1.9, "better": 1.9, "best": 3.2, "well": 1.1, "fine": 0.8, "okay": 0.9,
+    "ok": 0.9, "positive": 2.3, "optimistic": 2.1, "clear": 1.1, "cleared": 1.1, "celebrate": 2.7,
+    "laugh": 2.6, "smile": 2.2, "peaceful": 2.2, "healthy": 1.7, "recharged": 2.0, "satisfied": 1.8,
+    # Negative
+    "bad": -2.5, "terrible": -2.1, "awful": -2.0, "horrible": -2.5, "worse": -2.1, "worst": -3.1,
+    "sad": -2.1, "unhappy": -1.8, "angry": -2.3, "annoyed": -1.6, "upset": -1.6, "frustrated": -2.4,
+    "frustrating": -1.9, "stressed": -2.0, "stress": -1.8, "stressful": -2.2, "anxious": -1.0,
+    "anxiety": -1.7, "worried": -1.2, "worry": -1.9, "nervous": -1.5, "afraid": -2.0, "scared": -2.2,
+    "overwhelmed": -1.8, "overwhelming": -1.9, "exhausted": -1.6, "exhausting": -1.5, "tired": -1.9,
+    "drained": -2.0, "burnout": -2.3, "fatigue": -1.6, "sick": -2.3, "ill": -1.8, "hate": -2.7,
+    "hated": -3.2, "fail": -2.5, "failed": -2.3, "failure": -2.3, "problem": -1.7, "problems": -1.7,
+    "issue": -0.8, "issues": -0.8, "blocked": -1.2, "stuck": -1.2, "late": -0.8, "delay": -1.3,
+    "delayed": -1.2, "behind": -0.8, "pressure": -1.2, "urgent": -0.8, "interruptions": -1.3,
+    "interrupted": -1.3, "lonely": -1.5, "bored": -1.1, "boring": -1.3, "hopeless": -2.0,
+    "miserable": -2.2, "disappointed": -1.9, "disappointing": -2.2, "struggle": -1.5, "struggling": -1.9,
+    "difficult": -1.5, "hard": -0.4, "pain": -2.3, "painful": -2.4, "conflict": -1.3, "crisis": -3.1,
+    "incident": -0.8, "outage": -1.7, "rushed": -1.3, "rush": -0.9, "chaos": -2.4, "chaotic": -2.2,
+    "sleepless": -1.6, "insomnia": -1.7, "headache": -1.9, "cry": -2.1, "cried": -1.6, "quit": -1.1,
+    "unfair": -2.1, "ignored": -1.4, "criticized": -1.5, "complaint": -1.5, "mistake": -1.4,
+}
+
+# Multi-word expressions, matched before the single tokens they contain
+PHRASES = {
+    ("burned", "out"): -2.6, ("burnt", "out"): -2.6, ("worn", "out"): -2.0, ("fed", "up"): -2.0,
+    ("stressed", "out"): -2.3, ("freaked", "out"): -2.1, ("fell", "behind"): -1.5,
+    ("falling", "behind"): -1.6, ("no", "worries"): 1.2, ("well", "done"): 2.6, ("good", "job"): 2.6,
+    ("great", "job"): 3.0, ("on", "track"): 1.3, ("day", "off"): 1.4, ("back", "to", "back"): -1.2,
+    ("too", "many"): -1.0, ("too", "much"): -1.0,
+}
+
+NEGATORS = {
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without", "hardly", "barely",
+    "cannot", "can't", "cant", "don't", "dont", "doesn't", "doesnt", "didn't", "didnt", "isn't", "isnt",
+    "wasn't", "wasnt", "aren't", "arent", "weren't", "werent", "won't", "wont", "wouldn't", "wouldnt",
+    "shouldn't", "shouldnt", "couldn't", "couldnt", "haven't", "havent", "hasn't", "hasnt", "ain't",
+}
+
+BOOSTERS = {
+    "very": 0.293, "really": 0.293, "extremely": 0.293, "so": 0.293, "incredibly": 0.293, "totally": 0.293,
+    "completely": 0.293, "absolutely": 0.293, "super": 0.293, "too": 0.293, "deeply": 0.293,
+    "slightly": -0.293, "somewhat": -0.293, "barely": -0.293, "kinda": -0.293, "little": -0.293,
+}
+
+EMOTIONS = ("joy", "sadness", "anger", "fear", "surprise", "disgust")
+EMOTION_LEXICON = {
+    "joy": ["happy", "glad", "love", "loved", "enjoy", "enjoyed", "fun", "excited", "proud", "great",
+            "awesome", "celebrate", "laugh", "smile", "grateful", "energized", "relaxed"],
+    "sadness": ["sad", "unhappy", "lonely", "miserable", "hopeless", "disappointed", "cry", "cried",
+                "tired", "exhausted", "drained"],
+    "anger": ["angry", "annoyed", "frustrated", "frustrating", "hate", "hated", "unfair", "upset"],
+    "fear": ["afraid", "scared", "anxious", "anxiety", "worried", "worry", "nervous", "overwhelmed",
+             "pressure", "stressed", "deadline"],
+    "surprise": ["surprised", "unexpected", "suddenly", "shocked", "wow"],
+    "disgust": ["disgusted", "gross", "awful", "horrible", "terrible"],
+}
+
+STRESS_KEYWORDS = [
+    "urgent", "asap", "immediately", "deadline", "rush", "hurry",
+    "stressed", "overwhelmed", "frustrated", "exhausted", "burned out"
+]
+
+NEGATION_SCALAR = -0.74
+# Normalization constant mapping the raw valence sum into (-1, 1)
+NORMALIZATION_ALPHA = 15.0
+EXCLAMATION_BOOST = 0.292
+BUT_BEFORE, BUT_AFTER = 0.5, 1.5
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+STRESS_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in STRESS_KEYWORDS))
+
+# Token flags in the compiled table
+_NEGATOR, _BOOSTER, _VALENCE, _BUT = 1, 2, 4, 8
+
+def _compile_table() -> Dict[str, Tuple[int, float, float, int]]:
+    """One lookup per token: (flags, valence, booster increment, emotion index or -1)"""
+    table: Dict[str, List] = {}
+
+    def entry(token):
+        return table.setdefault(token, [0, 0.0, 0.0, -1])
+
+    for token, valence in LEXICON.items():
+        row = entry(token)
+        row[0] |= _VALENCE
+        row[1] = valence
+    for token in NEGATORS:
+        entry(token)[0] |= _NEGATOR
+    for token, increment in BOOSTERS.items():
+        row = entry(token)
+        row[0] |= _BOOSTER
+        row[2] = increment
+    for index, emotion in enumerate(EMOTIONS):
+        for token in EMOTION_LEXICON[emotion]:
+            entry(token)[3] = index
+    entry("but")[0] |= _BUT
+    return {token: tuple(row) for token, row in table.items()}
+
+class LexiconSentimentEngine:
+    """Rule-based sentiment scorer over precompiled lookup tables.
+
+    Tokens are matched against a single table carrying valence, negation,
+    booster and emotion data, so each token costs one dict lookup. Negation
+    looks back three tokens, boosters one, and "but" shifts weight to the
+    clause after it.
+    """
+
+    def __init__(self):
+        self.table = _compile_table()
+        self.phrases = PHRASES
+        self.phrase_starts = {phrase[0] for phrase in PHRASES}
+        self.max_phrase = max(len(phrase) for phrase in PHRASES)
+
+    def tokenize(self, text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score many texts; the tables and bound methods are resolved once per batch"""
+        findall = TOKEN_PATTERN.findall
+        score = self._score_tokens
+        return [score(findall(text.lower()), text.count("!")) for text in texts]
+
+    def _score_tokens(self, tokens: List[str], exclamations: int) -> Dict[str, Any]:
+        table_get = self.table.get
+        phrases = self.phrases
+        phrase_starts = self.phrase_starts
+        valences: List[float] = []
+        emotion_counts = [0] * len(EMOTIONS)
+        but_index = -1
+        hits = 0
+
+        previous = None
+        last_negator = -4
+        i, n = 0, len(tokens)
+        while i < n:
+            token = tokens[i]
+            entry = table_get(token)
+            valence = None
+            width = 1
+
+            # Longest multi-word expression starting here
+            if token in phrase_starts:
+                for size in range(min(self.max_phrase, n - i), 1, -1):
+                    phrase_valence = phrases.get(tuple(tokens[i:i + size]))
+                    if phrase_valence is not None:
+                        valence, width = phrase_valence, size
+                        break
+
+            if entry is not None:
+                flags = entry[0]
+                if flags & _BUT:
+                    but_index = len(valences)
+                if valence is None and flags & _VALENCE:
+                    valence = entry[1]
+                # Negation reaches the three following tokens
+                negated = i - last_negator <= 3
+                if entry[3] >= 0 and not negated:
+                    emotion_counts[entry[3]] += 1
+                # A negator that opens a phrase ("no worries") is part of its meaning, not a negation
+                if flags & _NEGATOR and width == 1:
+                    last_negator = i
+            else:
+                negated = i - last_negator <= 3
+
+            if valence is not None:
+                hits += 1
+                if previous is not None and previous[0] & _BOOSTER:
+                    valence += previous[2] if valence > 0 else -previous[2]
+                if negated:
+                    valence *= NEGATION_SCALAR
+                valences.append(valence)
+                valences.extend([0.0] * (width - 1))
+            else:
+                valences.append(0.0)
+
+            previous = table_get(tokens[i + width - 1]) if width > 1 else entry
+            i += width
+
+        if but_index >= 0:
+            valences = [v * BUT_BEFORE for v in valences[:but_index]] + [v * BUT_AFTER for v in valences[but_index:]]
+
+        total = sum(valences)
+        if total and exclamations:
+            total += math.copysign(min(exclamations, 4) * EXCLAMATION_BOOST, total)
+        sentiment = total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+
+        emotion_total = sum(emotion_counts)
+        return {
+            "sentiment_score": round(sentiment, 4),
+            # More sentiment-bearing words means more evidence behind the score
+            "confidence": round(min(0.95, 0.5 + 0.1 * hits), 3),
+            "emotions": {
+                emotion: round(count / emotion_total, 3) if emotion_total else 0.0
+                for emotion, count in zip(EMOTIONS, emotion_counts)
+            }
+        }
+
+    def stress_indicators(self, text: str) -> Dict[str, Any]:
+        """Keyword-based stress level, the same rules the hosted path applies"""
+        found_keywords = sorted(set(STRESS_PATTERN.findall(text.lower())), key=STRESS_KEYWORDS.index)
+        return {
+            "stress_level": min(len(found_keywords) / 5, 1.0),
+            "indicators": {
+                "found_keywords": found_keywords,
+                "keyword_count": len(found_keywords),
+                "text_length": len(text)
+            }
+        }
+
+lexicon_sentiment_engine = LexiconSentimentEngine()
@@ -0,0 +1,149 @@
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+
+from database.models import Meeting, WorkSession
+from services.working_hours import working_hours, Window
+
+# Starting a different meeting or activity within this many minutes of the previous one ending is a context switch
+CONTEXT_SWITCH_GAP = timedelta(minutes=15)
+
+def _minutes(delta: timedelta) -> float:
+    return delta.total_seconds() / 60
+
+def merge_intervals(intervals: Sequence[Window]) -> List[Window]:
+    """Union of intervals as a sorted list of disjoint ones"""
+    merged: List[Window] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def overlap_minutes(intervals: Sequence[Window]) -> float:
+    """Minutes during which two or more of the intervals run at once"""
+    # Ends sort before starts at the same instant, so back-to-back meetings do not overlap
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    overlapping = 0.0
+    active, previous = 0, None
+    for moment, step in events:
+        if active >= 2:
+            overlapping += _minutes(moment - previous)
+        active += step
+        previous = moment
+    return overlapping
+
+def context_switches(items: Sequence[Tuple[datetime, datetime, object]]) -> int:
+    """Times a (start, end, label) item starts while a differently labelled one runs, or shortly after it ends"""
+    switches = 0
+    last_end, last_label = None, None
+    for start, end, label in sorted(items, key=lambda item: (item[0], item[1])):
+        if last_end is not None and label != last_label and start - last_end <= CONTEXT_SWITCH_GAP:
+            switches += 1
+        last_end = end if last_end is None else max(last_end, end)
+        last_label = label
+    return switches
+
+def longest_free_block(window: Window, busy: List[Window], busy_starts: List[datetime]) -> float:
+    """Longest stretch of window, in minutes, not covered by the sorted disjoint busy intervals"""
+    window_start, window_end = window
+    longest, cursor = 0.0, window_start
+    # The interval starting at or before window_start may still cover its beginning
+    index = max(0, bisect_right(busy_starts, window_start) - 1)
+    while index < len(busy) and busy[index][0] < window_end:
+        busy_start, busy_end = busy[index]
+        if busy_end > cursor:
+            if busy_start > cursor:
+                longest = max(longest, _minutes(busy_start - cursor))
+            cursor = busy_end
+        index += 1
+    if cursor < window_end:
+        longest = max(longest, _minutes(window_end - cursor))
+    return longest
+
+class MeetingAnalytics:
+    """Meeting fragmentation per local day, by sorting and sweeping intervals.
+
+    For each day in the user's timezone: the minutes double-booked
+    meetings overlap, the context switches between meetings and work
+    sessions, and the longest block of working hours with no meeting in it.
+    Everything is O(n log n) in the number of meetings and sessions.
+    """
+
+    def daily_metrics(
+        self,
+        profile: Dict,
+        meetings: Sequence[Window],
+        sessions: Sequence[Tuple[datetime, datetime, Optional[str]]],
+        first_day: date,
+        last_day: date
+    ) -> Dict[date, Dict]:
+        """Metrics for every local day from first_day to last_day; longest_focus_minutes is None on days off"""
+        days: Dict[date, Dict] = {}
+        windows = working_hours.windows_by_day(profile, first_day, last_day)
+        for day, day_windows in windows.items():
+            days[day] = {
+                "day": day,
+                # Local noon in UTC, to place the day among timestamp-based buckets
+                "anchor": working_hours.to_utc(profile, day, 12 * 60),
+                "meeting_count": 0,
+                "meeting_minutes": 0.0,
+                "overlap_minutes": 0.0,
+                "context_switches": 0,
+                "longest_focus_minutes": None,
+                "working_minutes": sum(_minutes(end - start) for start, end in day_windows),
+            }
+
+        meetings_by_day: Dict[date, List[Window]] = {}
+        items_by_day: Dict[date, List[Tuple[datetime, datetime, object]]] = {}
+        for index, (start, end) in enumerate(meetings):
+            day = working_hours.local_day(profile, start)
+            meetings_by_day.setdefault(day, []).append((start, end))
+            # Every meeting is its own context
+            items_by_day.setdefault(day, []).append((start, end, ("meeting", index)))
+        for start, end, activity_type in sessions:
+            items_by_day.setdefault(working_hours.local_day(profile, start), []).append((start, end, ("work", activity_type)))
+
+        for day, day_meetings in meetings_by_day.items():
+            if day not in days:
+                continue
+            days[day]["meeting_count"] = len(day_meetings)
+            days[day]["meeting_minutes"] = sum(_minutes(end - start) for start, end in merge_intervals(day_meetings))
+            days[day]["overlap_minutes"] = overlap_minutes(day_meetings)
+        for day, items in items_by_day.items():
+            if day in days:
+                days[day]["context_switches"] = context_switches(items)
+
+        # Focus blocks are cut by any meeting, including one that started the day before
+        busy = merge_intervals(meetings)
+        busy_starts = [start for start, _ in busy]
+        for day, day_windows in windows.items():
+            if day_windows:
+                days[day]["longest_focus_minutes"] = max(
+                    longest_free_block(window, busy, busy_starts) for window in day_windows
+                )
+        return days
+
+    def analyze(self, db: Session, user_id: int, start: datetime, end: datetime) -> List[Dict]:
+        """Per-day metrics for the user's local days touching [start, end], oldest first"""
+        profile = working_hours.get_profile(db, user_id)
+        meetings = db.query(Meeting.start_time, Meeting.end_time).filter(
+            Meeting.user_id == user_id, Meeting.start_time >= start, Meeting.start_time <= end
+        ).all()
+        sessions = db.query(WorkSession.start_time, WorkSession.end_time, WorkSession.activity_type).filter(
+            WorkSession.user_id == user_id, WorkSession.start_time >= start, WorkSession.start_time <= end
+        ).all()
+        # Legacy rows may have no end time; they count as zero-length intervals
+        days = self.daily_metrics(
+            profile,
+            [(start_time, end_time or start_time) for start_time, end_time in meetings],
+            [(start_time, end_time or start_time, activity_type) for start_time, end_time, activity_type in sessions],
+            working_hours.local_day(profile, start),
+            working_hours.local_day(profile, end)
+        )
+        return [days[day] for day in sorted(days)]
+
+meeting_analytics = MeetingAnalytics()
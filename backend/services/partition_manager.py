@@ -0,0 +1,97 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import os
+import re
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Monthly partitions created ahead of time so inserts never land in the default partition
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+# Range-partitioned tables (PostgreSQL only) and their partition key, see migration 0005
+PARTITIONED_TABLES = {
+    "work_sessions": "start_time",
+    "meetings": "start_time",
+    "emails": "sent_at",
+    "burnout_scores": "calculated_at",
+}
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month containing day"""
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+class PartitionManager:
+    """Creates and drops the monthly partitions of the event tables"""
+
+    def __init__(self, months_ahead: int = PARTITION_MONTHS_AHEAD):
+        self.months_ahead = months_ahead
+
+    def is_partitioned(self, db: Session) -> bool:
+        """Partitioning only exists on PostgreSQL"""
+        return db.get_bind().dialect.name == "postgresql"
+
+    def list_partitions(self, db: Session, table: str) -> Dict[date, str]:
+        """Monthly partitions of a table keyed by the first day of their month"""
+        names = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ), {"table": table}).scalars().all()
+
+        partitions = {}
+        for name in names:
+            match = _PARTITION_NAME.match(name)
+            if match and match.group("table") == table:
+                partitions[date(int(match.group("year")), int(match.group("month")), 1)] = name
+        return partitions
+
+    def ensure_partitions(self, db: Session, now: Optional[datetime] = None) -> List[str]:
+        """Create any missing partitions from the current month through months_ahead and return their names"""
+        if not self.is_partitioned(db):
+            return []
+
+        current_month = (now or datetime.utcnow()).date().replace(day=1)
+        created = []
+        for table in PARTITIONED_TABLES:
+            existing = self.list_partitions(db, table)
+            for offset in range(self.months_ahead + 1):
+                month = add_months(current_month, offset)
+                if month in existing:
+                    continue
+                name = partition_name(table, month)
+                db.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+        db.commit()
+        return created
+
+    def expired_partitions(self, db: Session, table: str, cutoff: date) -> List[str]:
+        """Partitions whose whole month ends on or before cutoff"""
+        if not self.is_partitioned(db):
+            return []
+        return [
+            name for month, name in sorted(self.list_partitions(db, table).items())
+            if add_months(month, 1) <= cutoff
+        ]
+
+    def drop_partition(self, db: Session, name: str):
+        """Detach and drop one partition; far cheaper than deleting its rows"""
+        match = _PARTITION_NAME.match(name)
+        if not match or match.group("table") not in PARTITIONED_TABLES:
+            raise ValueError(f"Not a managed partition: {name}")
+        db.execute(text(f"ALTER TABLE {match.group('table')} DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+
+partition_manager = PartitionManager()
@@ -0,0 +1,240 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import event
+import bisect
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PERFORMANCE_DEBUG_HEADERS = os.getenv("PERFORMANCE_DEBUG_HEADERS", "false").lower() == "true"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return "\n".join(lines)
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> str:
+        return super().render().replace(f"# TYPE {self.name} counter", f"# TYPE {self.name} gauge")
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return sum(self._values.get(key, []))
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, counts in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                cumulative += counts[-1]
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return "\n".join(lines)
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+class RequestStats:
+    """Database usage of one request; threadpool workers running its queries share it, so updates are locked"""
+    __slots__ = ("query_count", "db_time", "_lock")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_query(self, elapsed: float):
+        with self._lock:
+            self.query_count += 1
+            self.db_time += elapsed
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+class PerformanceMonitor:
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self.request_latency = self.registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route",
+            ("method", "route", "status")
+        )
+        self.request_queries = self.registry.histogram(
+            "http_request_db_queries", "Database queries issued per HTTP request",
+            ("method", "route"), QUERY_COUNT_BUCKETS
+        )
+        self.request_db_time = self.registry.histogram(
+            "http_request_db_duration_seconds", "Database time spent per HTTP request",
+            ("method", "route")
+        )
+        self.query_latency = self.registry.histogram(
+            "db_query_duration_seconds", "Latency of individual database queries"
+        )
+        self.inference_latency = self.registry.histogram(
+            "vertex_inference_duration_seconds", "Vertex AI inference latency",
+            ("operation", "outcome")
+        )
+        self._instrumented_engines = set()
+
+    def instrument_engine(self, engine):
+        """Count and time every query executed through an engine"""
+        if id(engine) in self._instrumented_engines:
+            return
+        self._instrumented_engines.add(id(engine))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+            self.query_latency.observe(elapsed)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.record_query(elapsed)
+
+    @contextmanager
+    def time_inference(self, operation: str):
+        """Record the latency of a Vertex AI call"""
+        start = time.perf_counter()
+        outcome = "success"
+        try:
+            yield
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self.inference_latency.observe(time.perf_counter() - start, operation=operation, outcome=outcome)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+class PerformanceMiddleware:
+    """ASGI middleware recording per-route latency and database usage"""
+
+    def __init__(self, app, monitor: Optional[PerformanceMonitor] = None, debug_headers: bool = PERFORMANCE_DEBUG_HEADERS):
+        self.app = app
+        self.monitor = monitor or performance_monitor
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.query_count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            # Route templates keep label cardinality bounded; unmatched paths share one label
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            self.monitor.request_latency.observe(time.perf_counter() - start, method=method, route=route_label, status=status_code)
+            self.monitor.request_queries.observe(stats.query_count, method=method, route=route_label)
+            self.monitor.request_db_time.observe(stats.db_time, method=method, route=route_label)
+
+performance_monitor = PerformanceMonitor()
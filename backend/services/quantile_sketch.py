@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional
+import math
+import random
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (Karnin, Lang, Liberty).
+
+    Items live in a stack of compactors; an item at level h stands for 2^h
+    original values. When a level overflows it is sorted and every other
+    item is promoted, so memory stays O(k) regardless of stream length.
+    Two sketches merge by concatenating levels and compacting.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.compactors: List[List[float]] = [[]]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, value: float):
+        value = float(value)
+        self.n += 1
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+        self.compactors[0].append(value)
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def discard(self, value: float) -> bool:
+        """Remove one uncompacted copy of value; False when it has already been compacted and cannot be removed"""
+        for index, item in enumerate(self.compactors[0]):
+            if round(item, 4) == round(value, 4):
+                self.compactors[0].pop(index)
+                self.n -= 1
+                return True
+        return False
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items = sorted(self.compactors[level])
+                # An odd leftover stays behind so no weight is lost
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._random.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = leftover
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if q <= 0:
+            return self.min_value
+        if q >= 1:
+            return self.max_value
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return self.max_value
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min_value,
+            "max": self.max_value,
+            # Scores live in [0, 1]; four decimals keep the stored sketch compact
+            "compactors": [[round(value, 4) for value in items] for items in self.compactors],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "KLLSketch":
+        sketch = cls(k=(data or {}).get("k", 200))
+        if data:
+            sketch.n = data["n"]
+            sketch.min_value = data["min"]
+            sketch.max_value = data["max"]
+            sketch.compactors = [list(items) for items in data["compactors"]] or [[]]
+        return sketch
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from fastapi import Request, Response
+import hashlib
+
+from database.models import ResourceVersion
+
+# Resources whose reads are served conditionally; every write path bumps the matching counter
+RESOURCES = ("burnout_scores", "journal_entries", "work_sessions", "meetings", "emails")
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+class ResourceVersionService:
+    """Cheap per-user, per-resource change counters backing ETag and Last-Modified"""
+
+    def _upsert(self, db: Session):
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Resource versions are not supported on {dialect}")
+        return dialect_insert(ResourceVersion.__table__)
+
+    def bump(self, db: Session, user_ids, *resources: str):
+        """Increment the counters in the caller's transaction; commits with the write it describes.
+
+        The new versions are kept in db.info["bumped_versions"] as
+        (user_id, resource) -> (version before, version after) for after-commit hooks.
+        """
+        user_ids = [user_ids] if isinstance(user_ids, int) else list(user_ids)
+        if not user_ids or not resources:
+            return
+        now = datetime.utcnow()
+        statement = self._upsert(db)
+        bumped = db.execute(statement.values([
+            {"user_id": user_id, "resource": resource, "version": 1, "updated_at": now}
+            for user_id in user_ids for resource in resources
+        ]).on_conflict_do_update(
+            index_elements=["user_id", "resource"],
+            set_={"version": ResourceVersion.version + 1, "updated_at": statement.excluded.updated_at}
+        ).returning(ResourceVersion.user_id, ResourceVersion.resource, ResourceVersion.version))
+        versions = db.info.setdefault("bumped_versions", {})
+        for user_id, resource, version in bumped:
+            before, _ = versions.get((user_id, resource), (version - 1, None))
+            versions[(user_id, resource)] = (before, version)
+
+    def get(self, db: Session, user_id: int, resource: str) -> Tuple[int, Optional[datetime]]:
+        """Current version and modification time; (0, None) until the first write"""
+        row = db.query(ResourceVersion.version, ResourceVersion.updated_at).filter(
+            ResourceVersion.user_id == user_id,
+            ResourceVersion.resource == resource
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+
+    def conditional(
+        self,
+        db: Session,
+        request: Request,
+        response: Response,
+        user_id: int,
+        resource: str,
+        window_start: Optional[datetime] = None
+    ) -> Optional[Response]:
+        """Return a 304 response if the client's copy is current, otherwise set validators on response.
+
+        window_start is the start of a time-windowed query; it is part of the
+        validator because the result changes as the window moves.
+        """
+        version, updated_at = self.get(db, user_id, resource)
+        query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+        digest = hashlib.sha256(
+            f"{user_id}:{resource}:{version}:{window_start.isoformat() if window_start else ''}:{query}".encode()
+        ).hexdigest()[:32]
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": "private, no-cache"}
+
+        last_modified = max(filter(None, (updated_at, window_start)), default=None)
+        if last_modified is not None:
+            headers["Last-Modified"] = _http_date(last_modified)
+
+        if self._not_modified(request, digest, last_modified):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return None
+
+    def _not_modified(self, request: Request, digest: str, last_modified: Optional[datetime]) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == f'"{digest}"' for tag in tags)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return last_modified.replace(microsecond=0) <= since
+
+resource_versions = ResourceVersionService()
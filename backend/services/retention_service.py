@@ -0,0 +1,185 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session
+import gzip
+import os
+from dotenv import load_dotenv
+
+from database.models import WorkSession, Meeting, Email, EmailBody, BurnoutScore, DailyActivityAggregate
+from services.export_service import export_service
+from services.partition_manager import partition_manager, add_months, partition_name, PARTITIONED_TABLES
+from services.resource_versions import resource_versions
+
+load_dotenv()
+
+# Days of raw events kept in the hot tables; whole months older than this are archived. Negative keeps everything
+EVENT_RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DAYS", "90"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+
+EVENT_MODELS = {
+    "work_sessions": WorkSession,
+    "meetings": Meeting,
+    "emails": Email,
+    "burnout_scores": BurnoutScore,
+}
+
+def _as_date(value) -> date:
+    # SQLite returns func.date() as a string
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+class RetentionService:
+    """Rolls expired raw events into daily aggregates, archives them and drops them from the hot tables"""
+
+    def __init__(self, retention_days: int = EVENT_RETENTION_DAYS, archive_dir: str = ARCHIVE_DIR):
+        self.retention_days = retention_days
+        self.archive_dir = archive_dir
+
+    def cutoff(self, now: Optional[datetime] = None) -> date:
+        """Start of the oldest month that is still (partly) inside the retention window"""
+        return ((now or datetime.utcnow()) - timedelta(days=self.retention_days)).date().replace(day=1)
+
+    def expired_months(self, db: Session, cutoff: date) -> List[date]:
+        """Months before cutoff that still hold raw events"""
+        oldest = None
+        for table, model in EVENT_MODELS.items():
+            key = getattr(model, PARTITIONED_TABLES[table])
+            value = db.query(func.min(key)).filter(key < cutoff).scalar()
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            if value is not None and (oldest is None or value < oldest):
+                oldest = value
+        if oldest is None:
+            return []
+
+        months = []
+        month = oldest.date().replace(day=1)
+        while month < cutoff:
+            months.append(month)
+            month = add_months(month, 1)
+        return months
+
+    def run(self, db: Session, now: Optional[datetime] = None, dry_run: bool = False) -> Dict:
+        """Process every expired month and return per-month row counts"""
+        if self.retention_days < 0:
+            return {"cutoff": None, "months": {}, "partitions_created": []}
+
+        created = [] if dry_run else partition_manager.ensure_partitions(db, now)
+        cutoff = self.cutoff(now)
+        months = {}
+        for month in self.expired_months(db, cutoff):
+            months[month.isoformat()] = self.process_month(db, month, dry_run)
+        return {"cutoff": cutoff, "months": months, "partitions_created": created}
+
+    def process_month(self, db: Session, month: date, dry_run: bool = False) -> Dict[str, int]:
+        """Roll up, archive and remove one month of raw events"""
+        start, end = month, add_months(month, 1)
+        counts = {table: self._count(db, table, start, end) for table in EVENT_MODELS}
+        if dry_run:
+            return counts
+
+        # Archive files are written before anything is deleted, so a failure leaves the month intact
+        for table in EVENT_MODELS:
+            if counts[table]:
+                self.archive(db, table, start, end)
+
+        self.rollup(db, start, end)
+        # Cached reads of the affected users must not outlive the rows they contained
+        for table, model in EVENT_MODELS.items():
+            key = getattr(model, PARTITIONED_TABLES[table])
+            user_ids = [user_id for user_id, in db.query(model.user_id).filter(key >= start, key < end).distinct()]
+            resource_versions.bump(db, user_ids, table)
+        self._remove(db, start, end)
+        db.commit()
+        return counts
+
+    def rollup(self, db: Session, start: date, end: date) -> int:
+        """Replace the daily aggregates for [start, end) with values computed from the raw events"""
+        rows: Dict[Tuple[int, date], Dict] = {}
+
+        def row_for(user_id, day):
+            key = (user_id, _as_date(day))
+            if key not in rows:
+                rows[key] = {"user_id": key[0], "day": key[1]}
+            return rows[key]
+
+        day = func.date(WorkSession.start_time)
+        for user_id, group_day, count, minutes in db.query(
+            WorkSession.user_id, day, func.count(WorkSession.id), func.sum(WorkSession.duration_minutes)
+        ).filter(WorkSession.start_time >= start, WorkSession.start_time < end).group_by(WorkSession.user_id, day):
+            row_for(user_id, group_day).update(work_session_count=count, work_minutes=minutes or 0)
+
+        day = func.date(Meeting.start_time)
+        for user_id, group_day, count, minutes, after_hours in db.query(
+            Meeting.user_id, day, func.count(Meeting.id), func.sum(Meeting.duration_minutes),
+            func.sum(case((Meeting.is_after_hours, 1), else_=0))
+        ).filter(Meeting.start_time >= start, Meeting.start_time < end).group_by(Meeting.user_id, day):
+            row_for(user_id, group_day).update(
+                meeting_count=count, meeting_minutes=minutes or 0, after_hours_meeting_count=after_hours or 0
+            )
+
+        day = func.date(Email.sent_at)
+        for user_id, group_day, count, after_hours, sentiment_sum, sentiment_count in db.query(
+            Email.user_id, day, func.count(Email.id), func.sum(case((Email.is_after_hours, 1), else_=0)),
+            func.sum(Email.sentiment_score), func.count(Email.sentiment_score)
+        ).filter(Email.sent_at >= start, Email.sent_at < end).group_by(Email.user_id, day):
+            row_for(user_id, group_day).update(
+                email_count=count, after_hours_email_count=after_hours or 0,
+                email_sentiment_sum=sentiment_sum or 0.0, email_sentiment_count=sentiment_count
+            )
+
+        day = func.date(BurnoutScore.calculated_at)
+        for user_id, group_day, count, mean, minimum, maximum in db.query(
+            BurnoutScore.user_id, day, func.count(BurnoutScore.id), func.avg(BurnoutScore.overall_score),
+            func.min(BurnoutScore.overall_score), func.max(BurnoutScore.overall_score)
+        ).filter(BurnoutScore.calculated_at >= start, BurnoutScore.calculated_at < end).group_by(BurnoutScore.user_id, day):
+            row_for(user_id, group_day).update(
+                burnout_score_count=count, burnout_score_mean=mean,
+                burnout_score_min=minimum, burnout_score_max=maximum
+            )
+
+        # Delete-then-insert keeps reruns of the same month idempotent
+        db.execute(delete(DailyActivityAggregate).where(
+            DailyActivityAggregate.day >= start, DailyActivityAggregate.day < end
+        ))
+        if rows:
+            db.add_all(DailyActivityAggregate(**values) for values in rows.values())
+        db.flush()
+        return len(rows)
+
+    def archive(self, db: Session, table: str, start: date, end: date) -> str:
+        """Write one month of a table to a gzipped NDJSON file and return its path"""
+        directory = os.path.join(self.archive_dir, table)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{table}_{start.year:04d}_{start.month:02d}.ndjson.gz")
+        temp_path = f"{path}.tmp"
+
+        chunks = export_service.iter_chunks(
+            db, table, start_date=start, end_date=end, include_body=(table == "emails")
+        )
+        with gzip.open(temp_path, "wb") as archive_file:
+            for data in export_service.iter_ndjson(chunks):
+                archive_file.write(data)
+        os.replace(temp_path, path)
+        return path
+
+    def _count(self, db: Session, table: str, start: date, end: date) -> int:
+        model = EVENT_MODELS[table]
+        key = getattr(model, PARTITIONED_TABLES[table])
+        return db.query(func.count(model.id)).filter(key >= start, key < end).scalar()
+
+    def _remove(self, db: Session, start: date, end: date):
+        # Bodies first: on PostgreSQL there is no foreign key to cascade from partitioned emails
+        db.execute(delete(EmailBody).where(EmailBody.email_id.in_(
+            select(Email.id).where(Email.sent_at >= start, Email.sent_at < end)
+        )))
+
+        partitioned = partition_manager.is_partitioned(db)
+        for table, model in EVENT_MODELS.items():
+            if partitioned and partition_name(table, start) in partition_manager.list_partitions(db, table).values():
+                partition_manager.drop_partition(db, partition_name(table, start))
+            # Catches rows in the default partition, and is the only path on other databases
+            key = getattr(model, PARTITIONED_TABLES[table])
+            db.execute(delete(model).where(key >= start, key < end))
+
+retention_service = RetentionService()
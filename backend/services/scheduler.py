@@ -0,0 +1,253 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+from dotenv import load_dotenv
+
+from database.database import engine, SessionLocal, open_user_session, UserShardLocked
+from database.models import User, BurnoutScore, WorkSession, Meeting, Email, JournalEntry
+from services.calculation_coordinator import burnout_calculations
+from services.integration_sync import integration_sync
+from services.performance_monitor import performance_monitor
+from services.websocket_manager import websocket_manager
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: every enabled worker competes for the lock, and the sync job calls external APIs
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+SCHEDULER_RECALC_INTERVAL_SECONDS = int(os.getenv("SCHEDULER_RECALC_INTERVAL_SECONDS", "3600"))
+SCHEDULER_SYNC_INTERVAL_SECONDS = int(os.getenv("SCHEDULER_SYNC_INTERVAL_SECONDS", "21600"))
+SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "4"))
+# Advisory lock key shared by every worker; only the holder schedules jobs
+SCHEDULER_LOCK_ID = int(os.getenv("SCHEDULER_LOCK_ID", "4631"))
+# Worker processes serving the app, as uvicorn and gunicorn read it
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+def jitter_offset(job: str, user_id: int, interval: float) -> float:
+    """Stable offset of a user's slot within the interval, so load is spread evenly and survives restarts"""
+    digest = hashlib.sha256(f"{job}:{user_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 * interval
+
+def is_due(offset: float, interval: float, window_start: float, window_end: float) -> bool:
+    """Whether a slot at offset + k * interval falls in (window_start, window_end]"""
+    return math.floor((window_end - offset) / interval) > math.floor((window_start - offset) / interval)
+
+class LeaderLock:
+    """Session-level PostgreSQL advisory lock held on a dedicated connection.
+
+    Other databases have no advisory locks, so the lock is always granted
+    there and cannot keep two workers from both scheduling; the scheduler
+    refuses to start on them with more than one worker.
+    """
+
+    def __init__(self, engine, lock_id: int = SCHEDULER_LOCK_ID):
+        self.engine = engine
+        self.lock_id = lock_id
+        self._connection = None
+
+    @property
+    def coordinates_workers(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def acquire(self) -> bool:
+        """Try to become (or confirm still being) the leader without blocking"""
+        if self.engine.dialect.name != "postgresql":
+            return True
+
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # The lock died with the connection; compete again below
+                self._discard()
+
+        connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"), {"lock_id": self.lock_id}
+            ).scalar()
+        except Exception:
+            connection.close()
+            raise
+        if acquired:
+            self._connection = connection
+        else:
+            connection.close()
+        return bool(acquired)
+
+    def release(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": self.lock_id})
+        finally:
+            self._discard()
+
+    def _discard(self):
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+class BurnoutScheduler:
+    """Runs periodic per-user jobs inside the API process.
+
+    Each user gets a deterministic slot per job within the job's interval.
+    Every tick, the leader runs the users whose slots fell since the previous
+    tick, at most max_concurrency at a time.
+    """
+
+    def __init__(
+        self,
+        recalc_interval: float = SCHEDULER_RECALC_INTERVAL_SECONDS,
+        sync_interval: float = SCHEDULER_SYNC_INTERVAL_SECONDS,
+        tick_seconds: float = SCHEDULER_TICK_SECONDS,
+        max_concurrency: int = SCHEDULER_MAX_CONCURRENCY,
+        lock: Optional[LeaderLock] = None,
+        workers: int = WEB_CONCURRENCY
+    ):
+        self.jobs: Dict[str, Tuple[float, Callable]] = {
+            "recalculate": (recalc_interval, self.recalculate_user),
+            "sync": (sync_interval, self.sync_user),
+        }
+        self.tick_seconds = tick_seconds
+        self.max_concurrency = max_concurrency
+        self.lock = lock or LeaderLock(engine)
+        self.workers = workers
+        self._task: Optional[asyncio.Task] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        registry = performance_monitor.registry
+        self.job_runs = registry.counter(
+            "scheduler_jobs_total", "Scheduled per-user jobs by outcome", ("job", "outcome")
+        )
+        self.is_leader = registry.gauge("scheduler_is_leader", "1 when this worker holds the scheduler lock")
+
+    def start(self):
+        if not self.lock.coordinates_workers and self.workers > 1:
+            raise RuntimeError(
+                f"The scheduler needs PostgreSQL to elect one of {self.workers} workers; "
+                "run a single worker or set SCHEDULER_ENABLED=false"
+            )
+        if self._task is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await run_in_threadpool(self.lock.release)
+        self.is_leader.set(0)
+
+    async def _run(self):
+        window_start = None
+        while True:
+            try:
+                leader = await run_in_threadpool(self.lock.acquire)
+                self.is_leader.set(1 if leader else 0)
+                now = time.time()
+                if not leader:
+                    window_start = None
+                elif window_start is None:
+                    # A new leader starts from now rather than replaying missed slots
+                    window_start = now
+                else:
+                    await self.tick(window_start, now)
+                    window_start = now
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self, window_start: float, window_end: float):
+        """Run every job whose user slot falls in (window_start, window_end]"""
+        user_ids = await run_in_threadpool(self._active_user_ids)
+        runs = [
+            self._run_job(job, handler, user_id)
+            for job, (interval, handler) in self.jobs.items()
+            for user_id in user_ids
+            if is_due(jitter_offset(job, user_id, interval), interval, window_start, window_end)
+        ]
+        if runs:
+            await asyncio.gather(*runs)
+
+    async def _run_job(self, job: str, handler: Callable, user_id: int):
+        async with self._semaphore:
+            try:
+                ran = await handler(user_id)
+                self.job_runs.inc(job=job, outcome="ran" if ran else "skipped")
+            except UserShardLocked:
+                # Being moved to another shard; the next interval picks the user up again
+                self.job_runs.inc(job=job, outcome="skipped")
+            except Exception:
+                self.job_runs.inc(job=job, outcome="error")
+                logger.exception("Scheduled %s failed for user %s", job, user_id)
+
+    async def recalculate_user(self, user_id: int) -> bool:
+        if not await run_in_threadpool(self._needs_recalculation, user_id):
+            return False
+        # Shares the run with any request recalculating the same user at the same moment
+        burnout_data, computed = await burnout_calculations.calculate(user_id)
+        if computed:
+            await websocket_manager.send_burnout_update(str(user_id), burnout_data)
+            await websocket_manager.send_anomaly_alerts(str(user_id), burnout_data["anomalies"])
+        return True
+
+    async def sync_user(self, user_id: int) -> bool:
+        await run_in_threadpool(self._sync, user_id)
+        return True
+
+    def _needs_recalculation(self, user_id: int) -> bool:
+        db = open_user_session(user_id, allow_locked=True)
+        try:
+            return self.has_new_data(db, user_id)
+        finally:
+            db.close()
+
+    def _sync(self, user_id: int):
+        db = open_user_session(user_id)
+        try:
+            integration_sync.sync_calendar(db, user_id)
+            integration_sync.sync_emails(db, user_id)
+        finally:
+            db.close()
+
+    def has_new_data(self, db: Session, user_id: int) -> bool:
+        """Whether any event was recorded since the user's latest score"""
+        last_score_at = db.query(func.max(BurnoutScore.calculated_at)).filter(
+            BurnoutScore.user_id == user_id
+        ).scalar()
+        if last_score_at is None:
+            return True
+        for model in (WorkSession, Meeting, Email, JournalEntry):
+            if db.query(model.id).filter(
+                model.user_id == user_id,
+                model.created_at > last_score_at
+            ).first() is not None:
+                return True
+        return False
+
+    def _active_user_ids(self) -> List[int]:
+        db = SessionLocal()
+        try:
+            return [user_id for user_id, in db.query(User.id).filter(User.is_active == True).all()]
+        finally:
+            db.close()
+
+burnout_scheduler = BurnoutScheduler()
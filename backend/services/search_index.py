@@ -0,0 +1,142 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import re
+
+# Searchable tables: the indexed text column, the timestamp shown with a hit, and the result type
+SEARCH_TABLES = {
+    "journal_entries": ("content", "created_at", "journal"),
+    "emails": ("subject", "sent_at", "email"),
+}
+SEARCH_TYPES = {result_type: table for table, (_, _, result_type) in SEARCH_TABLES.items()}
+# PostgreSQL text search configuration; baked into the generated columns, so changing it needs a migration
+TEXT_SEARCH_CONFIG = "english"
+SNIPPET_WORDS = 24
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def _fts5_query(query: str) -> Optional[str]:
+    """Quote each word so user input can never be parsed as FTS5 syntax; words are ANDed"""
+    words = WORD_PATTERN.findall(query)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+class SearchIndex:
+    """Full-text search over a user's journal entries and email subjects.
+
+    PostgreSQL stores a generated tsvector column with a GIN index on each
+    table; SQLite keeps an external-content FTS5 table per source table,
+    filled by triggers. Either way the index is updated by the database in
+    the same statement as the insert, so every write path stays indexed.
+    """
+
+    def ensure(self, bind):
+        """Create the index structures on a database built with create_all instead of migrations"""
+        with bind.begin() as connection:
+            dialect = connection.dialect.name
+            for table, (column, _, _) in SEARCH_TABLES.items():
+                if dialect == "postgresql":
+                    connection.execute(text(
+                        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                        f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, ''))) STORED"
+                    ))
+                    connection.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)"
+                    ))
+                elif dialect == "sqlite":
+                    # Dropping the source table drops its triggers but leaves the FTS table behind
+                    exists = connection.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"), {"name": f"{table}_fts_ai"}
+                    ).first()
+                    if exists:
+                        continue
+                    connection.execute(text(f"DROP TABLE IF EXISTS {table}_fts"))
+                    for statement in self.sqlite_ddl(table, column):
+                        connection.execute(text(statement))
+                    connection.execute(text(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')"))
+
+    def sqlite_ddl(self, table: str, column: str) -> List[str]:
+        return [
+            f"CREATE VIRTUAL TABLE {table}_fts USING fts5({column}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+            f"CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {table}_fts(rowid, {column}) VALUES (new.id, new.{column}); END",
+            f"CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {table}_fts({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+            f"CREATE TRIGGER {table}_fts_au AFTER UPDATE OF {column} ON {table} BEGIN "
+            f"INSERT INTO {table}_fts({table}_fts, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+            f"INSERT INTO {table}_fts(rowid, {column}) VALUES (new.id, new.{column}); END",
+        ]
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query: str,
+        types: Sequence[str] = tuple(SEARCH_TYPES),
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict]:
+        """Ranked hits for the user, best first; each has type, id, title, snippet, rank and occurred_at"""
+        tables = [SEARCH_TYPES[result_type] for result_type in types if result_type in SEARCH_TYPES]
+        dialect = db.get_bind().dialect.name
+        if not tables or not query.strip():
+            return []
+        if dialect == "postgresql":
+            rows = self._search_postgresql(db, user_id, query, tables, limit, offset)
+        elif dialect == "sqlite":
+            rows = self._search_sqlite(db, user_id, query, tables, limit, offset)
+        else:
+            raise ValueError(f"Full-text search is not supported on {dialect}")
+
+        return [{
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "snippet": row.snippet,
+            "rank": float(row.rank),
+            # SQLite returns timestamps from raw SQL as strings
+            "occurred_at": datetime.fromisoformat(row.occurred_at) if isinstance(row.occurred_at, str) else row.occurred_at
+        } for row in rows]
+
+    def _search_postgresql(self, db: Session, user_id: int, query: str, tables: List[str], limit: int, offset: int):
+        arms = []
+        for table in tables:
+            column, timestamp, result_type = SEARCH_TABLES[table]
+            title = "subject" if table == "emails" else "NULL"
+            arms.append(
+                f"SELECT '{result_type}' AS type, id, {title} AS title, {column} AS body, "
+                f"ts_rank(search_vector, q.query) AS rank, {timestamp} AS occurred_at "
+                f"FROM {table}, q WHERE user_id = :user_id AND search_vector @@ q.query"
+            )
+        # ts_rank rather than ts_rank_cd: it is several times cheaper when a common word matches most entries
+        # Headlines are expensive, so they are only built for the page being returned
+        statement = (
+            f"WITH q AS (SELECT websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query) AS query), "
+            f"page AS ({' UNION ALL '.join(arms)} ORDER BY rank DESC, occurred_at DESC LIMIT :limit OFFSET :offset) "
+            f"SELECT type, id, title, rank, occurred_at, "
+            f"ts_headline('{TEXT_SEARCH_CONFIG}', body, q.query, "
+            f"'StartSel=\"\", StopSel=\"\", MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}') AS snippet "
+            f"FROM page, q ORDER BY rank DESC, occurred_at DESC"
+        )
+        return db.execute(text(statement), {"user_id": user_id, "query": query, "limit": limit, "offset": offset}).all()
+
+    def _search_sqlite(self, db: Session, user_id: int, query: str, tables: List[str], limit: int, offset: int):
+        match = _fts5_query(query)
+        if match is None:
+            return []
+        arms = []
+        for table in tables:
+            column, timestamp, result_type = SEARCH_TABLES[table]
+            title = "source.subject" if table == "emails" else "NULL"
+            # bm25() is lower for better matches
+            arms.append(
+                f"SELECT '{result_type}' AS type, source.id AS id, {title} AS title, "
+                f"snippet({table}_fts, 0, '', '', '...', {SNIPPET_WORDS}) AS snippet, "
+                f"-bm25({table}_fts) AS rank, source.{timestamp} AS occurred_at "
+                f"FROM {table}_fts JOIN {table} AS source ON source.id = {table}_fts.rowid "
+                f"WHERE {table}_fts MATCH :match AND source.user_id = :user_id"
+            )
+        statement = f"{' UNION ALL '.join(arms)} ORDER BY rank DESC, occurred_at DESC LIMIT :limit OFFSET :offset"
+        return db.execute(text(statement), {"user_id": user_id, "match": match, "limit": limit, "offset": offset}).all()
+
+search_index = SearchIndex()
@@ -0,0 +1,103 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import os
+import threading
+from dotenv import load_dotenv
+
+from services.lexicon_sentiment import lexicon_sentiment_engine
+from services.vertex_ai_service import vertex_ai_service
+
+load_dotenv()
+
+# local: lexicon engine, vertex: hosted model, auto: vertex when credentials are available, else local
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "auto").lower()
+
+class SentimentBackend(ABC):
+    """Interface for text sentiment and stress analysis"""
+
+    name = "base"
+
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        return self.analyze_sentiment_batch([text])[0]
+
+    @abstractmethod
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def analyze_stress_indicators(self, text: str) -> Dict[str, Any]:
+        ...
+
+class LocalSentimentBackend(SentimentBackend):
+    """In-process lexicon engine; no network, works air-gapped"""
+
+    name = "local"
+
+    def __init__(self, engine=lexicon_sentiment_engine):
+        self.engine = engine
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.engine.analyze_batch(texts)
+
+    def analyze_stress_indicators(self, text: str) -> Dict[str, Any]:
+        return self.engine.stress_indicators(text)
+
+class VertexSentimentBackend(SentimentBackend):
+    """Hosted model through Vertex AI"""
+
+    name = "vertex"
+
+    def __init__(self, service=vertex_ai_service):
+        self.service = service
+
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        return self.service.analyze_sentiment(text)
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.service.analyze_sentiment_batch(texts)
+
+    def analyze_stress_indicators(self, text: str) -> Dict[str, Any]:
+        return self.service.analyze_stress_indicators(text)
+
+class AutoSentimentBackend(SentimentBackend):
+    """Picks Vertex AI when its client can be created, the local engine otherwise.
+
+    The choice is made on first use so importing this module never creates
+    the Vertex client.
+    """
+
+    name = "auto"
+
+    def __init__(self):
+        self._backend: Optional[SentimentBackend] = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> SentimentBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = VertexSentimentBackend() if vertex_ai_service.client else LocalSentimentBackend()
+        return self._backend
+
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        return self.backend.analyze_sentiment(text)
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.backend.analyze_sentiment_batch(texts)
+
+    def analyze_stress_indicators(self, text: str) -> Dict[str, Any]:
+        return self.backend.analyze_stress_indicators(text)
+
+SENTIMENT_BACKENDS = {
+    "local": LocalSentimentBackend,
+    "vertex": VertexSentimentBackend,
+    "auto": AutoSentimentBackend,
+}
+
+def create_sentiment_backend(name: str = SENTIMENT_BACKEND) -> SentimentBackend:
+    if name not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown SENTIMENT_BACKEND '{name}'. Expected one of: {', '.join(SENTIMENT_BACKENDS)}")
+    return SENTIMENT_BACKENDS[name]()
+
+sentiment_backend = create_sentiment_backend()
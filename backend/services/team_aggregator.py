@@ -0,0 +1,207 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from database.models import User, Team, TeamBurnoutSketch, TeamMemberScore
+from services.quantile_sketch import KLLSketch
+
+SKETCH_METRICS = ["overall_score", "work_hours_score", "sentiment_score", "meeting_load_score", "email_stress_score", "fragmentation_score"]
+BURNOUT_LEVELS = ["low", "moderate", "high"]
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+class TeamBurnoutAggregator:
+    """Keeps one mergeable sketch per team per day over each member's latest score, updated as scores are written"""
+
+    def __init__(self, sketch_k: int = 200, stale_rebuild_fraction: float = 0.1):
+        self.sketch_k = sketch_k
+        self.stale_rebuild_fraction = stale_rebuild_fraction
+
+    def _insert(self, db: Session):
+        dialect = db.get_bind(TeamBurnoutSketch.__mapper__).dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Team sketches are not supported on {dialect}")
+        return dialect_insert(TeamBurnoutSketch.__table__)
+
+    def record_score(self, db: Session, user_id: int, score) -> None:
+        """Make a newly written 7-day BurnoutScore its member's value for the day, updating the team's sketch in place"""
+        if score.timeframe_days != 7:
+            return
+        team_id = db.query(User.team_id).filter(User.id == user_id).scalar()
+        if team_id is None:
+            return
+
+        day = (score.calculated_at or datetime.utcnow()).date()
+        # Two members scoring at once would both insert the day's first row; the loser waits on the lock below instead
+        db.execute(self._insert(db).values(
+            team_id=team_id, day=day, score_count=0, level_counts={}, metric_sums={}, metric_counts={}, sketches={},
+            stale_count=0, updated_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=["team_id", "day"]))
+        row = db.query(TeamBurnoutSketch).filter(
+            TeamBurnoutSketch.team_id == team_id,
+            TeamBurnoutSketch.day == day
+        ).with_for_update().populate_existing().one()
+        # The day row's lock also serializes writers of its member values
+        member = db.query(TeamMemberScore).filter(
+            TeamMemberScore.team_id == team_id,
+            TeamMemberScore.user_id == user_id,
+            TeamMemberScore.day == day
+        ).one_or_none()
+
+        sketches = {metric: KLLSketch.from_dict(data) for metric, data in (row.sketches or {}).items()}
+        sums: Dict[str, float] = dict(row.metric_sums or {})
+        counts: Dict[str, int] = dict(row.metric_counts or {})
+        levels: Dict[str, int] = dict(row.level_counts or {})
+        stale = row.stale_count or 0
+
+        if member is None:
+            member = TeamMemberScore(team_id=team_id, user_id=user_id, day=day)
+            db.add(member)
+            row.score_count = (row.score_count or 0) + 1
+        else:
+            # Each member counts once per day: a later score replaces their earlier one
+            levels[member.burnout_level] = levels.get(member.burnout_level, 0) - 1
+            replaced_in_sketch = True
+            for metric in SKETCH_METRICS:
+                value = getattr(member, metric)
+                if value is None:
+                    continue
+                sums[metric] = sums.get(metric, 0.0) - value
+                counts[metric] = counts.get(metric, 0) - 1
+                if metric not in sketches or not sketches[metric].discard(value):
+                    replaced_in_sketch = False
+            if not replaced_in_sketch:
+                stale += 1
+
+        member.burnout_level = score.burnout_level
+        member.updated_at = datetime.utcnow()
+        levels[score.burnout_level] = levels.get(score.burnout_level, 0) + 1
+        for metric in SKETCH_METRICS:
+            value = getattr(score, metric)
+            setattr(member, metric, value)
+            if value is None:
+                continue
+            sketches.setdefault(metric, KLLSketch(self.sketch_k)).update(value)
+            sums[metric] = sums.get(metric, 0.0) + value
+            counts[metric] = counts.get(metric, 0) + 1
+
+        # A replaced value that was already compacted stays in the sketch; once too many have, the day is rebuilt
+        # from its member values, so the rebuild's cost is spread over at least that many writes
+        if stale > row.score_count * self.stale_rebuild_fraction:
+            db.flush()
+            sketches, sums, counts = self._rebuild(db, team_id, day)
+            stale = 0
+
+        # JSON columns are reassigned rather than mutated so the change is flushed
+        row.sketches = {metric: sketch.to_dict() for metric, sketch in sketches.items()}
+        row.metric_sums = sums
+        row.metric_counts = counts
+        row.level_counts = levels
+        row.stale_count = stale
+        row.updated_at = datetime.utcnow()
+        # The session does not autoflush, and the next score for the day re-reads both rows under the lock
+        db.flush()
+
+    def _rebuild(self, db: Session, team_id: int, day) -> Tuple[Dict[str, KLLSketch], Dict[str, float], Dict[str, int]]:
+        sketches: Dict[str, KLLSketch] = {}
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for member in db.query(TeamMemberScore).filter(TeamMemberScore.team_id == team_id, TeamMemberScore.day == day):
+            for metric in SKETCH_METRICS:
+                value = getattr(member, metric)
+                if value is None:
+                    continue
+                sketches.setdefault(metric, KLLSketch(self.sketch_k)).update(value)
+                sums[metric] = sums.get(metric, 0.0) + value
+                counts[metric] = counts.get(metric, 0) + 1
+        return sketches, sums, counts
+
+    def _latest_member_levels(self, db: Session, team_ids: List[int], start_day) -> List[Tuple[int, int, date, str]]:
+        """(team_id, user_id, day, burnout_level) of each member's latest scored day in the window, per team"""
+        latest = db.query(
+            TeamMemberScore.team_id,
+            TeamMemberScore.user_id,
+            func.max(TeamMemberScore.day).label("day")
+        ).filter(
+            TeamMemberScore.team_id.in_(team_ids),
+            TeamMemberScore.day >= start_day
+        ).group_by(TeamMemberScore.team_id, TeamMemberScore.user_id).subquery()
+        return db.query(
+            TeamMemberScore.team_id,
+            TeamMemberScore.user_id,
+            TeamMemberScore.day,
+            TeamMemberScore.burnout_level
+        ).join(latest, and_(
+            TeamMemberScore.team_id == latest.c.team_id,
+            TeamMemberScore.user_id == latest.c.user_id,
+            TeamMemberScore.day == latest.c.day
+        )).all()
+
+    def get_distribution(self, db: Session, team_ids: List[int], days: int = 7) -> Dict:
+        """Merge the daily sketches of the given teams into one distribution"""
+        if not team_ids:
+            return self._summarize([], [])
+        start_day = (datetime.utcnow() - timedelta(days=days)).date()
+        rows = db.query(TeamBurnoutSketch).filter(
+            TeamBurnoutSketch.team_id.in_(team_ids),
+            TeamBurnoutSketch.day >= start_day
+        ).all()
+        # A member who moved between the teams still counts once, with their latest level
+        latest: Dict[int, Tuple[date, str]] = {}
+        for _, user_id, day, level in self._latest_member_levels(db, team_ids, start_day):
+            if user_id not in latest or day > latest[user_id][0]:
+                latest[user_id] = (day, level)
+        return self._summarize(rows, [level for _, level in latest.values()])
+
+    def get_team_distributions(self, db: Session, team_ids: List[int], days: int = 7) -> Dict[int, Dict]:
+        """Per-team distributions, one sketch merge per team"""
+        start_day = (datetime.utcnow() - timedelta(days=days)).date()
+        rows_by_team: Dict[int, List[TeamBurnoutSketch]] = {team_id: [] for team_id in team_ids}
+        levels_by_team: Dict[int, List[str]] = {team_id: [] for team_id in team_ids}
+        if team_ids:
+            for row in db.query(TeamBurnoutSketch).filter(
+                TeamBurnoutSketch.team_id.in_(team_ids),
+                TeamBurnoutSketch.day >= start_day
+            ).all():
+                rows_by_team[row.team_id].append(row)
+            for team_id, _, _, level in self._latest_member_levels(db, team_ids, start_day):
+                levels_by_team[team_id].append(level)
+        return {team_id: self._summarize(rows_by_team[team_id], levels_by_team[team_id]) for team_id in team_ids}
+
+    def _summarize(self, rows: List[TeamBurnoutSketch], member_levels: List[str]) -> Dict:
+        """Counts are of members, each at their latest day; the metrics cover every member-day in the window"""
+        levels = {level: 0 for level in BURNOUT_LEVELS}
+        for level in member_levels:
+            levels[level] = levels.get(level, 0) + 1
+
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        merged: Dict[str, KLLSketch] = {}
+        for row in rows:
+            for metric, value in (row.metric_sums or {}).items():
+                sums[metric] = sums.get(metric, 0.0) + value
+            for metric, value in (row.metric_counts or {}).items():
+                counts[metric] = counts.get(metric, 0) + value
+            for metric, data in (row.sketches or {}).items():
+                sketch = KLLSketch.from_dict(data)
+                if metric in merged:
+                    merged[metric].merge(sketch)
+                else:
+                    merged[metric] = sketch
+
+        metrics = {}
+        for metric in SKETCH_METRICS:
+            sketch = merged.get(metric)
+            metric_count = counts.get(metric, 0)
+            metrics[metric] = {
+                "mean": sums.get(metric, 0.0) / metric_count if metric_count else None,
+                **{name: sketch.quantile(q) if sketch and metric_count else None for name, q in QUANTILES.items()}
+            }
+
+        return {"score_count": len(member_levels), "level_counts": levels, "metrics": metrics}
+
+team_aggregator = TeamBurnoutAggregator()
@@ -1,20 +1,49 @@
 import os
-from typing import Dict, Any
-from google.cloud import aiplatform
-from google.auth.exceptions import DefaultCredentialsError
+import threading
+from typing import Dict, Any, List
 import json
 
+from services.performance_monitor import performance_monitor
+from services.lexicon_sentiment import lexicon_sentiment_engine
+
 class VertexAIService:
     def __init__(self):
         self.project_id = os.getenv("GOOGLE_CLOUD_PROJECT_ID")
         self.location = "us-central1"
         
+        # The client is created on first use; importing google.cloud.aiplatform
+        # alone takes seconds, so it is kept off the import path
+        self._client = None
+        self._client_initialized = False
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        if not self._client_initialized:
+            with self._client_lock:
+                if not self._client_initialized:
+                    self._client = self._create_client()
+                    self._client_initialized = True
+        return self._client
+    
+    def _create_client(self):
+        try:
+            from google.cloud import aiplatform
+            from google.auth.exceptions import DefaultCredentialsError
+        except ImportError:
+            print("google-cloud-aiplatform not installed. Vertex AI service disabled.")
+            return None
+        
         try:
             aiplatform.init(project=self.project_id, location=self.location)
-            self.client = aiplatform.gapic.PredictionServiceClient()
+            return aiplatform.gapic.PredictionServiceClient()
         except DefaultCredentialsError:
             print("Google Cloud credentials not found. Vertex AI service disabled.")
-            self.client = None
+            return None
+    
+    def warm_up(self):
+        """Initialize the client ahead of the first request"""
+        return self.client is not None
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of text using Vertex AI"""
@@ -42,10 +71,11 @@ class VertexAIService:
             instances = [instance]
             
             # Make prediction request
-            response = self.client.predict(
-                endpoint=endpoint,
-                instances=instances
-            )
+            with performance_monitor.time_inference("sentiment"):
+                response = self.client.predict(
+                    endpoint=endpoint,
+                    instances=instances
+                )
             
             # Process response
             predictions = response.predictions
@@ -75,6 +105,33 @@ class VertexAIService:
                 }
             }
     
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze many texts with one prediction request"""
+        if not self.client or not texts:
+            return [self.analyze_sentiment(text) for text in texts]
+        
+        try:
+            endpoint = f"projects/{self.project_id}/locations/{self.location}/endpoints/YOUR_ENDPOINT_ID"
+            with performance_monitor.time_inference("sentiment_batch"):
+                response = self.client.predict(
+                    endpoint=endpoint,
+                    instances=[{"content": text} for text in texts]
+                )
+            
+            predictions = list(response.predictions)
+            if len(predictions) != len(texts):
+                raise ValueError(f"Expected {len(texts)} predictions, got {len(predictions)}")
+            return [{
+                "sentiment_score": prediction.get("sentiment_score", 0.0),
+                "confidence": prediction.get("confidence", 0.0),
+                "emotions": prediction.get("emotions", {})
+            } for prediction in predictions]
+            
+        except Exception as e:
+            print(f"Error analyzing sentiment batch: {str(e)}")
+            # Neutral sentiment on error, without retrying every text one by one
+            return [{"sentiment_score": 0.0, "confidence": 0.5, "emotions": {}} for _ in texts]
+    
     def analyze_stress_indicators(self, text: str) -> Dict[str, Any]:
         """Analyze stress indicators in text"""
         if not self.client:
@@ -90,26 +147,8 @@ class VertexAIService:
         
         try:
             # Use custom model for stress detection
-            # This would be implemented with a custom trained model
-            stress_keywords = [
-                "urgent", "asap", "immediately", "deadline", "rush", "hurry",
-                "stressed", "overwhelmed", "frustrated", "exhausted", "burned out"
-            ]
-            
-            text_lower = text.lower()
-            found_keywords = [keyword for keyword in stress_keywords if keyword in text_lower]
-            
-            # Simple stress level calculation
-            stress_level = min(len(found_keywords) / 5, 1.0)
-            
-            return {
-                "stress_level": stress_level,
-                "indicators": {
-                    "found_keywords": found_keywords,
-                    "keyword_count": len(found_keywords),
-                    "text_length": len(text)
-                }
-            }
+            # This would be implemented with a custom trained model; until then the keyword rules are shared
+            return lexicon_sentiment_engine.stress_indicators(text)
             
         except Exception as e:
             print(f"Error analyzing stress indicators: {str(e)}")
@@ -1,5 +1,5 @@
 from fastapi import WebSocket
-from typing import Dict, Any
+from typing import Dict, Any, List
 import json
 
 class WebSocketManager:
@@ -16,16 +16,23 @@ class WebSocketManager:
     
     async def send_personal_message(self, message: Dict[str, Any], user_id: str):
         if user_id in self.active_connections:
-            await self.active_connections[user_id].send_text(json.dumps(message))
+            await self.active_connections[user_id].send_text(json.dumps(message, default=str))
     
     async def broadcast_message(self, message: Dict[str, Any]):
         for connection in self.active_connections.values():
-            await connection.send_text(json.dumps(message))
+            await connection.send_text(json.dumps(message, default=str))
     
     async def send_burnout_update(self, user_id: str, burnout_data: Dict[str, Any]):
         await self.send_personal_message({
             "type": "burnout_update",
             "data": burnout_data
         }, user_id)
+    
+    async def send_anomaly_alerts(self, user_id: str, anomalies: List[Dict[str, Any]]):
+        for anomaly in anomalies:
+            await self.send_personal_message({
+                "type": "burnout_anomaly",
+                "data": anomaly
+            }, user_id)
 
 websocket_manager = WebSocketManager()
\ No newline at end of file
@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+import os
+from dotenv import load_dotenv
+
+from database.models import WorkSession
+from models.schemas import WorkSessionCreate
+from services.resource_versions import resource_versions
+from services.event_cache import event_cache
+
+load_dotenv()
+
+WORK_SESSION_BATCH_MAX_ITEMS = int(os.getenv("WORK_SESSION_BATCH_MAX_ITEMS", "20000"))
+# Largest request body accepted, checked while it streams in so an oversized one is never buffered whole
+WORK_SESSION_BATCH_MAX_BYTES = int(os.getenv("WORK_SESSION_BATCH_MAX_BYTES", str(10 * 1024 * 1024)))
+# Rows per multi-row INSERT; keeps bind parameters well under driver limits (8 columns per row)
+WORK_SESSION_BATCH_CHUNK_SIZE = int(os.getenv("WORK_SESSION_BATCH_CHUNK_SIZE", "1000"))
+
+DEDUP_COLUMNS = ["user_id", "client_id", "start_time"]
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC, like datetime.utcnow()
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _first_error(error: ValidationError) -> str:
+    detail = error.errors()[0]
+    location = ".".join(str(part) for part in detail["loc"])
+    return f"{location}: {detail['msg']}" if location else detail["msg"]
+
+class WorkSessionIngestService:
+    """Validates and bulk-inserts batches of work sessions with per-item results"""
+
+    def __init__(self, chunk_size: int = WORK_SESSION_BATCH_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def _insert_statement(self, db: Session):
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Batch ingest is not supported on {dialect}")
+        # Rows whose client id already exists are skipped by the database
+        return dialect_insert(WorkSession.__table__).on_conflict_do_nothing(
+            index_elements=DEDUP_COLUMNS
+        ).returning(WorkSession.id, WorkSession.client_id, WorkSession.start_time)
+
+    def validate(self, items: List[Any]) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+        """Split raw items into insertable rows (with their index) and per-item errors"""
+        rows, invalid = [], []
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            try:
+                session = WorkSessionCreate.model_validate(item)
+            except ValidationError as e:
+                invalid.append({"index": index, "status": "invalid", "error": _first_error(e)})
+                continue
+
+            start_time, end_time = _naive_utc(session.start_time), _naive_utc(session.end_time)
+            if end_time < start_time:
+                invalid.append({"index": index, "status": "invalid", "client_id": session.client_id,
+                                "error": "end_time: must not be before start_time"})
+                continue
+
+            rows.append((index, {
+                "client_id": session.client_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration_minutes": int((end_time - start_time).total_seconds() / 60),
+                "activity_type": session.activity_type,
+                "productivity_score": session.productivity_score,
+                "created_at": now,
+            }))
+        return rows, invalid
+
+    def ingest(self, db: Session, user_id: int, items: List[Any]) -> Dict:
+        """Insert a batch and report created, duplicate and invalid items in request order"""
+        rows, results = self.validate(items)
+        statement = self._insert_statement(db)
+
+        # Repeats inside the same batch never reach the database
+        pending: List[Tuple[int, Dict]] = []
+        seen = set()
+        for index, row in rows:
+            key = (row["client_id"], row["start_time"])
+            if row["client_id"] is not None and key in seen:
+                results.append({"index": index, "status": "duplicate", "client_id": row["client_id"]})
+                continue
+            seen.add(key)
+            row["user_id"] = user_id
+            pending.append((index, row))
+
+        created = []
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            # The statement is compiled once and sent as one multi-row INSERT per chunk ("insertmanyvalues")
+            inserted = db.connection().execution_options(insertmanyvalues_page_size=self.chunk_size).execute(
+                statement, [row for _, row in chunk]
+            ).all()
+            ids = {(client_id, start_time): session_id for session_id, client_id, start_time in inserted if client_id is not None}
+
+            for index, row in chunk:
+                client_id = row["client_id"]
+                if client_id is None:
+                    results.append({"index": index, "status": "created"})
+                    created.append(row)
+                    continue
+                session_id = ids.get((client_id, row["start_time"]))
+                if session_id is not None:
+                    created.append(row)
+                results.append({
+                    "index": index,
+                    "status": "created" if session_id is not None else "duplicate",
+                    "client_id": client_id,
+                    "id": session_id,
+                })
+
+        if created:
+            resource_versions.bump(db, user_id, "work_sessions")
+            event_cache.record(db, user_id, "work_sessions", created)
+        db.commit()
+        results.sort(key=lambda result: result["index"])
+        return {
+            "created": sum(1 for result in results if result["status"] == "created"),
+            "duplicates": sum(1 for result in results if result["status"] == "duplicate"),
+            "invalid": sum(1 for result in results if result["status"] == "invalid"),
+            "results": results,
+        }
+
+work_session_ingest = WorkSessionIngestService()
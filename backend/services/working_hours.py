@@ -0,0 +1,202 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import and_, false, func, not_, or_, update
+from sqlalchemy.orm import Session
+
+from database.models import Email, Meeting, WorkingHoursProfile
+from services.resource_versions import resource_versions
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DEFAULT_TIMEZONE = "UTC"
+# Users without a profile get weekdays 08:00-18:00 UTC
+DEFAULT_SCHEDULE = {day: [["08:00", "18:00"]] if day not in ("sat", "sun") else [] for day in WEEKDAYS}
+# Working windows per UPDATE statement; each window binds four parameters, which keeps SQLite under its 999 limit
+RECLASSIFY_CHUNK_WINDOWS = 100
+
+Window = Tuple[datetime, datetime]
+
+def _minutes(value: str) -> int:
+    """Minutes after local midnight for HH:MM; 24:00 is the end of the day"""
+    if value == "24:00":
+        return 24 * 60
+    moment = time.fromisoformat(value)
+    return moment.hour * 60 + moment.minute
+
+def validate_profile(timezone_name: str, schedule: Dict[str, List[List[str]]]):
+    """Raise ValueError describing the first problem with a profile"""
+    try:
+        ZoneInfo(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{timezone_name}'")
+    unknown = set(schedule) - set(WEEKDAYS)
+    if unknown:
+        raise ValueError(f"Unknown weekdays: {', '.join(sorted(unknown))}. Expected: {', '.join(WEEKDAYS)}")
+    for day, ranges in schedule.items():
+        for working_range in ranges:
+            if len(working_range) != 2:
+                raise ValueError(f"Working hours on {day} must be [start, end] pairs")
+            try:
+                start, end = (_minutes(value) for value in working_range)
+            except ValueError:
+                raise ValueError(f"Working hours on {day} must be HH:MM times")
+            if start == end:
+                raise ValueError(f"Working hours on {day} start and end at the same time")
+
+class WorkingHoursService:
+    """Per-user working hours and the after-hours flag on meetings and emails.
+
+    A profile is expanded into its working windows in UTC, one or more per
+    working day, so classification never converts timestamps one by one:
+    ingest batches are bisected against the sorted windows, and
+    reclassification is a handful of UPDATE statements per user whatever
+    the number of rows. A range whose end is before its start runs past
+    midnight into the next day; holidays remove every window starting on
+    that local date.
+    """
+
+    def get_profile(self, db: Session, user_id: int) -> Dict:
+        profile = db.query(WorkingHoursProfile).filter(WorkingHoursProfile.user_id == user_id).first()
+        if profile is None:
+            return {"timezone": DEFAULT_TIMEZONE, "schedule": DEFAULT_SCHEDULE, "holidays": [], "updated_at": None}
+        return {
+            "timezone": profile.timezone,
+            "schedule": profile.schedule,
+            "holidays": [date.fromisoformat(day) for day in profile.holidays or []],
+            "updated_at": profile.updated_at
+        }
+
+    def save_profile(self, db: Session, user_id: int, timezone_name: str, schedule: Dict, holidays: Sequence[date]) -> Dict:
+        """Store the profile and reclassify the user's meetings and emails against it, in one transaction"""
+        validate_profile(timezone_name, schedule)
+        profile = db.query(WorkingHoursProfile).filter(WorkingHoursProfile.user_id == user_id).first()
+        if profile is None:
+            profile = WorkingHoursProfile(user_id=user_id)
+            db.add(profile)
+        profile.timezone = timezone_name
+        profile.schedule = {day: [list(working_range) for working_range in schedule.get(day, [])] for day in WEEKDAYS}
+        profile.holidays = sorted({day.isoformat() for day in holidays})
+        profile.updated_at = datetime.utcnow()
+        db.flush()
+        return self.reclassify(db, user_id)
+
+    def working_windows(self, profile: Dict, start: datetime, end: datetime) -> List[Window]:
+        """Sorted, merged UTC working windows (naive, like the stored timestamps) overlapping [start, end]"""
+        # A day either side covers timezone offsets and ranges that run past midnight
+        by_day = self.windows_by_day(profile, start.date() - timedelta(days=1), end.date() + timedelta(days=1))
+        windows = sorted(window for day_windows in by_day.values() for window in day_windows)
+        merged: List[Window] = []
+        for window_start, window_end in windows:
+            if merged and window_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], window_end))
+            else:
+                merged.append((window_start, window_end))
+        return merged
+
+    def windows_by_day(self, profile: Dict, first_day: date, last_day: date) -> Dict[date, List[Window]]:
+        """Sorted UTC working windows of each local day from first_day to last_day; days off map to an empty list"""
+        holidays = set(profile["holidays"])
+        ranges = {
+            index: [tuple(_minutes(value) for value in working_range) for working_range in profile["schedule"].get(day, [])]
+            for index, day in enumerate(WEEKDAYS)
+        }
+
+        by_day: Dict[date, List[Window]] = {}
+        day = first_day
+        while day <= last_day:
+            windows = []
+            if day not in holidays:
+                for range_start, range_end in ranges[day.weekday()]:
+                    if range_end < range_start:
+                        range_end += 24 * 60
+                    windows.append((self.to_utc(profile, day, range_start), self.to_utc(profile, day, range_end)))
+            by_day[day] = sorted(windows)
+            day += timedelta(days=1)
+        return by_day
+
+    def to_utc(self, profile: Dict, day: date, minutes: int) -> datetime:
+        """Naive UTC time of the local wall-clock time minutes after midnight on day"""
+        local = (datetime.combine(day, time()) + timedelta(minutes=minutes)).replace(tzinfo=ZoneInfo(profile["timezone"]))
+        return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def local_day(self, profile: Dict, timestamp: datetime) -> date:
+        """Calendar day in the user's timezone of a naive UTC timestamp"""
+        return timestamp.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(profile["timezone"])).date()
+
+    def classify(self, db: Session, user_id: int, spans: Sequence[Tuple[datetime, Optional[datetime]]]) -> List[bool]:
+        """After-hours flags for a batch of (start, end) spans in UTC; end is None for instants such as emails.
+
+        A span is within working hours only if it lies entirely inside one working window.
+        """
+        if not spans:
+            return []
+        spans = [(_naive_utc(start), _naive_utc(end) if end is not None else None) for start, end in spans]
+        windows = self.working_windows(
+            self.get_profile(db, user_id),
+            min(start for start, _ in spans),
+            max(end or start for start, end in spans)
+        )
+        starts = [window_start for window_start, _ in windows]
+        flags = []
+        for start, end in spans:
+            index = bisect_right(starts, start) - 1
+            if end is None:
+                inside = index >= 0 and start < windows[index][1]
+            else:
+                inside = index >= 0 and end <= windows[index][1]
+            flags.append(not inside)
+        return flags
+
+    def reclassify(self, db: Session, user_id: int) -> Dict[str, int]:
+        """Rewrite is_after_hours on the user's meetings and emails with set-based UPDATEs; returns rows changed per table.
+
+        Only rows whose flag actually changes are written. The caller commits.
+        """
+        profile = self.get_profile(db, user_id)
+        changed = {
+            "meetings": self._reclassify_table(db, user_id, profile, Meeting, Meeting.start_time, Meeting.end_time),
+            "emails": self._reclassify_table(db, user_id, profile, Email, Email.sent_at, None),
+        }
+        resources = [resource for resource, count in changed.items() if count]
+        if resources:
+            resource_versions.bump(db, user_id, *resources)
+        return changed
+
+    def _reclassify_table(self, db: Session, user_id: int, profile: Dict, model, start_column, end_column) -> int:
+        first, last = db.query(func.min(start_column), func.max(start_column)).filter(model.user_id == user_id).one()
+        if first is None:
+            return 0
+        windows = self.working_windows(profile, first, last)
+
+        # Statements split the timeline between windows, so each row is matched against the windows of its own statement
+        changed = 0
+        chunks = [windows[i:i + RECLASSIFY_CHUNK_WINDOWS] for i in range(0, len(windows), RECLASSIFY_CHUNK_WINDOWS)] or [[]]
+        for index, chunk in enumerate(chunks):
+            conditions = [model.user_id == user_id]
+            if index > 0:
+                conditions.append(start_column >= chunk[0][0])
+            if index < len(chunks) - 1:
+                conditions.append(start_column < chunks[index + 1][0][0])
+
+            if end_column is not None:
+                within = [and_(start_column >= window_start, end_column <= window_end) for window_start, window_end in chunk]
+            else:
+                within = [and_(start_column >= window_start, start_column < window_end) for window_start, window_end in chunk]
+            within_hours = or_(*within) if within else false()
+            result = db.execute(
+                update(model)
+                .where(*conditions, or_(model.is_after_hours.is_(None), model.is_after_hours == within_hours))
+                .values(is_after_hours=not_(within_hours))
+                .execution_options(synchronize_session=False)
+            )
+            changed += result.rowcount
+        return changed
+
+def _naive_utc(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+working_hours = WorkingHoursService()
@@ -0,0 +1,58 @@
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# database.database reads its configuration at import time, so it is set before any app module is imported:
+# a global SQLite database that is also shard 0, plus two more shards
+_data_dir = Path(tempfile.mkdtemp(prefix="burnout-tests-"))
+_urls = [f"sqlite:///{_data_dir / name}.db" for name in ("global", "shard1", "shard2")]
+os.environ["DATABASE_URL"] = _urls[0]
+os.environ["SHARD_DATABASE_URLS"] = ",".join(_urls)
+os.environ["DATABASE_REPLICA_URL"] = ""
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["EVENT_CACHE_ENABLED"] = "false"
+os.environ["SENTIMENT_BACKEND"] = "local"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.database import engine, shard_engines, SessionLocal  # noqa: E402
+from database.models import Base  # noqa: E402
+from services.search_index import search_index  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    for bind in dict.fromkeys([engine, *shard_engines]):
+        Base.metadata.create_all(bind=bind)
+        search_index.ensure(bind)
+    yield
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+_user_numbers = itertools.count()
+
+@pytest.fixture
+def signup(client):
+    """Sign up a fresh user; returns (user_id, auth headers)"""
+    def create():
+        email = f"user-{next(_user_numbers)}@example.com"
+        client.post("/api/auth/signup", json={"email": email, "password": "Passw0rd!x", "full_name": "Test User"})
+        token = client.post("/api/auth/signin", json={"email": email, "password": "Passw0rd!x"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        return client.get("/api/auth/me", headers=headers).json()["id"], headers
+    return create
@@ -0,0 +1,102 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.database import place_new_user
+from database.models import BurnoutBaseline, BurnoutScore, User, SCORE_VERSION
+from services.anomaly_detector import BurnoutAnomalyDetector, ANOMALY_METRICS
+
+def test_first_value_starts_the_baseline():
+    detector = BurnoutAnomalyDetector(alpha=0.1, warmup=3)
+    state = {}
+    assert detector._step(state, "overall_score", 0.4) is None
+    assert state["overall_score"] == {"mean": 0.4, "var": 0.0, "count": 1}
+
+def test_ewma_mean_follows_a_step_change():
+    alpha = 0.2
+    detector = BurnoutAnomalyDetector(alpha=alpha)
+    state = {}
+    detector._step(state, "overall_score", 0.0)
+    for n in range(1, 30):
+        detector._step(state, "overall_score", 1.0)
+        assert state["overall_score"]["mean"] == pytest.approx(1 - (1 - alpha) ** n)
+    # Variance rises with the step, then decays as the mean catches up
+    assert 0 < state["overall_score"]["var"] < 0.01
+
+def test_ewma_variance_of_an_alternating_series():
+    alpha = 0.05
+    detector = BurnoutAnomalyDetector(alpha=alpha)
+    state = {}
+    for i in range(2000):
+        detector._step(state, "overall_score", 0.4 if i % 2 else 0.6)
+    assert state["overall_score"]["mean"] == pytest.approx(0.5, abs=0.01)
+    assert math.sqrt(state["overall_score"]["var"]) == pytest.approx(0.1, rel=0.05)
+
+def test_z_score_waits_for_warmup_and_uses_the_std_floor():
+    detector = BurnoutAnomalyDetector(alpha=0.1, warmup=5, min_std=0.05)
+    state = {}
+    for _ in range(4):
+        assert detector._step(state, "overall_score", 0.2) is None
+    assert detector._step(state, "overall_score", 0.2) is None
+    assert detector._step(state, "overall_score", 0.35) == pytest.approx(3.0)
+
+@pytest.fixture
+def user_id(db):
+    user = User(email=f"anomaly-{datetime.utcnow().timestamp()}@example.com", hashed_password="x")
+    db.add(user)
+    place_new_user(db, user)
+    db.commit()
+    return user.id
+
+def _score(db, detector, user_id, when, value, timeframe_days=7, score_version=SCORE_VERSION):
+    score = BurnoutScore(
+        user_id=user_id, burnout_level="low", timeframe_days=timeframe_days, calculated_at=when, score_version=score_version,
+        **{metric: value for metric in ANOMALY_METRICS}
+    )
+    db.add(score)
+    db.flush()
+    alerts = detector.update(db, user_id, score)
+    db.commit()
+    return alerts
+
+def test_baseline_takes_one_seven_day_score_per_day(db, user_id):
+    detector = BurnoutAnomalyDetector(alpha=0.1, warmup=5, min_std=0.05)
+    start = datetime(2026, 5, 1, 9)
+    for day in range(10):
+        for refresh in range(4):
+            _score(db, detector, user_id, start + timedelta(days=day, hours=refresh), 0.3 + 0.02 * (day % 2))
+        assert _score(db, detector, user_id, start + timedelta(days=day, hours=5), 0.9, timeframe_days=30) == []
+
+    baseline = db.get(BurnoutBaseline, user_id)
+    # Nine completed days are folded in; the tenth is pending
+    assert baseline.state["overall_score"]["count"] == 9
+    assert baseline.pending["day"] == "2026-05-10"
+
+    day = start + timedelta(days=10)
+    alerts = _score(db, detector, user_id, day, 0.8)
+    assert {alert["metric"] for alert in alerts} == set(ANOMALY_METRICS)
+    # The same rise refreshed again that day is not alerted twice
+    assert _score(db, detector, user_id, day + timedelta(hours=1), 0.8) == []
+
+    live = db.get(BurnoutBaseline, user_id).state
+    rebuilt = detector.rebuild_from_history(db, user_id)
+    for metric in ANOMALY_METRICS:
+        assert rebuilt[metric]["count"] == live[metric]["count"] == 10
+        assert rebuilt[metric]["mean"] == pytest.approx(live[metric]["mean"])
+        assert rebuilt[metric]["var"] == pytest.approx(live[metric]["var"])
+
+def test_overall_scores_of_an_older_version_do_not_feed_the_baseline(db, user_id):
+    detector = BurnoutAnomalyDetector(alpha=0.1, warmup=2, min_std=0.05)
+    start = datetime(2026, 6, 1, 9)
+    for day in range(3):
+        _score(db, detector, user_id, start + timedelta(days=day), 0.2, score_version=SCORE_VERSION - 1)
+    alerts = _score(db, detector, user_id, start + timedelta(days=3), 0.9)
+    # The components learned from the old scores; the overall score has no baseline yet
+    assert {alert["metric"] for alert in alerts} == set(ANOMALY_METRICS) - {"overall_score"}
+    assert "overall_score" not in db.get(BurnoutBaseline, user_id).state
+
+    rebuilt = detector.rebuild_from_history(db, user_id)
+    assert "overall_score" not in rebuilt
+    assert rebuilt["work_hours_score"]["count"] == 3
+
@@ -0,0 +1,53 @@
+import random
+from datetime import datetime
+
+from benchmarks.data_generator import PERSONAS, generate, generate_user_events
+from benchmarks.run_benchmarks import compare, time_call
+from database.database import use_user_shard
+from database.models import Email, EmailBody, User, WorkSession
+
+NOW = datetime(2026, 6, 15, 12)
+
+def test_same_seed_generates_the_same_events():
+    first = generate_user_events(random.Random(9), 1, "overworked", 14, NOW)
+    second = generate_user_events(random.Random(9), 1, "overworked", 14, NOW)
+    other = generate_user_events(random.Random(10), 1, "overworked", 14, NOW)
+    assert first == second
+    assert first != other
+
+def test_personas_differ_in_load():
+    hours = {}
+    for persona in PERSONAS:
+        events = generate_user_events(random.Random(1), 1, persona, 60, NOW)
+        hours[persona] = sum(row["duration_minutes"] for row in events["work_sessions"]) / 60
+        assert all(row["start_time"] < NOW for table in ("work_sessions", "meetings") for row in events[table])
+    assert hours["overworked"] > hours["balanced"] > hours["quiet"]
+
+def test_generate_stores_what_it_counts(db):
+    counts = generate(db, users=2, days=5, seed=77)
+    user_ids = [user_id for (user_id,) in db.query(User.id).filter(User.email.like("bench-user-77-%"))]
+    assert counts["users"] == len(user_ids) == 2
+
+    sessions = emails = bodies = 0
+    for user_id in user_ids:
+        use_user_shard(db, user_id)
+        sessions += db.query(WorkSession).filter(WorkSession.user_id == user_id).count()
+        email_ids = [email_id for (email_id,) in db.query(Email.id).filter(Email.user_id == user_id)]
+        emails += len(email_ids)
+        bodies += db.query(EmailBody).filter(EmailBody.email_id.in_(email_ids)).count()
+    assert sessions == counts["work_sessions"]
+    assert emails == bodies == counts["emails"]
+
+def test_compare_flags_only_regressions_past_the_threshold():
+    baseline = {"fast": {"p50_ms": 10.0}, "slow": {"p50_ms": 10.0}, "gone": {"p50_ms": 1.0}}
+    results = {"fast": {"p50_ms": 11.0}, "slow": {"p50_ms": 13.0}, "new": {"p50_ms": 50.0}}
+    regressions = compare(results, baseline, threshold=0.2)
+    assert [regression["benchmark"] for regression in regressions] == ["slow"]
+    assert regressions[0]["change"] == 0.3
+
+def test_time_call_reports_ordered_statistics():
+    calls = []
+    stats = time_call(lambda: calls.append(1), iterations=20, warmup=3)
+    assert len(calls) == 23
+    assert stats["iterations"] == 20
+    assert stats["min_ms"] <= stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
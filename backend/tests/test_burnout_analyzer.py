@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, time
+
+import pytest
+
+from benchmarks.data_generator import generate
+from database.database import use_user_shard
+from database.models import BurnoutScore, Meeting, SCORE_VERSION, User, WorkSession
+from services.burnout_analyzer import burnout_analyzer
+
+COMPONENTS = ["overall_score", "work_hours_score", "sentiment_score", "meeting_load_score", "email_stress_score", "fragmentation_score"]
+
+@pytest.fixture(scope="module")
+def user_ids():
+    from database.database import SessionLocal
+    db = SessionLocal()
+    try:
+        generate(db, users=3, days=100, seed=2026)
+        return [user_id for (user_id,) in db.query(User.id).filter(User.email.like("bench-user-2026-%")).order_by(User.id)]
+    finally:
+        db.close()
+
+def test_prefix_sum_windows_match_separate_scans(db, user_ids):
+    end = datetime.utcnow()
+    for user_id in user_ids:
+        use_user_shard(db, user_id)
+        combined = burnout_analyzer.calculate_window_scores(db, user_id, [7, 30, 90], end)
+        for days in (7, 30, 90):
+            separate = burnout_analyzer.calculate_window_scores(db, user_id, [days], end)[days]
+            assert combined[days]["burnout_level"] == separate["burnout_level"]
+            for component in COMPONENTS:
+                assert combined[days][component] == pytest.approx(separate[component], abs=1e-12)
+
+def test_backfill_matches_live_scores_on_each_day(db, user_ids):
+    user_id = user_ids[0]
+    use_user_shard(db, user_id)
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=40)
+    assert burnout_analyzer.backfill_daily_scores(db, user_id, start, end) == 41
+
+    stored = {
+        score.calculated_at.date(): score
+        for score in db.query(BurnoutScore).filter(BurnoutScore.user_id == user_id, BurnoutScore.is_backfill == True)
+    }
+    for day in (start, start + timedelta(days=13), end - timedelta(days=1)):
+        live = burnout_analyzer.calculate_window_scores(db, user_id, [7], datetime.combine(day, time.max))[7]
+        assert stored[day].timeframe_days == 7
+        for component in COMPONENTS:
+            assert getattr(stored[day], component) == pytest.approx(live[component], abs=1e-9)
+
+def test_backfill_rerun_replaces_its_rows(db, user_ids):
+    user_id = user_ids[2]
+    use_user_shard(db, user_id)
+    end = datetime.utcnow().date() - timedelta(days=50)
+    start = end - timedelta(days=9)
+    burnout_analyzer.backfill_daily_scores(db, user_id, start, end)
+    burnout_analyzer.backfill_daily_scores(db, user_id, start, end)
+    count = db.query(BurnoutScore).filter(BurnoutScore.user_id == user_id, BurnoutScore.is_backfill == True).count()
+    assert count == 10
+
+def test_rows_without_an_end_time_do_not_fail_the_score(db, user_ids):
+    user_id = user_ids[1]
+    use_user_shard(db, user_id)
+    now = datetime.utcnow()
+    db.add(Meeting(user_id=user_id, title="Legacy", start_time=now - timedelta(hours=2), end_time=None, duration_minutes=30))
+    db.add(WorkSession(user_id=user_id, start_time=now - timedelta(hours=3), end_time=None, duration_minutes=45, activity_type="coding"))
+    db.commit()
+
+    result = burnout_analyzer.calculate_burnout_score(db, user_id, 7)
+    assert 0 <= result["overall_score"] <= 1
+    assert result["fragmentation_score"] is not None
+
+def test_fragmentation_is_weighted_into_the_overall_score(db, user_ids):
+    user_id = user_ids[0]
+    use_user_shard(db, user_id)
+    scores = burnout_analyzer.calculate_window_scores(db, user_id, [30], datetime.utcnow())[30]
+    assert scores["fragmentation_score"] > 0
+    assert scores["overall_score"] == pytest.approx(sum(scores[component] for component in COMPONENTS[1:]) / 5)
+
+    result = burnout_analyzer.calculate_burnout_score(db, user_id, 7)
+    stored = db.query(BurnoutScore).filter(BurnoutScore.user_id == user_id, BurnoutScore.is_backfill == False).order_by(BurnoutScore.id.desc()).first()
+    assert stored.score_version == SCORE_VERSION
+    assert stored.overall_score == pytest.approx(result["overall_score"])
+
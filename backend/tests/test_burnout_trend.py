@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, time
+
+import pytest
+
+from database.database import use_user_shard
+from database.models import BurnoutScore
+from services.burnout_analyzer import burnout_analyzer
+
+@pytest.fixture
+def scored_user(db, signup):
+    user_id, headers = signup()
+    use_user_shard(db, user_id)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def add(days_ago, hour, score, timeframe_days=7, is_backfill=False):
+        when = today - timedelta(days=days_ago) + (timedelta(hours=hour) if hour is not None else timedelta(days=1) - timedelta(microseconds=1))
+        db.add(BurnoutScore(user_id=user_id, overall_score=score, burnout_level="low", timeframe_days=timeframe_days,
+                            is_backfill=is_backfill, calculated_at=when))
+
+    # Three days ago: backfill only. Two days ago: live scores beside a backfill and a 30-day score.
+    add(3, None, 0.30, is_backfill=True)
+    add(2, None, 0.90, is_backfill=True)
+    add(2, 9, 0.40)
+    add(2, 10, 0.60)
+    add(2, 11, 0.95, timeframe_days=30)
+    add(1, 12, 0.50, timeframe_days=None)  # from before timeframes were recorded
+    db.commit()
+    return user_id, headers, today
+
+def test_daily_trend_charts_one_seven_day_series(db, scored_user):
+    user_id, _, today = scored_user
+    points = burnout_analyzer.get_daily_burnout_trend(db, user_id, 30)
+    assert [(point["timestamp"], point["count"]) for point in points] == [
+        (today - timedelta(days=3), 1),
+        (today - timedelta(days=2), 2),
+    ]
+    assert points[0]["score"] == pytest.approx(0.30)
+    assert points[1]["score"] == pytest.approx(0.50)
+    assert (points[1]["min_score"], points[1]["max_score"]) == (pytest.approx(0.40), pytest.approx(0.60))
+
+def test_raw_trend_uses_the_same_scores(db, scored_user):
+    user_id, _, today = scored_user
+    points = burnout_analyzer.get_downsampled_burnout_trend(db, user_id, 30, max_points=100)
+    assert [point["score"] for point in points] == [pytest.approx(0.30), pytest.approx(0.40), pytest.approx(0.60)]
+
+def test_trend_endpoint_rejects_unknown_resolutions(client, scored_user):
+    _, headers, _ = scored_user
+    assert client.get("/api/burnout/trend?resolution=raw", headers=headers).json()["resolution"] == "raw"
+    assert client.get("/api/burnout/trend", headers=headers).json()["resolution"] == "daily"
+    assert client.get("/api/burnout/trend?resolution=hourly", headers=headers).status_code == 422
+
+def test_trends_leave_out_older_score_versions(db, scored_user):
+    user_id, _, today = scored_user
+    db.add(BurnoutScore(user_id=user_id, overall_score=0.99, burnout_level="high", timeframe_days=7, score_version=1,
+                        calculated_at=today - timedelta(days=2, hours=-12)))
+    db.commit()
+    assert [point["count"] for point in burnout_analyzer.get_daily_burnout_trend(db, user_id, 30)] == [1, 2]
+    assert 0.99 not in [point["score"] for point in burnout_analyzer.get_downsampled_burnout_trend(db, user_id, 30)]
+
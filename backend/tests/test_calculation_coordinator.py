@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import services.calculation_coordinator as coordinator_module
+from database.database import open_user_session
+from database.models import BurnoutScore
+from services.calculation_coordinator import BurnoutCalculationCoordinator, TokenBucketLimiter
+
+def _result(score=0.4):
+    return {"overall_score": score, "burnout_level": "moderate", "calculated_at": datetime.utcnow(), "anomalies": ["spike"]}
+
+def _fake_analyzer(monkeypatch, delay=0.0):
+    calls = []
+    lock = threading.Lock()
+
+    def calculate(db, user_id, timeframe_days, windows):
+        with lock:
+            calls.append((user_id, timeframe_days, windows))
+        time.sleep(delay)
+        return _result()
+
+    monkeypatch.setattr(coordinator_module.burnout_analyzer, "calculate_burnout_score", calculate)
+    return calls
+
+def test_token_bucket_allows_a_burst_then_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(coordinator_module.time, "monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(rate_per_minute=6, burst=2)
+    assert limiter.allow(1) and limiter.allow(1)
+    assert not limiter.allow(1)
+    assert limiter.allow(2)
+    assert limiter.retry_after(1) == 10
+    now[0] += 10
+    assert limiter.allow(1)
+    assert not limiter.allow(1)
+
+def test_concurrent_calculations_for_one_user_share_a_run(monkeypatch, signup):
+    user_id, _ = signup()
+    calls = _fake_analyzer(monkeypatch, delay=0.2)
+    coordinator = BurnoutCalculationCoordinator()
+
+    async def run():
+        return await asyncio.gather(*(coordinator.calculate(user_id) for _ in range(5)), coordinator.calculate(user_id, 30))
+
+    results = asyncio.run(run())
+    assert len(calls) == 2
+    assert [computed for _, computed in results[:5]].count(True) == 1
+    assert all(data == results[0][0] for data, _ in results[:5])
+    assert results[5][1]
+    assert coordinator._in_flight == {}
+
+    # Once finished, the next request computes again
+    asyncio.run(coordinator.calculate(user_id))
+    assert len(calls) == 3
+
+def test_throttled_calculation_returns_the_latest_result(monkeypatch, signup):
+    user_id, _ = signup()
+    calls = _fake_analyzer(monkeypatch)
+    coordinator = BurnoutCalculationCoordinator(limiter=TokenBucketLimiter(rate_per_minute=0, burst=1))
+
+    data, computed, throttled = asyncio.run(coordinator.calculate_throttled(None, user_id))
+    assert (computed, throttled) == (True, False)
+    assert data["anomalies"] == ["spike"]
+
+    db = open_user_session(user_id)
+    try:
+        latest, computed, throttled = asyncio.run(coordinator.calculate_throttled(db, user_id))
+        assert (computed, throttled) == (False, True)
+        assert len(calls) == 1
+        # The cached result does not re-send anomalies that were already alerted
+        assert latest["overall_score"] == 0.4 and latest["anomalies"] == []
+
+        db.add(BurnoutScore(
+            user_id=user_id, overall_score=0.9, work_hours_score=0.9, sentiment_score=0.9, meeting_load_score=0.9,
+            email_stress_score=0.9, burnout_level="high", timeframe_days=7, calculated_at=datetime.utcnow() + timedelta(minutes=1)
+        ))
+        db.commit()
+        # A newer stored score, e.g. from another worker, wins over this process's cache
+        assert coordinator.latest(db, user_id)["overall_score"] == 0.9
+    finally:
+        db.close()
@@ -0,0 +1,49 @@
+def _session():
+    return {"start_time": "2026-10-18T09:00:00", "end_time": "2026-10-18T10:00:00", "activity_type": "coding"}
+
+def test_unchanged_resource_answers_304_until_a_write(client, signup):
+    _, headers = signup()
+    first = client.get("/api/journal/recent", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get("/api/journal/recent", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.post("/api/journal/", headers=headers, json={"content": "A calm and productive day"})
+    changed = client.get("/api/journal/recent", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 1
+
+def test_validators_depend_on_the_user_and_the_query(client, signup):
+    _, first = signup()
+    _, second = signup()
+    etag = client.get("/api/work-sessions/", headers=first).headers["ETag"]
+    assert client.get("/api/work-sessions/", headers={**second, "If-None-Match": etag}).status_code == 200
+    assert client.get("/api/work-sessions/?timeframe=30d", headers={**first, "If-None-Match": etag}).status_code == 200
+    assert client.get("/api/work-sessions/", headers={**first, "If-None-Match": f"\"other\", {etag}"}).status_code == 304
+
+def test_if_modified_since_is_used_only_without_if_none_match(client, signup):
+    _, headers = signup()
+    client.post("/api/work-sessions/", headers=headers, json=_session())
+    client.get("/api/burnout/metrics", headers=headers)
+    response = client.get("/api/burnout/history", headers=headers)
+    last_modified = response.headers["Last-Modified"]
+
+    assert client.get("/api/burnout/history", headers={**headers, "If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/api/burnout/history", headers={**headers, "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+    assert client.get("/api/burnout/history", headers={**headers, "If-Modified-Since": "not a date"}).status_code == 200
+    # A stale ETag wins over a current date
+    stale = client.get("/api/burnout/history", headers={
+        **headers, "If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified
+    })
+    assert stale.status_code == 200
+
+def test_bulk_writes_bump_the_version(client, signup):
+    _, headers = signup()
+    etag = client.get("/api/work-sessions/patterns", headers=headers).headers["ETag"]
+    client.post("/api/work-sessions/batch", headers=headers, json=[_session()])
+    assert client.get("/api/work-sessions/patterns", headers={**headers, "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import api.dashboard
+import database.database
+
+def test_dashboard_returns_the_selected_panels(client, signup):
+    _, headers = signup()
+    client.post("/api/journal/", headers=headers, json={"content": "Good focus today"})
+    everything = client.get("/api/dashboard/", headers=headers).json()
+    assert set(everything) == set(api.dashboard.DASHBOARD_FIELDS)
+    assert len(everything["journal"]) == 1
+
+    some = client.get("/api/dashboard/?fields=journal,history", headers=headers).json()
+    assert set(some) == {"journal", "history"}
+    assert client.get("/api/dashboard/?fields=journal,nope", headers=headers).status_code == 400
+
+def test_the_users_shard_is_looked_up_once(client, signup, monkeypatch):
+    _, headers = signup()
+    lookups = []
+    original = database.database.use_user_shard
+    monkeypatch.setattr(database.database, "use_user_shard", lambda *args, **kwargs: lookups.append(args) or original(*args, **kwargs))
+    shard_lookups = []
+    monkeypatch.setattr(api.dashboard, "user_shard", lambda user_id: shard_lookups.append(user_id) or database.database.user_shard(user_id))
+
+    fields = "history,patterns,journal,meetings,emails"
+    assert client.get(f"/api/dashboard/?fields={fields}", headers=headers).status_code == 200
+    assert len(shard_lookups) == 1
+    assert lookups == []
+
+def test_panel_queries_share_a_concurrency_cap(client, signup, monkeypatch):
+    _, headers = signup()
+    monkeypatch.setattr(api.dashboard, "_panel_slots", threading.BoundedSemaphore(2))
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    original = api.dashboard.open_user_read_session
+
+    def slow_session(*args):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return original(*args)
+
+    monkeypatch.setattr(api.dashboard, "open_user_read_session", slow_session)
+    fields = "history,patterns,journal,meetings,emails"
+    responses = []
+    requests = [
+        threading.Thread(target=lambda: responses.append(client.get(f"/api/dashboard/?fields={fields}", headers=headers)))
+        for _ in range(3)
+    ]
+    for request in requests:
+        request.start()
+    for request in requests:
+        request.join()
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert peak[0] == 2
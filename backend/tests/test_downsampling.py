@@ -0,0 +1,30 @@
+import math
+
+from services.downsampling import lttb
+
+def test_short_series_is_returned_whole():
+    points = [(x, x * x) for x in range(5)]
+    assert lttb(points, 10) == [0, 1, 2, 3, 4]
+    assert lttb(points[:2], 1) == [0, 1]
+
+def test_keeps_endpoints_and_returns_max_points_in_order():
+    points = [(x, math.sin(x / 7)) for x in range(1000)]
+    indices = lttb(points, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(set(indices))
+
+def test_keeps_isolated_spike():
+    points = [(x, 0.0) for x in range(500)]
+    points[321] = (321, 1.0)
+    assert 321 in lttb(points, 20)
+
+def test_each_point_comes_from_its_own_bucket():
+    n, max_points = 103, 12
+    indices = lttb([(x, (x * 37) % 11) for x in range(n)], max_points)
+    bucket_size = (n - 2) / (max_points - 2)
+    for i, index in enumerate(indices[1:-1]):
+        assert int(i * bucket_size) + 1 <= index < int((i + 1) * bucket_size) + 1
+
+def test_fewer_than_three_points_requested():
+    assert lttb([(x, x) for x in range(10)], 2) == [0, 9]
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.event_cache as event_cache_module
+from database.database import open_user_session
+from database.models import WorkSession
+from services.event_cache import EventCache
+from services.resource_versions import resource_versions
+
+# conftest turns the shared cache off; these tests use their own enabled instance, wired to the commit hook
+@pytest.fixture
+def cache(monkeypatch):
+    cache = EventCache(enabled=True, days=30)
+    monkeypatch.setattr(event_cache_module, "event_cache", cache)
+    return cache
+
+def _write(user_id, cache, start, record=True):
+    """Commit one work session the way the API does; record=False is a write from another process"""
+    db = open_user_session(user_id)
+    try:
+        session = WorkSession(user_id=user_id, start_time=start, end_time=start + timedelta(hours=1),
+                              duration_minutes=60, activity_type="coding")
+        db.add(session)
+        resource_versions.bump(db, user_id, "work_sessions")
+        if record:
+            cache.record(db, user_id, "work_sessions", [session])
+        db.commit()
+    finally:
+        db.close()
+
+def _read(cache, user_id):
+    db = open_user_session(user_id)
+    try:
+        return cache.rows(db, user_id, ("work_sessions",), datetime.utcnow() - timedelta(days=7))["work_sessions"]
+    finally:
+        db.close()
+
+def test_writes_are_appended_in_place_and_foreign_writes_reload(cache, signup):
+    user_id, _ = signup()
+    now = datetime.utcnow().replace(microsecond=0)
+    _write(user_id, cache, now - timedelta(days=2))
+    assert len(_read(cache, user_id)) == 1
+    assert cache.lookups.value(result="miss") == 1
+
+    _write(user_id, cache, now - timedelta(days=1))
+    assert [row[0] for row in _read(cache, user_id)] == [now - timedelta(days=2), now - timedelta(days=1)]
+    assert cache.lookups.value(result="hit") == 1
+
+    _write(user_id, cache, now - timedelta(hours=3), record=False)
+    assert len(_read(cache, user_id)) == 3
+    assert cache.lookups.value(result="miss") == 2
+
+def test_a_commit_during_a_load_is_not_counted_twice(cache, signup, monkeypatch):
+    user_id, _ = signup()
+    now = datetime.utcnow().replace(microsecond=0)
+    _write(user_id, cache, now - timedelta(days=2))
+
+    # The writer commits after the reader read the versions but before it read the rows,
+    # and its after-commit append only runs once the reader has finished loading
+    deferred = []
+    query = cache._query
+
+    def query_with_concurrent_commit(db, user_id_, resource, *args, **kwargs):
+        if resource == "work_sessions" and not deferred:
+            apply = cache._apply
+            cache._apply = lambda *applied: deferred.append(applied)
+            try:
+                _write(user_id, cache, now - timedelta(days=1))
+            finally:
+                cache._apply = apply
+        return query(db, user_id_, resource, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "_query", query_with_concurrent_commit)
+    assert len(_read(cache, user_id)) == 2
+    monkeypatch.setattr(cache, "_query", query)
+
+    cache._apply(*deferred[0])
+    assert len(_read(cache, user_id)) == 2
+    assert len(_read(cache, user_id)) == 2
+
+def test_reads_older_than_the_hot_window_bypass_the_cache(cache, signup):
+    user_id, _ = signup()
+    db = open_user_session(user_id)
+    try:
+        cache.rows(db, user_id, ("work_sessions",), datetime.utcnow() - timedelta(days=90))
+    finally:
+        db.close()
+    assert cache.lookups.value(result="bypass") >= 1
+    assert user_id not in cache._users
+
+def test_least_recently_used_users_are_evicted(cache, signup):
+    first, _ = signup()
+    second, _ = signup()
+    _read(cache, first)
+    cache.max_bytes = cache._bytes + 1
+    _read(cache, second)
+    assert list(cache._users) == [second]
+    assert cache._bytes <= cache.max_bytes
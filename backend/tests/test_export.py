@@ -0,0 +1,87 @@
+import io
+import json
+from datetime import datetime, timedelta
+
+import pyarrow.ipc
+import pyarrow.parquet
+import pytest
+
+from database.database import use_user_shard
+from database.models import Email, EmailBody, WorkSession
+from services.export_service import ExportError, ExportService
+
+START = datetime(2026, 4, 1, 9)
+
+@pytest.fixture
+def exported_user(db, signup):
+    user_id, headers = signup()
+    use_user_shard(db, user_id)
+    for i in range(7):
+        db.add(WorkSession(user_id=user_id, start_time=START + timedelta(days=i), end_time=START + timedelta(days=i, hours=2),
+                           duration_minutes=120, activity_type="coding"))
+        email = Email(user_id=user_id, subject=f"subject {i}", sent_at=START + timedelta(days=i),
+                      stress_indicators={"stress_level": i / 10})
+        db.add(email)
+        db.flush()
+        db.add(EmailBody(email_id=email.id, compressed_body=EmailBody.compress(f"body {i}")))
+    db.commit()
+    return user_id, headers
+
+def _ndjson(blocks):
+    return [json.loads(line) for line in b"".join(blocks).decode().splitlines()]
+
+def test_ndjson_streams_one_block_per_chunk(db, exported_user):
+    user_id, _ = exported_user
+    blocks = list(ExportService(chunk_size=3).export(db, "work_sessions", "ndjson", user_ids=[user_id]))
+    assert len(blocks) == 3
+    rows = _ndjson(blocks)
+    assert [row["start_time"] for row in rows] == [(START + timedelta(days=i)).isoformat() for i in range(7)]
+
+def test_filters_and_projection_are_applied(db, exported_user):
+    user_id, _ = exported_user
+    rows = _ndjson(ExportService().export(
+        db, "emails", "ndjson", user_ids=[user_id], columns=["subject", "stress_indicators"],
+        start_date=START + timedelta(days=2), end_date=START + timedelta(days=4)
+    ))
+    assert rows == [
+        {"subject": "subject 2", "stress_indicators": {"stress_level": 0.2}},
+        {"subject": "subject 3", "stress_indicators": {"stress_level": 0.3}},
+    ]
+
+def test_bodies_are_only_exported_on_request(db, exported_user):
+    user_id, _ = exported_user
+    without = _ndjson(ExportService().export(db, "emails", "ndjson", user_ids=[user_id]))
+    assert "body" not in without[0]
+    with_body = _ndjson(ExportService().export(db, "emails", "ndjson", user_ids=[user_id], include_body=True))
+    assert [row["body"] for row in with_body] == [f"body {i}" for i in range(7)]
+
+def test_parquet_and_arrow_round_trip(db, exported_user):
+    user_id, _ = exported_user
+    service = ExportService(chunk_size=4)
+    parquet = pyarrow.parquet.ParquetFile(io.BytesIO(b"".join(service.export(db, "emails", "parquet", user_ids=[user_id], include_body=True))))
+    assert parquet.num_row_groups == 2
+    table = parquet.read()
+    assert table.num_rows == 7
+    assert table.column("body").to_pylist()[-1] == "body 6"
+    assert json.loads(table.column("stress_indicators").to_pylist()[1]) == {"stress_level": 0.1}
+
+    stream = pyarrow.ipc.open_stream(b"".join(service.export(db, "work_sessions", "arrow", user_ids=[user_id], columns=["duration_minutes"])))
+    assert stream.read_all().column("duration_minutes").to_pylist() == [120] * 7
+
+def test_invalid_requests_fail_before_streaming(db):
+    with pytest.raises(ExportError):
+        ExportService().export(db, "users", "ndjson")
+    with pytest.raises(ExportError):
+        ExportService().export(db, "emails", "ndjson", columns=["hashed_password"])
+    with pytest.raises(ExportError):
+        ExportService().export(db, "emails", "csv")
+
+def test_endpoint_exports_only_the_current_users_rows(client, exported_user, signup):
+    _, headers = exported_user
+    _, other_headers = signup()
+    response = client.get("/api/export/work_sessions", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(response.text.splitlines()) == 7
+    assert client.get("/api/export/work_sessions", headers=other_headers).text == ""
+    assert client.get("/api/export/teams", headers=headers).status_code == 400
@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta
+
+from services.meeting_analytics import context_switches, longest_free_block, merge_intervals, overlap_minutes
+
+T0 = datetime(2026, 3, 2, 9)
+
+def at(minutes: int) -> datetime:
+    return T0 + timedelta(minutes=minutes)
+
+def _random_intervals(rng: random.Random, count: int):
+    intervals = []
+    for _ in range(count):
+        start = rng.randrange(0, 600)
+        intervals.append((at(start), at(start + rng.randrange(1, 120))))
+    return intervals
+
+def _coverage(intervals, minute: int) -> int:
+    """Intervals covering the minute starting at minute"""
+    return sum(1 for start, end in intervals if start <= at(minute) and at(minute + 1) <= end)
+
+def test_merge_intervals_joins_overlapping_and_touching():
+    merged = merge_intervals([(at(60), at(90)), (at(0), at(30)), (at(30), at(45)), (at(70), at(80))])
+    assert merged == [(at(0), at(45)), (at(60), at(90))]
+
+def test_overlap_counts_time_with_two_or_more_meetings_once():
+    assert overlap_minutes([(at(0), at(60)), (at(30), at(90)), (at(40), at(50))]) == 30
+
+def test_back_to_back_meetings_do_not_overlap():
+    assert overlap_minutes([(at(0), at(30)), (at(30), at(60))]) == 0
+
+def test_sweeps_match_a_minute_by_minute_count():
+    rng = random.Random(5)
+    for _ in range(50):
+        intervals = _random_intervals(rng, rng.randrange(1, 12))
+        assert overlap_minutes(intervals) == sum(1 for minute in range(720) if _coverage(intervals, minute) >= 2)
+
+        merged = merge_intervals(intervals)
+        assert all(previous[1] < current[0] for previous, current in zip(merged, merged[1:]))
+        covered = sum((end - start).total_seconds() / 60 for start, end in merged)
+        assert covered == sum(1 for minute in range(720) if _coverage(intervals, minute) >= 1)
+
+        window = (at(120), at(480))
+        free = [minute for minute in range(120, 480) if _coverage(merged, minute) == 0]
+        longest, run = 0, 0
+        for previous, minute in zip([None] + free, free):
+            run = run + 1 if previous == minute - 1 else 1
+            longest = max(longest, run)
+        assert longest_free_block(window, merged, [start for start, _ in merged]) == longest
+
+def test_zero_length_intervals_are_harmless():
+    intervals = [(at(10), at(10)), (at(0), at(20))]
+    assert overlap_minutes(intervals) == 0
+    assert merge_intervals(intervals) == [(at(0), at(20))]
+
+def test_context_switches_between_different_activities_close_together():
+    items = [
+        (at(0), at(60), "coding"),
+        (at(65), at(90), ("meeting", 1)),  # within 15 minutes of the coding block
+        (at(90), at(120), ("meeting", 2)),
+        (at(200), at(260), "coding"),  # after a long break
+        (at(210), at(230), "coding"),  # same activity
+    ]
+    assert context_switches(items) == 2
+
+def test_focus_block_is_cut_by_a_meeting_that_started_earlier():
+    busy = [(at(-60), at(30)), (at(120), at(150))]
+    assert longest_free_block((at(0), at(240)), busy, [start for start, _ in busy]) == 90
+    assert longest_free_block((at(0), at(240)), [], []) == 240
@@ -0,0 +1,52 @@
+import contextvars
+import threading
+
+from sqlalchemy import create_engine, text
+
+from services.performance_monitor import PerformanceMonitor, RequestStats, _request_stats
+
+def test_request_stats_do_not_lose_updates_across_threads():
+    stats = RequestStats()
+    start = threading.Barrier(8)
+
+    def worker():
+        start.wait()
+        for _ in range(20000):
+            stats.record_query(0.001)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats.query_count == 160000
+    assert abs(stats.db_time - 160.0) < 1e-6
+
+def test_queries_in_threadpool_workers_count_towards_the_request():
+    monitor = PerformanceMonitor()
+    engine = create_engine("sqlite://")
+    monitor.instrument_engine(engine)
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        def queries():
+            with engine.connect() as connection:
+                for _ in range(25):
+                    connection.execute(text("SELECT 1"))
+
+        # run_in_threadpool copies the request's context into each worker the same way
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(queries,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        _request_stats.reset(token)
+    assert stats.query_count == 100
+    assert monitor.query_latency.count() == 100
+
+def test_metrics_endpoint_reports_request_latency(client, signup):
+    _, headers = signup()
+    client.get("/api/journal/recent", headers=headers)
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/journal/recent",status="200"}' in body
@@ -0,0 +1,69 @@
+import random
+
+from services.quantile_sketch import KLLSketch
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+def _rank_error(sketch: KLLSketch, values, q: float) -> float:
+    """Distance between q and the true rank of the sketch's q-quantile"""
+    estimate = sketch.quantile(q)
+    rank = sum(1 for value in values if value <= estimate) / len(values)
+    return abs(rank - q)
+
+def test_small_stream_is_exact():
+    sketch = KLLSketch(k=200, seed=1)
+    values = [i / 100 for i in range(100)]
+    for value in reversed(values):
+        sketch.update(value)
+    assert sketch.n == 100
+    assert sketch.quantile(0.5) == 0.49
+    assert sketch.quantile(0) == 0.0 and sketch.quantile(1) == 0.99
+
+def test_empty_sketch_has_no_quantiles():
+    assert KLLSketch().quantile(0.5) is None
+
+def test_rank_error_stays_small_on_a_long_stream():
+    rng = random.Random(7)
+    values = [rng.betavariate(2, 5) for _ in range(50000)]
+    sketch = KLLSketch(k=200, seed=7)
+    for value in values:
+        sketch.update(value)
+    assert sketch.n == len(values)
+    assert sum(len(items) for items in sketch.compactors) < 1000
+    assert max(_rank_error(sketch, values, q) for q in QUANTILES) < 0.02
+
+def test_merge_matches_one_sketch_over_all_values():
+    rng = random.Random(11)
+    parts = [[rng.random() ** (part + 1) for _ in range(8000)] for part in range(4)]
+    merged = KLLSketch(k=200, seed=0)
+    for part_index, part in enumerate(parts):
+        sketch = KLLSketch(k=200, seed=part_index)
+        for value in part:
+            sketch.update(value)
+        merged.merge(sketch)
+
+    values = [value for part in parts for value in part]
+    assert merged.n == len(values)
+    assert merged.min_value == min(values) and merged.max_value == max(values)
+    assert max(_rank_error(merged, values, q) for q in QUANTILES) < 0.03
+
+def test_serialized_sketch_round_trips():
+    sketch = KLLSketch(k=50, seed=3)
+    for i in range(1000):
+        sketch.update((i * 7919 % 1000) / 1000)
+    restored = KLLSketch.from_dict(sketch.to_dict())
+    assert restored.n == sketch.n and restored.k == 50
+    for q in QUANTILES:
+        assert abs(restored.quantile(q) - sketch.quantile(q)) < 1e-4
+
+def test_discard_removes_only_uncompacted_values():
+    sketch = KLLSketch(k=8, seed=3)
+    for value in range(20):
+        sketch.update(value / 100)
+    sketch.update(0.5)
+    assert sketch.discard(0.5)
+    assert sketch.n == 20
+    compacted = sketch.compactors[-1][0]
+    assert compacted not in sketch.compactors[0]
+    assert not sketch.discard(compacted)
+    assert sketch.n == 20
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+
+import pytest
+
+from database.database import engine
+from services.scheduler import BurnoutScheduler, LeaderLock, is_due, jitter_offset
+
+def test_jitter_offset_is_stable_and_inside_the_interval():
+    offsets = [jitter_offset("recalculate", user_id, 3600) for user_id in range(2000)]
+    assert offsets == [jitter_offset("recalculate", user_id, 3600) for user_id in range(2000)]
+    assert all(0 <= offset < 3600 for offset in offsets)
+    assert jitter_offset("recalculate", 1, 3600) != jitter_offset("sync", 1, 3600)
+
+def test_jitter_offsets_spread_over_the_interval():
+    buckets = [0] * 10
+    for user_id in range(5000):
+        buckets[int(jitter_offset("recalculate", user_id, 3600) // 360)] += 1
+    assert min(buckets) > 400 and max(buckets) < 600
+
+def test_window_is_open_at_the_start_and_closed_at_the_end():
+    assert is_due(100, 3600, 99, 100)
+    assert not is_due(100, 3600, 100, 101)
+    assert is_due(100, 3600, 3699, 3700)
+    assert not is_due(100, 3600, 101, 3699)
+
+def test_every_slot_is_due_exactly_once_across_consecutive_ticks():
+    interval, offset = 60.0, 17.3
+    ticks = [0.0]
+    step = 7.0
+    while ticks[-1] < 10 * interval:
+        # Uneven ticks, as when the loop runs late
+        ticks.append(ticks[-1] + step)
+        step = 3.0 if step == 7.0 else 11.5
+    due = [end for start, end in zip(ticks, ticks[1:]) if is_due(offset, interval, start, end)]
+    assert len(due) == int((ticks[-1] - offset) // interval) + 1
+    for end in due:
+        slot = offset + ((end - offset) // interval) * interval
+        assert end - slot < 11.5
+
+def test_a_long_gap_is_due_once():
+    assert is_due(0, 60, 0, 600)
+
+def test_scheduler_refuses_several_workers_without_advisory_locks():
+    assert engine.dialect.name == "sqlite"
+    with pytest.raises(RuntimeError):
+        BurnoutScheduler(lock=LeaderLock(engine), workers=2).start()
+
+def test_failed_jobs_are_logged_with_their_traceback(caplog):
+    scheduler = BurnoutScheduler(lock=LeaderLock(engine), workers=1)
+
+    async def failing(user_id):
+        raise ValueError("sync broke")
+
+    async def run():
+        scheduler._semaphore = asyncio.Semaphore(1)
+        await scheduler._run_job("sync", failing, 42)
+
+    before = scheduler.job_runs.value(job="sync", outcome="error")
+    with caplog.at_level(logging.ERROR, logger="services.scheduler"):
+        asyncio.run(run())
+    assert scheduler.job_runs.value(job="sync", outcome="error") == before + 1
+    record = caplog.records[-1]
+    assert record.getMessage() == "Scheduled sync failed for user 42"
+    assert record.exc_info[0] is ValueError
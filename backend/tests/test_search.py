@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from database.database import open_user_session
+from database.models import Email
+
+def _journal(client, headers, *contents):
+    for content in contents:
+        client.post("/api/journal/", headers=headers, json={"content": content})
+
+def _emails(user_id, *subjects):
+    db = open_user_session(user_id)
+    try:
+        now = datetime.utcnow()
+        db.add_all([
+            Email(user_id=user_id, subject=subject, sent_at=now - timedelta(minutes=index))
+            for index, subject in enumerate(subjects)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def _search(client, headers, **params):
+    response = client.get("/api/search/", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_search_finds_journal_entries_and_email_subjects(client, signup):
+    user_id, headers = signup()
+    _journal(client, headers, "Deploying the billing service went smoothly", "Lunch with the team")
+    _emails(user_id, "Billing outage postmortem", "Weekly newsletter")
+
+    results = _search(client, headers, q="billing")["results"]
+    assert sorted(result["type"] for result in results) == ["email", "journal"]
+    assert all("billing" in result["snippet"].lower() for result in results)
+    assert [result["type"] for result in _search(client, headers, q="billing", types="email")["results"]] == ["email"]
+
+def test_words_are_stemmed_and_anded(client, signup):
+    _, headers = signup()
+    _journal(client, headers, "Deployed the release on Friday", "Deployment review on Monday")
+    assert len(_search(client, headers, q="deploy")["results"]) >= 1
+    assert len(_search(client, headers, q="deployed friday")["results"]) == 1
+    assert _search(client, headers, q="deployed tuesday")["results"] == []
+
+def test_query_syntax_is_treated_as_plain_words(client, signup):
+    _, headers = signup()
+    _journal(client, headers, "Meeting NOT cancelled")
+    for query in ['"unbalanced', "NOT OR AND", "col:umn*", "()"]:
+        _search(client, headers, q=query)
+    assert _search(client, headers, q="!!!")["results"] == []
+
+def test_results_are_private_and_paged(client, signup):
+    _, first = signup()
+    _, second = signup()
+    _journal(client, first, *[f"Retrospective notes {index}" for index in range(5)])
+    assert _search(client, second, q="retrospective")["results"] == []
+
+    page = _search(client, first, q="retrospective", limit=2)
+    assert len(page["results"]) == 2 and page["next_offset"] == 2
+    last = _search(client, first, q="retrospective", limit=2, offset=4)
+    assert len(last["results"]) == 1 and last["next_offset"] is None
+    ids = {result["id"] for offset in (0, 2, 4) for result in _search(client, first, q="retrospective", limit=2, offset=offset)["results"]}
+    assert len(ids) == 5
+
+def test_unknown_types_are_rejected(client, signup):
+    _, headers = signup()
+    assert client.get("/api/search/", headers=headers, params={"q": "x", "types": "calendar"}).status_code == 400
@@ -0,0 +1,68 @@
+import pytest
+
+from services.lexicon_sentiment import LexiconSentimentEngine
+from services.sentiment_backend import LocalSentimentBackend, SentimentBackend, create_sentiment_backend
+
+engine = LexiconSentimentEngine()
+
+def _score(text):
+    return engine.analyze(text)["sentiment_score"]
+
+def test_polarity_of_plain_sentences():
+    assert _score("Great day, I feel productive and happy") > 0.5
+    assert _score("Exhausted, stressed and overwhelmed by the deadline") < -0.5
+    assert _score("The meeting is at noon") == 0.0
+
+def test_negation_flips_the_following_words():
+    assert _score("This is good") > 0 > _score("This is not good")
+    assert _score("not bad at all") > 0
+    # Three tokens away is still negated, four is not
+    assert _score("never really that good") < 0
+    assert _score("never mind the rest, good") > 0
+
+def test_phrases_are_scored_as_a_unit():
+    assert _score("I am burned out") < _score("I am burned")
+    assert _score("well done everyone") > _score("well everyone")
+    assert _score("back to back meetings") < 0
+
+def test_a_phrase_opened_by_a_negator_does_not_negate_what_follows():
+    assert _score("no worries, great job") > 0.5
+    assert _score("no worries, great job") > _score("no worries")
+    assert _score("no great job") < 0
+
+def test_boosters_and_but():
+    assert _score("very good") > _score("good") > _score("slightly good")
+    assert _score("The start was bad but the end was great") > 0
+    assert _score("Wow!!!") == 0.0
+    assert _score("good!!!") > _score("good")
+
+def test_emotions_skip_negated_words():
+    emotions = engine.analyze("I am not happy today, and very tired")["emotions"]
+    assert emotions["joy"] == 0.0
+    assert emotions["sadness"] == 1.0
+
+def test_batch_matches_single_analysis():
+    texts = ["no worries, great job", "so frustrated with this outage", ""]
+    assert engine.analyze_batch(texts) == [engine.analyze(text) for text in texts]
+
+def test_stress_indicators_count_distinct_keywords():
+    result = engine.stress_indicators("URGENT: need this asap, deadline is today, urgent!")
+    assert result["indicators"]["found_keywords"] == ["urgent", "asap", "deadline"]
+    assert result["stress_level"] == 0.6
+
+def test_backends_implement_the_interface():
+    with pytest.raises(TypeError):
+        SentimentBackend()
+
+    class Partial(SentimentBackend):
+        def analyze_sentiment_batch(self, texts):
+            return [{} for _ in texts]
+
+    with pytest.raises(TypeError):
+        Partial()
+
+    local = create_sentiment_backend("local")
+    assert isinstance(local, LocalSentimentBackend)
+    assert local.analyze_sentiment("great job") == engine.analyze("great job")
+    with pytest.raises(ValueError):
+        create_sentiment_backend("nope")
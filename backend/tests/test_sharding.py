@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+import database.database as database
+from database.database import SessionLocal, place_new_user, shard_for_user_id, use_shard, use_user_shard
+from database.models import (
+    BurnoutBaseline, BurnoutScore, Email, EmailBody, JournalEntry, ResourceVersion, User
+)
+from scripts.rebalance_shard import move_user
+
+def _shards(monkeypatch, count: int):
+    monkeypatch.setattr(database, "shard_engines", [database.engine] * count)
+
+def test_jump_hash_spreads_users_evenly(monkeypatch):
+    _shards(monkeypatch, 4)
+    counts = Counter(shard_for_user_id(user_id) for user_id in range(20000))
+    assert set(counts) == {0, 1, 2, 3}
+    assert all(4500 < count < 5500 for count in counts.values())
+
+def test_adding_a_shard_only_moves_users_onto_it(monkeypatch):
+    _shards(monkeypatch, 3)
+    before = {user_id: shard_for_user_id(user_id) for user_id in range(20000)}
+    _shards(monkeypatch, 4)
+    after = {user_id: shard_for_user_id(user_id) for user_id in range(20000)}
+
+    moved = [user_id for user_id in before if before[user_id] != after[user_id]]
+    assert all(after[user_id] == 3 for user_id in moved)
+    assert len(moved) / len(before) == pytest.approx(1 / 4, abs=0.02)
+
+def test_unsharded_users_all_live_on_shard_zero(monkeypatch):
+    _shards(monkeypatch, 0)
+    assert {shard_for_user_id(user_id) for user_id in range(100)} == {0}
+
+def _counts(shard: int, user_id: int):
+    db = use_shard(SessionLocal(), shard)
+    try:
+        email_ids = [email_id for (email_id,) in db.query(Email.id).filter(Email.user_id == user_id)]
+        return {
+            "journal_entries": db.query(JournalEntry).filter(JournalEntry.user_id == user_id).count(),
+            "emails": len(email_ids),
+            "email_bodies": db.query(EmailBody).filter(EmailBody.email_id.in_(email_ids)).count(),
+            "burnout_scores": db.query(BurnoutScore).filter(BurnoutScore.user_id == user_id).count(),
+            "burnout_baselines": db.query(BurnoutBaseline).filter(BurnoutBaseline.user_id == user_id).count(),
+        }
+    finally:
+        db.close()
+
+def test_rebalance_round_trip_keeps_every_row():
+    db = SessionLocal()
+    user = User(email="rebalance@example.com", hashed_password="x")
+    db.add(user)
+    place_new_user(db, user)
+    user_id, home = user.id, user.shard
+
+    now = datetime.utcnow()
+    db.add_all([JournalEntry(user_id=user_id, content=f"entry {i}", sentiment_score=0.1 * i) for i in range(3)])
+    for i in range(5):
+        email = Email(user_id=user_id, subject=f"subject {i}", sent_at=now - timedelta(hours=i))
+        db.add(email)
+        db.flush()
+        db.add(EmailBody(email_id=email.id, compressed_body=EmailBody.compress(f"body {i}")))
+    scores = [BurnoutScore(user_id=user_id, overall_score=0.1 * i, burnout_level="low", timeframe_days=7,
+                           calculated_at=now - timedelta(days=i)) for i in range(4)]
+    db.add_all(scores)
+    db.flush()
+    db.add(BurnoutBaseline(user_id=user_id, state={}, last_score_id=scores[0].id))
+    db.commit()
+    db.close()
+
+    expected = _counts(home, user_id)
+    assert expected == {"journal_entries": 3, "emails": 5, "email_bodies": 5, "burnout_scores": 4, "burnout_baselines": 1}
+
+    target = (home + 1) % database.shard_count()
+    copied = move_user(user_id, target, grace_seconds=0, chunk_size=2)
+    assert copied["email_bodies"] == 5 and copied["burnout_scores"] == 4
+    assert _counts(target, user_id) == expected
+    assert _counts(home, user_id) == dict.fromkeys(expected, 0)
+
+    db = SessionLocal()
+    try:
+        moved = db.get(User, user_id)
+        assert (moved.shard, moved.shard_locked) == (target, False)
+        use_user_shard(db, user_id)
+        # Surrogate ids change on the target; references between the user's rows follow them
+        baseline = db.get(BurnoutBaseline, user_id)
+        newest = db.query(BurnoutScore).filter(BurnoutScore.user_id == user_id).order_by(BurnoutScore.calculated_at.desc()).first()
+        assert baseline.last_score_id == newest.id
+        bodies = {email.subject: EmailBody.decompress(body.compressed_body) for email, body in
+                  db.query(Email, EmailBody).join(EmailBody, EmailBody.email_id == Email.id).filter(Email.user_id == user_id)}
+        assert bodies == {f"subject {i}": f"body {i}" for i in range(5)}
+        assert db.query(ResourceVersion).filter(ResourceVersion.user_id == user_id).count() > 0
+    finally:
+        db.close()
+
+    move_user(user_id, home, grace_seconds=0, chunk_size=100)
+    assert _counts(home, user_id) == expected
+    assert _counts(target, user_id) == dict.fromkeys(expected, 0)
+
+def test_locked_user_cannot_be_routed_for_writes(db):
+    user = User(email="locked@example.com", hashed_password="x", shard_locked=True)
+    db.add(user)
+    place_new_user(db, user)
+    db.commit()
+    with pytest.raises(database.UserShardLocked):
+        use_user_shard(db, user.id)
+    assert use_user_shard(db, user.id, allow_locked=True).info["shard"] == user.shard
@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from database.models import Team, TeamBurnoutSketch, TeamMemberScore, User
+from services.team_aggregator import SKETCH_METRICS, TeamBurnoutAggregator
+
+def _team(db, size):
+    team = Team(name="team", organization=f"org-{uuid.uuid4().hex}")
+    db.add(team)
+    db.flush()
+    users = [User(email=f"{uuid.uuid4().hex}@example.com", team_id=team.id) for _ in range(size)]
+    db.add_all(users)
+    db.flush()
+    return team, [user.id for user in users]
+
+def _score(overall, level="moderate", days_ago=0):
+    return SimpleNamespace(
+        timeframe_days=7,
+        calculated_at=datetime.utcnow() - timedelta(days=days_ago),
+        burnout_level=level,
+        **{metric: overall for metric in SKETCH_METRICS}
+    )
+
+def _day_row(db, team_id):
+    return db.query(TeamBurnoutSketch).filter(TeamBurnoutSketch.team_id == team_id).one()
+
+def test_a_later_score_replaces_the_members_value_for_the_day(db):
+    aggregator = TeamBurnoutAggregator()
+    team, (first, second) = _team(db, 2)
+    aggregator.record_score(db, first, _score(0.2, "low"))
+    aggregator.record_score(db, second, _score(0.6))
+    aggregator.record_score(db, first, _score(0.9, "high"))
+
+    row = _day_row(db, team.id)
+    assert row.score_count == 2
+    assert row.level_counts == {"low": 0, "moderate": 1, "high": 1}
+    assert abs(row.metric_sums["overall_score"] - 1.5) < 1e-9
+    assert row.metric_counts["overall_score"] == 2
+    assert row.sketches["overall_score"]["n"] == 2
+    assert db.query(TeamMemberScore).filter(TeamMemberScore.team_id == team.id).count() == 2
+
+    distribution = aggregator.get_distribution(db, [team.id])
+    assert distribution["score_count"] == 2
+    assert abs(distribution["metrics"]["overall_score"]["mean"] - 0.75) < 1e-9
+    assert distribution["metrics"]["overall_score"]["p99"] == 0.9
+
+def test_compacted_replacements_trigger_a_rebuild_that_keeps_the_sketch_exact(db):
+    aggregator = TeamBurnoutAggregator(sketch_k=8, stale_rebuild_fraction=0.1)
+    team, members = _team(db, 40)
+    for index, user_id in enumerate(members):
+        aggregator.record_score(db, user_id, _score(index / 100))
+    for index, user_id in enumerate(members):
+        aggregator.record_score(db, user_id, _score(0.5 + index / 100))
+        assert _day_row(db, team.id).stale_count <= 4
+
+    row = _day_row(db, team.id)
+    values = [0.5 + index / 100 for index in range(40)]
+    assert row.score_count == 40
+    assert abs(row.metric_sums["overall_score"] - sum(values)) < 1e-9
+    # Replaced values only linger below the rebuild threshold
+    assert row.sketches["overall_score"]["n"] - row.stale_count == 40
+    assert aggregator.get_distribution(db, [team.id])["metrics"]["overall_score"]["p50"] >= 0.5
+
+def test_members_are_counted_once_at_their_latest_day(db):
+    aggregator = TeamBurnoutAggregator()
+    team, (first, second) = _team(db, 2)
+    aggregator.record_score(db, first, _score(0.8, "high", days_ago=3))
+    aggregator.record_score(db, first, _score(0.2, "low", days_ago=1))
+    aggregator.record_score(db, second, _score(0.5, "moderate", days_ago=2))
+
+    distribution = aggregator.get_distribution(db, [team.id])
+    assert distribution["score_count"] == 2
+    assert distribution["level_counts"] == {"low": 1, "moderate": 1, "high": 0}
+    # The metrics still describe every member-day in the window
+    assert abs(distribution["metrics"]["overall_score"]["mean"] - 0.5) < 1e-9
+
+    other, (third,) = _team(db, 1)
+    aggregator.record_score(db, third, _score(0.9, "high"))
+    per_team = aggregator.get_team_distributions(db, [team.id, other.id])
+    assert per_team[team.id]["level_counts"] == {"low": 1, "moderate": 1, "high": 0}
+    assert per_team[other.id]["score_count"] == 1
+    assert aggregator.get_distribution(db, [team.id, other.id])["score_count"] == 3
+
+def test_scores_outside_teams_and_timeframes_are_ignored(db):
+    aggregator = TeamBurnoutAggregator()
+    team, (member,) = _team(db, 1)
+    aggregator.record_score(db, member, SimpleNamespace(**{**vars(_score(0.4)), "timeframe_days": 30}))
+    assert db.query(TeamBurnoutSketch).filter(TeamBurnoutSketch.team_id == team.id).count() == 0
+    loner = User(email=f"{uuid.uuid4().hex}@example.com")
+    db.add(loner)
+    db.flush()
+    aggregator.record_score(db, loner.id, _score(0.4))
+    assert aggregator.get_distribution(db, [])["score_count"] == 0
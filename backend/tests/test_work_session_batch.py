@@ -0,0 +1,66 @@
+import json
+
+import api.work_sessions
+
+def _sessions(count, prefix="s"):
+    return [
+        {
+            "start_time": f"2026-10-01T{9 + index % 8:02d}:{index % 60:02d}:00",
+            "end_time": f"2026-10-01T{10 + index % 8:02d}:{index % 60:02d}:00",
+            "activity_type": "coding",
+            "client_id": f"{prefix}-{index}",
+        }
+        for index in range(count)
+    ]
+
+def test_json_array_batch_reports_created_duplicate_and_invalid(client, signup):
+    _, headers = signup()
+    first = client.post("/api/work-sessions/batch", headers=headers, json=_sessions(3)).json()
+    assert (first["created"], first["duplicates"], first["invalid"]) == (3, 0, 0)
+
+    retry = client.post("/api/work-sessions/batch", headers=headers, json=_sessions(3) + [{"activity_type": "coding"}]).json()
+    assert (retry["created"], retry["duplicates"], retry["invalid"]) == (0, 3, 1)
+    assert [result["status"] for result in retry["results"]] == ["duplicate"] * 3 + ["invalid"]
+
+def test_ndjson_batch_is_read_as_a_stream(client, signup):
+    _, headers = signup()
+    body = "\n".join(json.dumps(item) for item in _sessions(5)) + "\n"
+    response = client.post(
+        "/api/work-sessions/batch", headers={**headers, "Content-Type": "application/x-ndjson"}, content=body
+    )
+    assert response.json()["created"] == 5
+
+def test_oversized_bodies_are_refused(client, signup, monkeypatch):
+    _, headers = signup()
+    monkeypatch.setattr(api.work_sessions, "WORK_SESSION_BATCH_MAX_BYTES", 1000)
+    body = json.dumps(_sessions(20))
+    assert len(body) > 1000
+    assert client.post("/api/work-sessions/batch", headers=headers, content=body).status_code == 413
+
+    # Without Content-Length the limit still applies to the bytes that arrive
+    def chunks():
+        for index in range(0, len(body), 100):
+            yield body[index:index + 100].encode()
+    assert client.post("/api/work-sessions/batch", headers=headers, content=chunks()).status_code == 413
+
+    ndjson = "\n".join(json.dumps(item) for item in _sessions(20))
+    response = client.post(
+        "/api/work-sessions/batch", headers={**headers, "Content-Type": "application/x-ndjson"}, content=ndjson
+    )
+    assert response.status_code == 413
+
+def test_too_many_sessions_are_refused_in_both_formats(client, signup, monkeypatch):
+    _, headers = signup()
+    monkeypatch.setattr(api.work_sessions, "WORK_SESSION_BATCH_MAX_ITEMS", 4)
+    assert client.post("/api/work-sessions/batch", headers=headers, json=_sessions(5)).status_code == 413
+    ndjson = "\n".join(json.dumps(item) for item in _sessions(5))
+    response = client.post(
+        "/api/work-sessions/batch", headers={**headers, "Content-Type": "application/x-ndjson"}, content=ndjson
+    )
+    assert response.status_code == 413
+    assert client.post("/api/work-sessions/batch", headers=headers, json=_sessions(4)).json()["created"] == 4
+
+def test_malformed_bodies_are_rejected(client, signup):
+    _, headers = signup()
+    assert client.post("/api/work-sessions/batch", headers=headers, content="{not json").status_code == 400
+    assert client.post("/api/work-sessions/batch", headers=headers, json={"start_time": "x"}).status_code == 400
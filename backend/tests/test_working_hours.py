@@ -0,0 +1,100 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import services.working_hours as working_hours_module
+from database.database import open_user_session
+from database.models import Email, Meeting
+from services.working_hours import DEFAULT_SCHEDULE, WEEKDAYS, validate_profile, working_hours
+
+def _profile(timezone="UTC", holidays=(), **schedule):
+    return {"timezone": timezone, "schedule": {day: schedule.get(day, []) for day in WEEKDAYS}, "holidays": list(holidays)}
+
+def test_invalid_profiles_are_described():
+    with pytest.raises(ValueError, match="timezone"):
+        validate_profile("Mars/Olympus", DEFAULT_SCHEDULE)
+    with pytest.raises(ValueError, match="weekdays"):
+        validate_profile("UTC", {"monday": [["09:00", "17:00"]]})
+    with pytest.raises(ValueError, match="HH:MM"):
+        validate_profile("UTC", {"mon": [["9am", "5pm"]]})
+    with pytest.raises(ValueError, match="same time"):
+        validate_profile("UTC", {"mon": [["09:00", "09:00"]]})
+    validate_profile("Europe/Berlin", {"mon": [["22:00", "06:00"]], "tue": [["00:00", "24:00"]]})
+
+def test_windows_follow_daylight_saving_time():
+    profile = _profile("America/New_York", sun=[["09:00", "17:00"]], mon=[["09:00", "17:00"]])
+    # Clocks go forward on Sunday 2026-03-08
+    by_day = working_hours.windows_by_day(profile, date(2026, 3, 1), date(2026, 3, 9))
+    assert by_day[date(2026, 3, 2)] == [(datetime(2026, 3, 2, 14), datetime(2026, 3, 2, 22))]
+    assert by_day[date(2026, 3, 8)] == [(datetime(2026, 3, 8, 13), datetime(2026, 3, 8, 21))]
+    assert by_day[date(2026, 3, 3)] == []
+
+def test_overnight_ranges_and_holidays():
+    profile = _profile("UTC", holidays=[date(2026, 10, 21)], mon=[["22:00", "06:00"]], wed=[["09:00", "17:00"]])
+    by_day = working_hours.windows_by_day(profile, date(2026, 10, 19), date(2026, 10, 21))
+    assert by_day[date(2026, 10, 19)] == [(datetime(2026, 10, 19, 22), datetime(2026, 10, 20, 6))]
+    assert by_day[date(2026, 10, 21)] == []
+
+def test_adjacent_windows_merge_across_midnight():
+    profile = _profile("UTC", mon=[["18:00", "24:00"]], tue=[["00:00", "02:00"]])
+    windows = working_hours.working_windows(profile, datetime(2026, 10, 19), datetime(2026, 10, 20))
+    assert windows == [(datetime(2026, 10, 19, 18), datetime(2026, 10, 20, 2))]
+
+def test_classification_needs_the_whole_span_inside_one_window(db, signup):
+    user_id, _ = signup()
+    db = open_user_session(user_id)
+    try:
+        # 2026-10-19 is a Monday; the default profile works 08:00-18:00 UTC
+        flags = working_hours.classify(db, user_id, [
+            (datetime(2026, 10, 19, 9), datetime(2026, 10, 19, 10)),
+            (datetime(2026, 10, 19, 17, 30), datetime(2026, 10, 19, 18, 30)),
+            (datetime(2026, 10, 19, 7), None),
+            (datetime(2026, 10, 19, 18), None),
+            (datetime(2026, 10, 19, 17, 59), None),
+            (datetime(2026, 10, 18, 12), None),
+        ])
+        assert flags == [False, True, True, True, False, True]
+        assert working_hours.classify(db, user_id, []) == []
+    finally:
+        db.close()
+
+def test_reclassify_matches_classify_and_only_writes_changes(signup, monkeypatch):
+    user_id, _ = signup()
+    monkeypatch.setattr(working_hours_module, "RECLASSIFY_CHUNK_WINDOWS", 3)
+    rng = random.Random(45)
+    db = open_user_session(user_id)
+    try:
+        base = datetime(2026, 9, 1)
+        meetings, emails = [], []
+        for _ in range(150):
+            start = base + timedelta(minutes=rng.randrange(0, 40 * 24 * 60, 15))
+            meetings.append(Meeting(user_id=user_id, title="m", start_time=start, end_time=start + timedelta(minutes=rng.choice([15, 30, 60, 120]))))
+            emails.append(Email(user_id=user_id, subject="e", sent_at=base + timedelta(minutes=rng.randrange(0, 40 * 24 * 60))))
+        db.add_all(meetings + emails)
+        db.commit()
+
+        schedule = {"mon": [["09:00", "17:00"]], "tue": [["22:00", "04:00"]], "thu": [["07:30", "12:00"], ["13:00", "19:00"]]}
+        first = working_hours.save_profile(db, user_id, "Asia/Kolkata", schedule, [date(2026, 9, 14)])
+        db.commit()
+
+        expected = working_hours.classify(db, user_id, [(m.start_time, m.end_time) for m in meetings] + [(e.sent_at, None) for e in emails])
+        # Rows were stored as within hours, so exactly the after-hours ones are rewritten
+        assert first == {"meetings": sum(expected[:150]), "emails": sum(expected[150:])}
+        db.expire_all()
+        assert [m.is_after_hours for m in meetings] + [e.is_after_hours for e in emails] == expected
+
+        # Saving the same profile again changes nothing
+        assert working_hours.save_profile(db, user_id, "Asia/Kolkata", schedule, [date(2026, 9, 14)]) == {"meetings": 0, "emails": 0}
+        db.rollback()
+    finally:
+        db.close()
+
+def test_working_hours_endpoint_rejects_bad_profiles(client, signup):
+    _, headers = signup()
+    assert client.get("/api/working-hours/", headers=headers).json()["timezone"] == "UTC"
+    bad = client.put("/api/working-hours/", headers=headers, json={"timezone": "Nowhere/City", "schedule": {}})
+    assert bad.status_code == 400
+    saved = client.put("/api/working-hours/", headers=headers, json={"timezone": "Europe/Berlin", "schedule": {"fri": [["10:00", "14:00"]]}})
+    assert saved.json()["reclassified"] == {"meetings": 0, "emails": 0}
+    assert client.get("/api/working-hours/", headers=headers).json()["schedule"]["fri"] == [["10:00", "14:00"]]
@@ -14,14 +14,20 @@ import { BarChart3, BookOpen, Clock, LogOut, User, Zap } from 'lucide-react';
 
 export default function DashboardPage() {
   const [user, setUser] = useState<any>(null);
+  const [dashboard, setDashboard] = useState<any>(null);
   const [loading, setLoading] = useState(true);
   const router = useRouter();
 
   useEffect(() => {
     const initDashboard = async () => {
       try {
-        const userData = await apiClient.getCurrentUser();
+        // The panels load in the same round trip; if that fails, each panel fetches its own data
+        const [userData, dashboardData] = await Promise.all([
+          apiClient.getCurrentUser(),
+          apiClient.getDashboard(['metrics', 'journal', 'patterns'], '7d', 5).catch(() => null),
+        ]);
         setUser(userData);
+        setDashboard(dashboardData);
         
         // Connect to WebSocket
         wsClient.connect(userData.id.toString());
@@ -120,21 +126,21 @@ export default function DashboardPage() {
                   Refresh Analysis
                 </Button>
               </div>
-              <BurnoutMetrics />
+              <BurnoutMetrics initialMetrics={dashboard?.metrics} />
             </div>
           </TabsContent>
 
           <TabsContent value="journal">
             <div className="space-y-6">
               <h2 className="text-2xl font-bold text-gray-900">Journal & Mood Tracking</h2>
-              <JournalEntry />
+              <JournalEntry initialEntries={dashboard?.journal} />
             </div>
           </TabsContent>
 
           <TabsContent value="patterns">
             <div className="space-y-6">
               <h2 className="text-2xl font-bold text-gray-900">Work Patterns Analysis</h2>
-              <WorkPatterns />
+              <WorkPatterns initialPatterns={dashboard?.patterns} />
             </div>
           </TabsContent>
         </Tabs>
@@ -18,12 +18,14 @@ interface BurnoutMetrics {
   journal_sentiment: number;
 }
 
-export default function BurnoutMetrics() {
-  const [metrics, setMetrics] = useState<BurnoutMetrics | null>(null);
-  const [loading, setLoading] = useState(true);
+export default function BurnoutMetrics({ initialMetrics }: { initialMetrics?: BurnoutMetrics }) {
+  const [metrics, setMetrics] = useState<BurnoutMetrics | null>(initialMetrics ?? null);
+  const [loading, setLoading] = useState(!initialMetrics);
 
   useEffect(() => {
-    fetchMetrics();
+    if (!initialMetrics) {
+      fetchMetrics();
+    }
     
     // Set up WebSocket listener for real-time updates
     const handleBurnoutUpdate = (event: CustomEvent) => {
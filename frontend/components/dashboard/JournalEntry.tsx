@@ -16,14 +16,16 @@ interface JournalEntry {
   created_at: string;
 }
 
-export default function JournalEntry() {
-  const [entries, setEntries] = useState<JournalEntry[]>([]);
+export default function JournalEntry({ initialEntries }: { initialEntries?: JournalEntry[] }) {
+  const [entries, setEntries] = useState<JournalEntry[]>(initialEntries ?? []);
   const [newEntry, setNewEntry] = useState('');
   const [loading, setLoading] = useState(false);
   const [submitting, setSubmitting] = useState(false);
 
   useEffect(() => {
-    fetchEntries();
+    if (!initialEntries) {
+      fetchEntries();
+    }
   }, []);
 
   const fetchEntries = async () => {
@@ -14,13 +14,15 @@ interface WorkPattern {
   session_count: number;
 }
 
-export default function WorkPatterns() {
-  const [patterns, setPatterns] = useState<WorkPattern | null>(null);
-  const [loading, setLoading] = useState(true);
+export default function WorkPatterns({ initialPatterns }: { initialPatterns?: WorkPattern }) {
+  const [patterns, setPatterns] = useState<WorkPattern | null>(initialPatterns ?? null);
+  const [loading, setLoading] = useState(!initialPatterns);
   const [syncing, setSyncing] = useState(false);
 
   useEffect(() => {
-    fetchPatterns();
+    if (!initialPatterns) {
+      fetchPatterns();
+    }
   }, []);
 
   const fetchPatterns = async () => {
@@ -3,6 +3,8 @@ const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 class ApiClient {
   private baseUrl: string;
   private token: string | null = null;
+  // Last response body per GET URL, revalidated with If-None-Match
+  private etagCache: Map<string, { etag: string; body: unknown }> = new Map();
 
   constructor(baseUrl: string = API_BASE_URL) {
     this.baseUrl = baseUrl;
@@ -27,20 +29,32 @@ class ApiClient {
 
   async request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
     const url = `${this.baseUrl}${endpoint}`;
+    const isGet = !options.method || options.method.toUpperCase() === 'GET';
+    const cached = isGet ? this.etagCache.get(url) : undefined;
     
     const response = await fetch(url, {
       ...options,
       headers: {
         ...this.getHeaders(),
+        ...(cached ? { 'If-None-Match': cached.etag } : {}),
         ...options.headers,
       },
     });
 
+    if (response.status === 304 && cached) {
+      return cached.body as T;
+    }
+
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
 
-    return response.json();
+    const body = await response.json();
+    const etag = response.headers.get('ETag');
+    if (isGet && etag) {
+      this.etagCache.set(url, { etag, body });
+    }
+    return body;
   }
 
   // Auth methods
@@ -58,6 +72,7 @@ class ApiClient {
     });
 
     this.token = response.access_token;
+    this.etagCache.clear();
     if (typeof window !== 'undefined') {
       localStorage.setItem('token', response.access_token);
     }
@@ -69,6 +84,16 @@ class ApiClient {
     return this.request('/api/auth/me');
   }
 
+  // Dashboard methods
+  async getDashboard(
+    fields: string[] = ['metrics', 'history', 'patterns', 'journal', 'meetings', 'emails'],
+    timeframe: string = '7d',
+    limit: number = 10
+  ) {
+    const params = new URLSearchParams({ fields: fields.join(','), timeframe, limit: String(limit) });
+    return this.request(`/api/dashboard/?${params}`);
+  }
+
   // Burnout methods
   async getBurnoutMetrics(timeframe: string = '7d') {
     return this.request(`/api/burnout/metrics?timeframe=${timeframe}`);
@@ -78,6 +103,10 @@ class ApiClient {
     return this.request(`/api/burnout/history?limit=${limit}`);
   }
 
+  async getBurnoutTrend(timeframe: string = '30d', resolution: string = 'daily', maxPoints: number = 100) {
+    return this.request(`/api/burnout/trend?timeframe=${timeframe}&resolution=${resolution}&max_points=${maxPoints}`);
+  }
+
   async calculateBurnout() {
     return this.request('/api/burnout/calculate', {
       method: 'POST',
@@ -96,6 +125,12 @@ class ApiClient {
     return this.request(`/api/journal/recent?limit=${limit}`);
   }
 
+  // Search methods
+  async search(query: string, limit: number = 20, offset: number = 0) {
+    const params = new URLSearchParams({ q: query, limit: String(limit), offset: String(offset) });
+    return this.request(`/api/search/?${params}`);
+  }
+
   // Work sessions methods
   async createWorkSession(sessionData: {
     start_time: string;
@@ -134,13 +169,34 @@ class ApiClient {
     return this.request(`/api/integrations/meetings/recent?limit=${limit}`);
   }
 
+  async getMeetingAnalytics(timeframe: string = '7d') {
+    return this.request(`/api/integrations/meetings/analytics?timeframe=${timeframe}`);
+  }
+
   async getRecentEmails(limit: number = 10) {
     return this.request(`/api/integrations/emails/recent?limit=${limit}`);
   }
 
+  // Working hours methods
+  async getWorkingHours() {
+    return this.request('/api/working-hours/');
+  }
+
+  async updateWorkingHours(profile: {
+    timezone: string;
+    schedule: Record<string, [string, string][]>;
+    holidays?: string[];
+  }) {
+    return this.request('/api/working-hours/', {
+      method: 'PUT',
+      body: JSON.stringify(profile),
+    });
+  }
+
   // Logout
   logout() {
     this.token = null;
+    this.etagCache.clear();
     if (typeof window !== 'undefined') {
       localStorage.removeItem('token');
     }
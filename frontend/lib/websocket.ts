@@ -57,6 +57,9 @@ class WebSocketClient {
       case 'burnout_update':
         this.onBurnoutUpdate(data.data);
         break;
+      case 'burnout_anomaly':
+        this.onBurnoutAnomaly(data.data);
+        break;
       default:
         console.log('Unhandled message type:', data.type);
     }
@@ -68,6 +71,12 @@ class WebSocketClient {
     window.dispatchEvent(event);
   }
 
+  onBurnoutAnomaly(data: any) {
+    // Emit custom event for sudden jumps against the user's own baseline
+    const event = new CustomEvent('burnout_anomaly', { detail: data });
+    window.dispatchEvent(event);
+  }
+
   send(data: any) {
     if (this.ws && this.ws.readyState === WebSocket.OPEN) {
       this.ws.send(JSON.stringify(data));